@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import RowsJSONResponse, accepts_arrow, rows_response
+from app.db.database import get_async_db, get_read_db
+from app.models.snapshot import DEFAULT_FEED
+from app.services.active_snapshot import ActiveSnapshotRegistry
+from app.services.pagination import InvalidCursor, Page
+from app.services.projection import RowProjection
+from app.services.response_cache import CachedResponse, get_response_cache, strong_etag
+from app.services.snapshot_generation import SnapshotGenerations
+
+# Sonraki sayfanın cursor'ı bu yanıt başlığında döner (gövde liste olarak kalır)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+async def resolve_snapshot_id(
+    snapshot_id: Optional[UUID] = Query(None, description="Snapshot ID (default: the feed's active snapshot)"),
+    feed: str = Query(DEFAULT_FEED, description="Feed whose active snapshot is used when snapshot_id is omitted"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[str]:
+    """Sorgunun snapshot'ı: verilen snapshot_id, yoksa feed'in aktif snapshot'ı (worker cache'inden)
+
+    Aktif snapshot yoksa None döner ve servisler eskisi gibi filtresiz çalışır.
+    """
+    if snapshot_id is not None:
+        return str(snapshot_id)
+    return await ActiveSnapshotRegistry(db).resolve_async(feed)
+
+
+async def resolve_read_snapshot_id(
+    snapshot_id: Optional[UUID] = Query(None, description="Snapshot ID (default: the feed's active snapshot)"),
+    feed: str = Query(DEFAULT_FEED, description="Feed whose active snapshot is used when snapshot_id is omitted"),
+    db: AsyncSession = Depends(get_read_db),
+) -> Optional[str]:
+    """GET uçları için resolve_snapshot_id: işaretçi (cache'te yoksa) verinin okunacağı session'dan okunur"""
+    return await resolve_snapshot_id(snapshot_id, feed, db)
+
+
+class Pagination:
+    """Liste uçlarının sayfalama parametreleri: cursor (keyset) ya da skip, ve limit
+
+    Sonraki sayfa varsa cursor'ı X-Next-Cursor başlığında ve Link (rel="next") olarak döner.
+    Link göreli URL'dir (host/şema içermez): yanıt cache'i anahtarında olmayan bilgiyi taşımaz.
+    """
+
+    def __init__(self, request: Request, response: Response, cursor: Optional[str], skip: int, limit: int):
+        self.request = request
+        self.response = response
+        self.cursor = cursor
+        self.skip = skip
+        self.limit = limit
+
+    async def fetch(self, load: Callable[..., Awaitable[Page]], projection: Optional[RowProjection] = None):
+        """load(cursor=, skip=, limit=) ile sayfayı oku, sonraki sayfanın başlıklarını yaz
+
+        projection verilirse (servis project() ile oluşturulmuşsa) sayfa Accept'e göre JSON ya da
+        Arrow IPC yanıtı olarak döner (rows_response).
+        """
+        try:
+            page = await load(cursor=self.cursor, skip=self.skip, limit=self.limit)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        headers = {}
+        if page.next_cursor:
+            next_url = self.request.url.remove_query_params("skip").include_query_params(cursor=page.next_cursor)
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor
+            headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+
+        if projection is not None:
+            # Dönen Response'a dependency'nin response başlıkları eklenmez, başlıklar doğrudan verilir
+            return rows_response(self.request, page.items, projection, headers=headers)
+        self.response.headers.update(headers)
+        return page.items
+
+
+def pagination(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor header"),
+    skip: int = Query(0, ge=0, description="Records to skip (prefer cursor for deep pages)"),
+    limit: int = Query(100, ge=1, le=1000, description="Max records to return"),
+) -> Pagination:
+    """Liste uçlarının sayfalama dependency'si"""
+    return Pagination(request, response, cursor, skip, limit)
+
+
+class ResponseCaching:
+    """GET yanıtlarının snapshot'a bağlı, worker içi cache'i: ETag, Cache-Control ve 304
+
+    Anahtar yol + query parametreleri + snapshot_id + snapshot generation'ı + istenen gösterimdir
+    (JSON/Arrow); CRUD yazımı generation'ı artırdığından eski yanıt bir daha dönmez. Snapshot
+    çözülemiyorsa ya da yayınlanmış değilse (generation None) yanıt cache'lenmeden üretilir.
+    Yanıtlar Cache-Control: no-cache ile döner: CRUD yazımı yayınlanmış snapshot'ı da değiştirebilir
+    (aktif snapshot işaretçisi de değişebilir), istemci her seferinde ETag ile doğrular (304).
+    """
+
+    def __init__(self, request: Request, snapshot_id: Optional[str], db: AsyncSession):
+        self.request = request
+        self.snapshot_id = snapshot_id
+        self.db = db
+
+    async def fetch(self, load: Callable[[], Awaitable[Any]], projection: Optional[RowProjection] = None) -> Any:
+        """load() ile yanıtı üret (ya da cache'ten al); dönen değer Response ya da JSON'a yazılacak veri olabilir
+
+        projection verilirse load()'un döndürdüğü satırlar RowsJSONResponse ile yazılır.
+        """
+        cache = get_response_cache()
+        generation = None
+        if cache.enabled and self.snapshot_id is not None:
+            generation = await SnapshotGenerations(self.db).resolve_async(self.snapshot_id)
+        if generation is None:
+            return await load()
+
+        key = (
+            self.request.url.path,
+            tuple(sorted(self.request.query_params.multi_items())),
+            self.snapshot_id,
+            generation,
+            accepts_arrow(self.request),
+        )
+        entry = cache.get(key)
+        if entry is None:
+            result = await load()
+            if isinstance(result, Response):
+                response = result
+            elif projection is not None:
+                response = RowsJSONResponse(result, projection)
+            else:
+                # response_model'siz uçlar FastAPI'nin yapacağı gibi JSON'a yazılır
+                response = ORJSONResponse(jsonable_encoder(result))
+            if response.status_code != 200:
+                return response
+            headers = [(name, value) for name, value in response.headers.items() if name != "content-length"]
+            entry = CachedResponse(self.snapshot_id, response.status_code, headers, response.body, strong_etag(response.body))
+            cache.put(key, entry)
+        return self._respond(entry)
+
+    def _respond(self, entry: CachedResponse) -> Response:
+        headers = {**dict(entry.headers), "ETag": entry.etag, "Cache-Control": "no-cache"}
+
+        if _etag_matches(self.request.headers.get("if-none-match"), entry.etag):
+            kept = {name: value for name, value in headers.items() if name.lower() in ("etag", "cache-control", "vary")}
+            return Response(status_code=304, headers=kept)
+        return Response(entry.body, status_code=entry.status_code, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match (zayıf karşılaştırma: W/ öneki yok sayılır)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def response_caching(
+    request: Request,
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> ResponseCaching:
+    """Cache'lenen GET uçlarının dependency'si (snapshot çözümlemesi uçla paylaşılır)"""
+    return ResponseCaching(request, snapshot_id, db)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from fastapi import Request, Response
+import pyarrow as pa
+
+from app.services.columnar_export import ARROW_STREAM_MEDIA_TYPE, arrow_schema, ipc_stream
+from app.services.projection import RowProjection
+
+
+class RowsJSONResponse(Response):
+    """Projeksiyonlu servis satırlarını response_model doğrulaması olmadan JSON'a yazan yanıt
+
+    Uç, OpenAPI şeması için response_model'ini korur; FastAPI dönen Response'u olduğu gibi gönderir.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        rows: Iterable[Any],
+        projection: RowProjection,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(projection.dumps(rows), status_code=status_code, headers=headers)
+
+
+class ArrowStreamResponse(Response):
+    """Projeksiyonlu servis satırlarını Arrow IPC stream'i olarak yazan yanıt
+
+    Sütunlar JSON yanıtındaki alanlardır (aynı sıra), tipler model sütunlarından gelir; istemci
+    gövdeyi pyarrow.ipc.open_stream ile kopyasız okur.
+    """
+
+    media_type = ARROW_STREAM_MEDIA_TYPE
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        projection: RowProjection,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(ipc_stream(rows, _projection_schema(projection)), status_code=status_code, headers=headers)
+
+
+@lru_cache(maxsize=None)
+def _projection_schema(projection: RowProjection) -> pa.Schema:
+    return arrow_schema(projection.keys, projection.columns)
+
+
+def accepts_arrow(request: Request) -> bool:
+    """Accept başlığı Arrow IPC stream'ini (q > 0 ile) istiyor mu"""
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, *params = [part.strip().lower() for part in media_range.split(";")]
+        if media_type == ARROW_STREAM_MEDIA_TYPE and _quality(params) > 0:
+            return True
+    return False
+
+
+def _quality(params: Sequence[str]) -> float:
+    """Medya aralığının q değeri (yoksa 1); okunamayan q reddedilmiş sayılır (varsayılan JSON)"""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def rows_response(
+    request: Request,
+    rows: Sequence[Any],
+    projection: RowProjection,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Accept'e göre RowsJSONResponse ya da ArrowStreamResponse (varsayılan JSON)"""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if accepts_arrow(request):
+        return ArrowStreamResponse(rows, projection, headers=headers)
+    return RowsJSONResponse(rows, projection, headers=headers)
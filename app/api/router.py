@@ -2,6 +2,8 @@ from fastapi import APIRouter
 
 from app.api.routes.health import router as health_router
 from app.api.routes.gtfs import router as gtfs_router
+from app.api.routes.export import export_router
+from app.services.gtfs_upload import GTFSUploadService
 
 # GTFS Tabloları için router'lar
 from app.api.routes.agency import router as agency_router
@@ -22,6 +24,11 @@ api_router = APIRouter()
 api_router.include_router(health_router, tags=["health"], prefix="")
 api_router.include_router(gtfs_router, tags=["gtfs"], prefix="/gtfs")
 
+# GTFS tablolarının /export uçları (/{id} yollarından önce eşleşmeli)
+for model_class in GTFSUploadService.GTFS_FILES_MAPPING.values():
+    prefix = model_class.__tablename__.replace("_", "-")
+    api_router.include_router(export_router(model_class), tags=[prefix], prefix=f"/{prefix}")
+
 # GTFS Tablo router'ları
 api_router.include_router(agency_router, tags=["agency"], prefix="/agency")
 api_router.include_router(routes_router, tags=["routes"], prefix="/routes")
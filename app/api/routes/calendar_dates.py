@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.deps import Pagination, pagination, resolve_read_snapshot_id
+from app.api.responses import RowsJSONResponse
+from app.db.database import get_async_db, get_read_db
 from app.services.calendar_dates_service import CalendarDatesService
 from app.schemas.calendar_dates import CalendarDatesRead as CalendarDatesSchema, CalendarDatesCreate, CalendarDatesUpdate
 
@@ -14,32 +17,32 @@ router = APIRouter()
 
 @router.get("/", response_model=List[CalendarDatesSchema], summary="List all calendar dates")
 async def list_calendar_dates(
-    snapshot_id: Optional[UUID] = Query(None), skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), page: Pagination = Depends(pagination),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = CalendarDatesService(db)
-    return service.get_all(snapshot_id=snapshot_id, skip=skip, limit=limit)
+    service = CalendarDatesService(db).project(CalendarDatesSchema)
+    return await page.fetch(partial(service.get_page, snapshot_id), service.projection)
 
 
 @router.post("/", response_model=CalendarDatesSchema, summary="Create new calendar date")
 async def create_calendar_date(
-    calendar_date: CalendarDatesCreate, snapshot_id: UUID = Query(...), db: Session = Depends(get_db)
+    calendar_date: CalendarDatesCreate, snapshot_id: UUID = Query(...), db: AsyncSession = Depends(get_async_db)
 ):
     service = CalendarDatesService(db)
-    return service.create(calendar_date, snapshot_id)
+    return await service.create(calendar_date, snapshot_id)
 
 
 @router.get("/service/{service_id}", response_model=List[CalendarDatesSchema], summary="Get calendar dates by service")
 async def get_calendar_dates_by_service(
-    service_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    service_id: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = CalendarDatesService(db)
-    return service.get_by_service(service_id, snapshot_id)
+    service = CalendarDatesService(db).project(CalendarDatesSchema)
+    return RowsJSONResponse(await service.get_by_service(service_id, snapshot_id), service.projection)
 
 
 @router.get("/filter/exceptions", response_model=List[CalendarDatesSchema], summary="Get exception dates")
 async def get_exception_dates(
-    snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = CalendarDatesService(db)
-    return service.get_exceptions(snapshot_id)
+    service = CalendarDatesService(db).project(CalendarDatesSchema)
+    return RowsJSONResponse(await service.get_exceptions(snapshot_id), service.projection)
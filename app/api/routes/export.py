@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import resolve_read_snapshot_id
+from app.core.config import get_settings
+from app.db.database import get_read_db, read_session
+from app.models.snapshot import Snapshot
+from app.services.columnar_export import PARQUET_MEDIA_TYPE, ParquetCache
+from app.services.table_export import EXPORT_FORMATS, TableExporter
+
+
+def export_router(model_class) -> APIRouter:
+    """Tablonun GET /export ucu; entity router'ından önce eklenir ki /{id} yolu onu yakalamasın"""
+    router = APIRouter()
+    table_name = model_class.__tablename__
+
+    @router.get("/export", summary=f"Export all {table_name} rows of a snapshot (NDJSON, CSV or Parquet)")
+    async def export_table(
+        export_format: str = Query(
+            "ndjson", alias="format", pattern="^(ndjson|csv|parquet)$",
+            description="ndjson (one JSON object per line), csv (GTFS columns) or parquet (published snapshots, cached)",
+        ),
+        snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id),
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        """Snapshot'taki tüm satırları server-side cursor ile akıt; Parquet önbellekteki dosyadan sunulur"""
+        if snapshot_id is None:
+            raise HTTPException(status_code=404, detail="No snapshot to export")
+
+        settings = get_settings()
+        exporter = TableExporter(model_class, settings.EXPORT_BATCH_ROWS)
+
+        if export_format == "parquet":
+            # Yalnızca yayınlanmış (değişmeyen) snapshot önbelleğe yazılır
+            snapshot = (await db.execute(
+                select(Snapshot.status, Snapshot.generation).where(Snapshot.snapshot_id == snapshot_id)
+            )).first()
+            if snapshot is None or snapshot.status != "published":
+                raise HTTPException(status_code=404, detail="Published snapshot not found")
+            # CRUD yazımı generation'ı artırır: dosya yeni generation için yeniden yazılır
+            cache = ParquetCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_PARQUET_ROW_GROUP_ROWS)
+            # Açık handle'dan akıtılır: yeni generation'ın yazımı dosyayı silse de yanıt tamamlanır
+            handle = await cache.open(db, snapshot_id, exporter, snapshot.generation)
+            return StreamingResponse(
+                cache.chunks(handle),
+                media_type=PARQUET_MEDIA_TYPE,
+                headers={
+                    "Content-Disposition": f'attachment; filename="{table_name}.parquet"',
+                    "Content-Length": str(os.fstat(handle.fileno()).st_size),
+                },
+            )
+
+        media_type, extension = EXPORT_FORMATS[export_format]
+
+        # Akış, endpoint döndükten sonra sürer: dependency session'ı kapanmış olur, cursor kendi
+        # okuma session'ında (replica/primary) açılır
+        async def rows() -> AsyncIterator[bytes]:
+            async with read_session() as db:
+                async for chunk in exporter.stream(db, snapshot_id, export_format):
+                    yield chunk
+
+        return StreamingResponse(
+            rows(),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{table_name}.{extension}"'},
+        )
+
+    return router
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.deps import Pagination, pagination, resolve_read_snapshot_id
+from app.api.responses import RowsJSONResponse
+from app.db.database import get_async_db, get_read_db
 from app.services.feed_info_service import FeedInfoService
 from app.schemas.feed_info import FeedInfoRead as FeedInfoSchema, FeedInfoCreate, FeedInfoUpdate
 
@@ -14,27 +17,27 @@ router = APIRouter()
 
 @router.get("/", response_model=List[FeedInfoSchema], summary="List all feed info")
 async def list_feed_info(
-    snapshot_id: Optional[UUID] = Query(None), skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), page: Pagination = Depends(pagination),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = FeedInfoService(db)
-    return service.get_all(snapshot_id=snapshot_id, skip=skip, limit=limit)
+    service = FeedInfoService(db).project(FeedInfoSchema)
+    return await page.fetch(partial(service.get_page, snapshot_id), service.projection)
 
 
 @router.post("/", response_model=FeedInfoSchema, summary="Create new feed info")
 async def create_feed_info(
-    feed_info: FeedInfoCreate, snapshot_id: UUID = Query(...), db: Session = Depends(get_db)
+    feed_info: FeedInfoCreate, snapshot_id: UUID = Query(...), db: AsyncSession = Depends(get_async_db)
 ):
     service = FeedInfoService(db)
-    return service.create(feed_info, snapshot_id)
+    return await service.create(feed_info, snapshot_id)
 
 
 @router.get("/latest", response_model=FeedInfoSchema, summary="Get latest feed info")
 async def get_latest_feed_info(
-    snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
     service = FeedInfoService(db)
-    feed_info = service.get_latest_feed(snapshot_id)
+    feed_info = await service.get_latest_feed(snapshot_id)
     if not feed_info:
         raise HTTPException(status_code=404, detail="Feed info not found")
     return feed_info
@@ -42,7 +45,7 @@ async def get_latest_feed_info(
 
 @router.get("/publisher/{publisher_name}", response_model=List[FeedInfoSchema], summary="Get feed info by publisher")
 async def get_feed_info_by_publisher(
-    publisher_name: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    publisher_name: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = FeedInfoService(db)
-    return service.get_by_publisher(publisher_name, snapshot_id)
+    service = FeedInfoService(db).project(FeedInfoSchema)
+    return RowsJSONResponse(await service.get_by_publisher(publisher_name, snapshot_id), service.projection)
@@ -2,150 +2,298 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any
+import os
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+import aiofiles
+import orjson
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.database import get_db
+from app.core.config import get_settings
+from app.db.database import AsyncSessionLocal, get_db, read_session, SessionLocal
+from app.models.snapshot import DEFAULT_FEED, Snapshot
+from app.services.active_snapshot import ActiveSnapshotRegistry
+from app.services.feed_export import FeedExporter
 from app.services.gtfs_upload import GTFSUploadService
+from app.services.ingest_queue import IngestJobQueue, TERMINAL_STATUSES
+from app.services.snapshot_catalog import SnapshotCatalog
+from app.services.snapshot_generation import invalidate_snapshot
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Upload durumlarını takip etmek için in-memory store
-upload_statuses: Dict[str, Dict[str, Any]] = {}
+
+async def _spool_upload(file: UploadFile) -> Path:
+    """Yüklenen ZIP'i parça parça diske yaz, tüm dosyayı RAM'de tutma"""
+    settings = get_settings()
+    fd, path = tempfile.mkstemp(prefix="gtfs_upload_", suffix=".zip", dir=settings.UPLOAD_SPOOL_DIR)
+    os.close(fd)
+
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                await out.write(chunk)
+    except Exception:
+        os.unlink(path)
+        raise
+
+    return Path(path)
 
 
 @router.post("/upload", summary="Upload GTFS ZIP file")
 async def upload_gtfs_file(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="GTFS ZIP file containing 11 txt files"),
+    ingest_mode: str = Query("insert", pattern="^(insert|copy)$", description="Write path: batched INSERT or PostgreSQL COPY"),
+    priority: int = Query(0, description="Queue priority, higher runs first (FIFO within the same priority)"),
+    feed: str = Query(DEFAULT_FEED, description="Feed the snapshot belongs to; published snapshots become its active snapshot"),
     db: Session = Depends(get_db)
 ):
     # Dosya türü kontrolü
     if not file.filename or not file.filename.endswith('.zip'):
         raise HTTPException(status_code=400, detail="File must be a ZIP file")
     
+    zip_path = None
     try:
-        # Upload service'i oluştur
-        upload_service = GTFSUploadService(db)
-        snapshot_id = upload_service.snapshot_id
-        
-        # Upload durumunu kaydet
-        upload_statuses[snapshot_id] = upload_service.get_upload_status()
-        
+        snapshot_id = str(uuid.uuid4())
         logger.info(f"Starting GTFS upload for file: {file.filename}, snapshot: {snapshot_id}")
         
-        # Dosya içeriğini oku
-        file_content = await file.read()
+        # Dosyayı diske akıt - kuyruğa bytes yerine yol yazılır
+        zip_path = await _spool_upload(file)
         
-        # Background task olarak işle (DB session geçirme - thread-safe)
-        background_tasks.add_task(
-            process_gtfs_upload,
-            file_content,
-            snapshot_id
+        # İşi kalıcı kuyruğa ekle - herhangi bir worker/node tarafından işlenir
+        await run_in_threadpool(
+            IngestJobQueue(db).enqueue,
+            snapshot_id=snapshot_id,
+            source_path=str(zip_path),
+            source_filename=file.filename,
+            ingest_mode=ingest_mode,
+            priority=priority,
+            feed=feed,
         )
         
         return {
-            "message": "GTFS upload started successfully",
+            "message": "GTFS upload queued successfully",
             "snapshot_id": snapshot_id,
             "status_url": f"/api/gtfs/upload/{snapshot_id}/status"
         }
         
     except Exception as e:
         logger.error(f"Error starting GTFS upload: {str(e)}")
+        if zip_path is not None:
+            zip_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Error starting upload: {str(e)}")
 
 
 @router.get("/upload/{snapshot_id}/status", summary="Get upload status")
-async def get_upload_status(snapshot_id: str):
-    """Upload durumunu sorgula"""
+def get_upload_status(snapshot_id: str, db: Session = Depends(get_db)):
+    """Upload durumunu sorgula - durum ingest_jobs tablosundan okunur, tüm worker'larda tutarlıdır"""
+    
+    job = IngestJobQueue(db).get(snapshot_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    return IngestJobQueue.to_status(job)
+
+
+def _read_job_status(snapshot_id: str) -> Optional[dict]:
+    """SSE akışı için iş durumunu kısa ömürlü bir session ile oku"""
+    db = SessionLocal()
+    try:
+        job = IngestJobQueue(db).get(snapshot_id)
+        return IngestJobQueue.to_status(job) if job else None
+    finally:
+        db.close()
+
+
+@router.get("/upload/{snapshot_id}/events", summary="Stream upload progress (Server-Sent Events)")
+async def stream_upload_events(snapshot_id: str, request: Request):
+    """Upload ilerlemesini SSE olarak akıt - durum değiştikçe 'progress', bitişte 'end' olayı gönderilir"""
     
-    if snapshot_id not in upload_statuses:
+    if await run_in_threadpool(_read_job_status, snapshot_id) is None:
         raise HTTPException(status_code=404, detail="Upload not found")
     
-    return upload_statuses[snapshot_id]
+    settings = get_settings()
+
+    async def events() -> AsyncIterator[bytes]:
+        last_payload = None
+        last_sent = time.monotonic()
+
+        while not await request.is_disconnected():
+            status = await run_in_threadpool(_read_job_status, snapshot_id)
+            if status is None:
+                yield b"event: end\ndata: {\"status\": \"deleted\"}\n\n"
+                return
+
+            payload = orjson.dumps(status)
+            if payload != last_payload:
+                last_payload = payload
+                last_sent = time.monotonic()
+                event = "end" if status['status'] in TERMINAL_STATUSES else "progress"
+                yield b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+                if event == "end":
+                    return
+            elif time.monotonic() - last_sent >= settings.UPLOAD_EVENTS_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield b": keep-alive\n\n"
+
+            await asyncio.sleep(settings.UPLOAD_EVENTS_POLL_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/snapshots", summary="List all snapshots")
-async def list_snapshots(db: Session = Depends(get_db)):
-    """Tüm snapshot'ları listele"""
+def list_snapshots(
+    status: Optional[str] = Query(
+        "published",
+        pattern="^(queued|loading|published|failed|archived|all)$",
+        description="Catalog status filter, 'all' lists every snapshot",
+    ),
+    feed: Optional[str] = Query(None, description="Only snapshots of this feed"),
+    db: Session = Depends(get_db),
+):
+    """Snapshot kataloğunu listele - GTFS tabloları taranmaz, tek indeksli okuma"""
     
     try:
-        # Agency tablosundan unique snapshot'ları al (örnek olarak)
-        from app.models.agency import Agency
-        from sqlalchemy import distinct, desc
-        
-        snapshots = db.query(
-            distinct(Agency.snapshot_id).label('snapshot_id'),
-            Agency.created_at
-        ).order_by(desc(Agency.created_at)).all()
-        
-        return {
-            "snapshots": [
-                {
-                    "snapshot_id": s.snapshot_id,
-                    "created_at": s.created_at.isoformat()
-                }
-                for s in snapshots
-            ]
-        }
+        snapshots = SnapshotCatalog(db).list(None if status == "all" else status, feed)
+        return {"snapshots": snapshots}
         
     except Exception as e:
         logger.error(f"Error listing snapshots: {str(e)}")
         raise HTTPException(status_code=500, detail="Error listing snapshots")
 
 
+@router.get("/snapshots/{snapshot_id}", summary="Get snapshot catalog entry")
+def get_snapshot(snapshot_id: str, db: Session = Depends(get_db)):
+    """Snapshot'ın katalog kaydı: tablo başına satır sayısı ve boyut, feed_info tarihleri, kaynak hash'i"""
+    snapshot = SnapshotCatalog(db).get(snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return snapshot
+
+
+@asynccontextmanager
+async def _published_read_session(snapshot_id: str) -> AsyncIterator[AsyncSession]:
+    """Snapshot'ı yayınlanmış gören okuma session'ı: replica henüz görmüyorsa (gecikme) primary
+
+    Katalog kaydı partition'larla aynı transaction'da yayınlanır; kaydı gören session verileri de görür.
+    """
+    async with read_session() as db:
+        status = await db.scalar(select(Snapshot.status).where(Snapshot.snapshot_id == snapshot_id))
+        if status == 'published':
+            yield db
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@router.get("/snapshots/{snapshot_id}/export.zip", summary="Download a snapshot as a GTFS ZIP (streamed)")
+def export_snapshot_zip(snapshot_id: str, db: Session = Depends(get_db)):
+    """Yayınlanmış snapshot'ı GTFS ZIP'i olarak akıt - tablolar server-side cursor'dan, geçici dosya olmadan"""
+    snapshot = SnapshotCatalog(db).get(snapshot_id)
+    if not snapshot or snapshot['status'] != 'published':
+        raise HTTPException(status_code=404, detail="Published snapshot not found")
+
+    # Yayın primary'de doğrulandı; geride kalan replica'dan akıtılırsa dosyalar yalnızca başlık olurdu
+    exporter = FeedExporter(
+        snapshot, lambda: _published_read_session(snapshot_id), get_settings().EXPORT_BATCH_ROWS
+    )
+    return StreamingResponse(
+        exporter.stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="gtfs-{snapshot_id}.zip"'},
+    )
+
+
+@router.get("/active", summary="List active snapshots")
+def list_active_snapshots(db: Session = Depends(get_db)):
+    """Feed başına aktif snapshot işaretçileri"""
+    return {"active": ActiveSnapshotRegistry(db).list()}
+
+
+@router.post("/snapshots/{snapshot_id}/promote", summary="Make a snapshot the active one of its feed")
+def promote_snapshot(
+    snapshot_id: str,
+    feed: Optional[str] = Query(None, description="Feed to promote for (default: the snapshot's own feed)"),
+    db: Session = Depends(get_db),
+):
+    """Snapshot'ı aktif yap - tek satırlık atomik güncelleme, geri almak için önceki snapshot döner"""
+    try:
+        feed = feed or SnapshotCatalog(db).feed_of(snapshot_id)
+        previous = ActiveSnapshotRegistry(db).promote(snapshot_id, feed)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {"feed": feed, "snapshot_id": snapshot_id, "previous_snapshot_id": previous}
+
+
 @router.delete("/snapshots/{snapshot_id}", summary="Delete a snapshot")
-async def delete_snapshot(snapshot_id: str, db: Session = Depends(get_db)):
-    """Snapshot'ı cascade delete ile sil"""
+def delete_snapshot(
+    snapshot_id: str,
+    archive: bool = Query(False, description="Detach partitions into the gtfs_archive schema instead of dropping them"),
+    db: Session = Depends(get_db),
+):
+    """Snapshot'ı sil: partition'larını DETACH + DROP et (archive=true ise arşiv şemasına taşı)"""
+    
+    active_feeds = ActiveSnapshotRegistry(db).feeds_of(snapshot_id)
+    if active_feeds:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Snapshot is active for feed(s) {', '.join(active_feeds)}; promote another snapshot first",
+        )
     
     try:
-        # Tüm tablolardan bu snapshot_id'ye sahip kayıtları sil
-        from app.services.gtfs_upload import GTFSUploadService
-        
         logger.info(f"Snapshot {snapshot_id} silme işlemi başlatılıyor...")
         
-        deleted_count = 0
-        # Ters sırada sil (foreign key bağımlılıkları nedeniyle)
-        for model_class in reversed(list(GTFSUploadService.GTFS_FILES_MAPPING.values())):
-            logger.debug(f"Tablo {model_class.__tablename__} için snapshot {snapshot_id} kayıtları siliniyor...")
-            
-            # Önce kaç kayıt var kontrol et
-            count_before = db.query(model_class).filter(
-                model_class.snapshot_id == snapshot_id
-            ).count()
-            
-            logger.debug(f"Tablo {model_class.__tablename__}'da {count_before} kayıt bulundu")
-            
-            result = db.query(model_class).filter(
-                model_class.snapshot_id == snapshot_id
-            ).delete(synchronize_session=False)
-            
-            deleted_count += result
-            logger.debug(f"Tablo {model_class.__tablename__}'dan {result} kayıt silindi")
+        # Snapshot partition'larını ayır - satır silinmez, yalnızca katalog işlemi
+        result = GTFSUploadService.purge_snapshot(db, snapshot_id, archive=archive)
+        logger.info(f"{result['dropped_partitions']} partition kaldırıldı, {result['deleted_records']} kayıt silindi")
+        
+        # Kuyruktaki upload kaydını da temizle
+        job_deleted = IngestJobQueue(db).delete(snapshot_id)
         
-        logger.info(f"Toplam {deleted_count} kayıt silindi")
+        # Katalog: arşivlenen snapshot kayıtta kalır
+        catalog = SnapshotCatalog(db)
+        if archive:
+            catalog.set_status(snapshot_id, 'archived')
+            cataloged = catalog.get(snapshot_id) is not None
+        else:
+            cataloged = catalog.delete(snapshot_id)
         
-        if deleted_count == 0:
+        if result['dropped_partitions'] == 0 and result['deleted_records'] == 0 and not job_deleted and not cataloged:
             logger.warning(f"Snapshot {snapshot_id} için hiç kayıt bulunamadı")
             raise HTTPException(status_code=404, detail="Snapshot bulunamadı")
         
         db.commit()
         logger.info(f"Veritabanı değişiklikleri commit edildi")
+
+        # snapshot_id ile sabitlenmiş cache'li yanıtlar (bu worker ve shared backend'de tüm node) düşer
+        invalidate_snapshot(snapshot_id)
         
-        # Upload status'u da temizle
-        if snapshot_id in upload_statuses:
-            del upload_statuses[snapshot_id]
-            logger.debug(f"Upload status temizlendi")
-        
-        logger.info(f"Snapshot {snapshot_id} silindi, {deleted_count} kayıt kaldırıldı")
+        logger.info(f"Snapshot {snapshot_id} {'arşivlendi' if archive else 'silindi'}")
         
         return {
-            "message": f"Snapshot {snapshot_id} başarıyla silindi",
-            "deleted_records": deleted_count
+            "message": f"Snapshot {snapshot_id} başarıyla {'arşivlendi' if archive else 'silindi'}",
+            "dropped_partitions": result['dropped_partitions'],
+            "deleted_records": result['deleted_records'],
+            "archived": archive,
         }
         
     except HTTPException:
@@ -158,14 +306,14 @@ async def delete_snapshot(snapshot_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/cleanup", summary="Cleanup old snapshots")
-async def cleanup_snapshots(
+def cleanup_snapshots(
     keep_count: int = 5,
     db: Session = Depends(get_db)
 ):
     """Eski snapshot'ları temizle"""
     
     try:
-        await GTFSUploadService.cleanup_old_snapshots(db, keep_count)
+        GTFSUploadService.cleanup_old_snapshots(db, keep_count)
         
         return {
             "message": f"Cleanup completed, kept latest {keep_count} snapshots"
@@ -174,46 +322,3 @@ async def cleanup_snapshots(
     except Exception as e:
         logger.error(f"Error during cleanup: {str(e)}")
         raise HTTPException(status_code=500, detail="Error during cleanup")
-
-
-async def process_gtfs_upload(
-    file_content: bytes,
-    snapshot_id: str
-):
-    """Background task olarak GTFS upload'ını işle - Thread-safe DB session ile"""
-    
-    # Background task'ta YENİ DB SESSION oluştur (thread-safe)
-    from app.db.database import SessionLocal
-    db = SessionLocal()
-    
-    try:
-        # Yeni session ile upload service oluştur
-        upload_service = GTFSUploadService(db)
-        upload_service.snapshot_id = snapshot_id  # Mevcut snapshot_id'yi kullan
-        
-        # Upload'ı işle
-        result = await upload_service.process_gtfs_zip(file_content)
-        
-        # Durumu güncelle
-        upload_statuses[snapshot_id] = result
-        
-        logger.info(f"GTFS upload completed for snapshot {snapshot_id}: {result['status']}")
-        
-    except Exception as e:
-        logger.error(f"Error in background GTFS upload {snapshot_id}: {str(e)}")
-        
-        # Hata durumunu kaydet
-        upload_statuses[snapshot_id] = {
-            'snapshot_id': snapshot_id,
-            'status': 'failed',
-            'total_files': 0,
-            'processed_files': 0,
-            'errors': [str(e)],
-            'started_at': datetime.utcnow(),
-            'completed_at': datetime.utcnow(),
-        }
-        
-    finally:
-        # Session'ı mutlaka kapat
-        db.close()
-        logger.info(f"Database session closed for snapshot {snapshot_id}")
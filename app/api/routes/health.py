@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.db.database import get_db
+from app.db.database import get_db, pool_stats
+from app.services.response_cache import get_response_cache
 
 router = APIRouter()
 
@@ -22,3 +23,13 @@ def db_health_check(db: Session = Depends(get_db)):
         return {"status": "error", "database": "disconnected", "error": str(e)}
 
 
+@router.get("/health/db/pool", summary="Connection pool metrics")
+def db_pool_metrics():
+    """Bu worker process'inin pool'ları: doluluk (saturation), bekleyenler, checkout bekleme süresi histogramı"""
+    return {"pools": pool_stats()}
+
+
+@router.get("/health/cache", summary="Response cache metrics")
+def response_cache_metrics():
+    """Bu worker process'inin yanıt cache'i: kayıt sayısı, byte doluluğu, hit/miss, LRU tahliyeleri"""
+    return {"response_cache": get_response_cache().stats()}
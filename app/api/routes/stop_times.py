@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.deps import Pagination, pagination, resolve_read_snapshot_id
+from app.api.responses import rows_response
+from app.db.database import get_async_db, get_read_db
 from app.services.stop_times_service import StopTimesService
 from app.schemas.stop_times import StopTimesRead as StopTimesSchema, StopTimesCreate, StopTimesUpdate
 
@@ -14,43 +17,44 @@ router = APIRouter()
 
 @router.get("/", response_model=List[StopTimesSchema], summary="List all stop times")
 async def list_stop_times(
-    snapshot_id: Optional[UUID] = Query(None), skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), page: Pagination = Depends(pagination),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = StopTimesService(db)
-    return service.get_all(snapshot_id=snapshot_id, skip=skip, limit=limit)
+    service = StopTimesService(db).project(StopTimesSchema)
+    return await page.fetch(partial(service.get_page, snapshot_id), service.projection)
 
 
 @router.post("/", response_model=StopTimesSchema, summary="Create new stop time")
 async def create_stop_time(
-    stop_time: StopTimesCreate, snapshot_id: UUID = Query(...), db: Session = Depends(get_db)
+    stop_time: StopTimesCreate, snapshot_id: UUID = Query(...), db: AsyncSession = Depends(get_async_db)
 ):
     service = StopTimesService(db)
-    return service.create(stop_time, snapshot_id)
+    return await service.create(stop_time, snapshot_id)
 
 
 @router.get("/trip/{trip_id}", response_model=List[StopTimesSchema], summary="Get stop times by trip")
 async def get_stop_times_by_trip(
-    trip_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    trip_id: str, request: Request, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = StopTimesService(db)
-    return service.get_by_trip(trip_id, snapshot_id)
+    service = StopTimesService(db).project(StopTimesSchema)
+    return rows_response(request, await service.get_by_trip(trip_id, snapshot_id), service.projection)
 
 
 @router.get("/stop/{stop_id}", response_model=List[StopTimesSchema], summary="Get stop times by stop")
 async def get_stop_times_by_stop(
-    stop_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    stop_id: str, request: Request, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = StopTimesService(db)
-    return service.get_by_stop(stop_id, snapshot_id)
+    service = StopTimesService(db).project(StopTimesSchema)
+    return rows_response(request, await service.get_by_stop(stop_id, snapshot_id), service.projection)
 
 
 @router.get("/stop/{stop_id}/schedule", response_model=List[StopTimesSchema], summary="Get stop schedule")
 async def get_stop_schedule(
     stop_id: str,
+    request: Request,
     start_time: str = Query("00:00:00", description="Start time (HH:MM:SS)"),
     end_time: str = Query("23:59:59", description="End time (HH:MM:SS)"),
-    snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = StopTimesService(db)
-    return service.get_schedule_for_stop(stop_id, start_time, end_time, snapshot_id)
+    service = StopTimesService(db).project(StopTimesSchema)
+    return rows_response(request, await service.get_schedule_for_stop(stop_id, start_time, end_time, snapshot_id), service.projection)
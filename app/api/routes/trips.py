@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.deps import Pagination, ResponseCaching, pagination, resolve_read_snapshot_id, response_caching
+from app.api.responses import RowsJSONResponse
+from app.db.database import get_async_db, get_read_db
 from app.services.trips_service import TripsService
 from app.schemas.trips import TripsRead as TripsSchema, TripsCreate, TripsUpdate
 
@@ -14,73 +17,75 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TripsSchema], summary="List all trips")
 async def list_trips(
-    snapshot_id: Optional[UUID] = Query(None, description="Filter by snapshot ID"),
-    skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id),
+    page: Pagination = Depends(pagination),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = TripsService(db)
-    return service.get_all(snapshot_id=snapshot_id, skip=skip, limit=limit)
+    service = TripsService(db).project(TripsSchema)
+    return await page.fetch(partial(service.get_page, snapshot_id), service.projection)
 
 
 @router.get("/active", response_model=List[TripsSchema], summary="Get active trips now")
 async def get_active_trips_now(
-    snapshot_id: Optional[UUID] = Query(None, description="Filter by snapshot ID"),
-    skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id),
+    page: Pagination = Depends(pagination),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    service = TripsService(db)
-    return service.get_active_trips_now(snapshot_id=snapshot_id, skip=skip, limit=limit)
+    service = TripsService(db).project(TripsSchema)
+    return await page.fetch(partial(service.get_active_trips_now, snapshot_id=snapshot_id), service.projection)
 
 @router.get("/{trip_id}", response_model=TripsSchema, summary="Get trip by ID")
 async def get_trip(
-    trip_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    trip_id: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
     service = TripsService(db)
-    trip = service.get_by_id(trip_id, snapshot_id)
+    trip = await service.get_by_id(trip_id, snapshot_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     return trip
 
 @router.get("/agency/{agency_id}", response_model=List[TripsSchema], summary="Get trips by agency")
 async def get_trip_by_agency(
-    agency_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)    
+    agency_id: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)    
 ):
-    service = TripsService(db)
+    service = TripsService(db).project(TripsSchema)
 
-    trips = service.get_by_agency(agency_id, snapshot_id)
+    trips = await service.get_by_agency(agency_id, snapshot_id)
     if not trips:
         raise HTTPException(status_code=404, detail="Trips not found")
-    return trips
+    return RowsJSONResponse(trips, service.projection)
 
 @router.post("/", response_model=TripsSchema, summary="Create new trip")
 async def create_trip(
-    trip: TripsCreate, snapshot_id: UUID = Query(...), db: Session = Depends(get_db)
+    trip: TripsCreate, snapshot_id: UUID = Query(...), db: AsyncSession = Depends(get_async_db)
 ):
     service = TripsService(db)
-    return service.create(trip, snapshot_id)
+    return await service.create(trip, snapshot_id)
 
 
 @router.get("/route/{route_id}", response_model=List[TripsSchema], summary="Get trips by route")
 async def get_trips_by_route(
-    route_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    route_id: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = TripsService(db)
-    return service.get_by_route(route_id, snapshot_id)
+    service = TripsService(db).project(TripsSchema)
+    return RowsJSONResponse(await service.get_by_route(route_id, snapshot_id), service.projection)
 
 
 @router.get("/service/{service_id}", response_model=List[TripsSchema], summary="Get trips by service")
 async def get_trips_by_service(
-    service_id: str, snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    service_id: str, snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id), db: AsyncSession = Depends(get_read_db)
 ):
-    service = TripsService(db)
-    return service.get_by_service(service_id, snapshot_id)
+    service = TripsService(db).project(TripsSchema)
+    return RowsJSONResponse(await service.get_by_service(service_id, snapshot_id), service.projection)
 
 
 @router.get("/stats/by-route", summary="Get trips summary by route")
 async def get_trips_summary_by_route(
-    snapshot_id: Optional[UUID] = Query(None), db: Session = Depends(get_db)
+    snapshot_id: Optional[str] = Depends(resolve_read_snapshot_id),
+    cache: ResponseCaching = Depends(response_caching),
+    db: AsyncSession = Depends(get_read_db)
 ):
     service = TripsService(db)
-    return service.get_trips_summary_by_route(snapshot_id)
+    return await cache.fetch(partial(service.get_trips_summary_by_route, snapshot_id))
 
 
@@ -1,22 +1,84 @@
 from __future__ import annotations
 
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Type
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 # Base is now imported from models.base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 
 from app.core.config import get_settings
+from app.db.pool_metrics import PoolMetrics, metered_pool_class
+from app.db.replicas import ReplicaRouter
 
 settings = get_settings()
 
 # PostgreSQL veritabanı bağlantı URL'si
 DATABASE_URL = settings.DATABASE_URL
 
+
+def _pool_options(pool_class: Type[Pool], metrics: PoolMetrics, is_async: bool = False) -> Dict[str, Any]:
+    """Settings'teki pool ayarlarından create_engine argümanları"""
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # Bağlantılar transaction sonunda PgBouncer'a döner: uygulama tarafında pool tutulmaz,
+        # sunucu tarafı prepared statement'lar başka bir backend'e düşebileceği için kapatılır
+        options: Dict[str, Any] = {'poolclass': metered_pool_class(NullPool, metrics)}
+        if is_async:
+            options['connect_args'] = {
+                'statement_cache_size': 0,
+                'prepared_statement_cache_size': 0,
+                'prepared_statement_name_func': lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+
+    metrics.capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return {
+        'poolclass': metered_pool_class(pool_class, metrics),
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+# Pool checkout istatistikleri (process başına) - /api/health/db/pool
+sync_pool_metrics = PoolMetrics('sync')
+async_pool_metrics = PoolMetrics('async')
+
 # SQLAlchemy engine oluştur
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_pool_options(QueuePool, sync_pool_metrics))
 
 # Session factory oluştur
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# API okuma/yazma yolu için async engine (asyncpg): sorgular event loop'u bloklamaz.
+# Senkron engine ingest (COPY, process pool), kuyruk ve alembic için kalır.
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_pool_options(AsyncAdaptedQueuePool, async_pool_metrics, is_async=True)
+)
+
+# expire_on_commit=False: commit sonrası nesne alanlarına erişim lazy (senkron) yükleme tetiklemesin
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+# Read replica'lar yalnızca async okuma yolunda kullanılır; yazmalar, ingest ve kuyruk primary'dedir
+replica_pool_metrics = [PoolMetrics(f'replica-{i}') for i in range(len(settings.DATABASE_REPLICA_URLS))]
+replica_engines = [
+    create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        **_pool_options(AsyncAdaptedQueuePool, metrics, is_async=True),
+    )
+    for url, metrics in zip(settings.DATABASE_REPLICA_URLS, replica_pool_metrics)
+]
+replica_router = ReplicaRouter(replica_engines, settings.DATABASE_REPLICA_RETRY_SECONDS)
+
 # Base model sınıfı - will be imported separately to avoid circular imports
 
 
@@ -26,3 +88,49 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """Okuma session'ı: sıradaki sağlıklı replica, yoksa primary
+
+    Replica'ya bağlantı burada kurulur ki erişilemeyen replica isteği düşürmeden atlansın.
+    """
+    for replica in replica_router.candidates():
+        db = AsyncSessionLocal(bind=replica)
+        try:
+            await db.connection()
+        except (DBAPIError, OSError) as e:
+            await db.close()
+            replica_router.mark_down(replica, e)
+            continue
+
+        async with db:
+            yield db
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """GET uçlarının okuma session'ı (read_session)"""
+    async with read_session() as db:
+        yield db
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Bu process'teki engine pool'larının anlık durumu ve checkout istatistikleri"""
+    return [
+        sync_pool_metrics.snapshot(engine.pool),
+        async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+        *(
+            {**metrics.snapshot(replica.sync_engine.pool), 'replica': status}
+            for replica, metrics, status in zip(replica_engines, replica_pool_metrics, replica_router.status())
+        ),
+    ]
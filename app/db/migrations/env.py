@@ -35,6 +35,22 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Snapshot partition'larını (ve onlara klonlanan FK'leri) autogenerate karşılaştırmasından çıkar
+
+    Partition'lar ingest sırasında oluşturulur, modeli yoktur; üst tablolar zaten karşılaştırılır.
+    """
+    if type_ == "table" and reflected and compare_to is None:
+        return name not in target_metadata.tables and not any(
+            name.startswith(f"{table}_") for table in target_metadata.tables
+        )
+    if type_ == "foreign_key_constraint" and reflected and compare_to is None:
+        return object.referred_table.name in target_metadata.tables
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -58,6 +74,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -80,7 +97,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,305 @@
+"""Partition GTFS tables by snapshot_id
+
+Her GTFS tablosu snapshot_id'ye göre LIST partition'lanır; PK ve FK'ler snapshot_id'yi içerir.
+Snapshot silme/arşivleme DETACH PARTITION ile katalog işlemi olur, snapshot filtreli sorgular
+tek partition'a budanır. Partition'ı olmayan snapshot'lara CRUD ile eklenen kayıtlar
+<tablo>_default partition'ına düşer.
+
+Şema daha önce Base.metadata.create_all ile (partition'sız) oluşturulduysa mevcut veri
+snapshot başına bir partition'a taşınır.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITION_BY = 'LIST (snapshot_id)'
+
+# FK sırasında: referans verilen tablolar önce
+GTFS_TABLES = (
+    'agency', 'calendar', 'calendar_dates', 'feed_info', 'routes', 'stops',
+    'shapes', 'fare_attributes', 'fare_rules', 'trips', 'stop_times',
+)
+
+
+def _snapshot_columns():
+    return [
+        sa.Column('snapshot_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def _snapshot_fk(name, columns, table, ref_columns):
+    return sa.ForeignKeyConstraint(
+        [*columns, 'snapshot_id'],
+        [f'{table}.{c}' for c in (*ref_columns, 'snapshot_id')],
+        name=name,
+    )
+
+
+def _partition_name(table_name: str, snapshot_id: str) -> str:
+    # app.services.gtfs_staging.partition_name ile aynı kural
+    suffix = re.sub(r'[^0-9A-Za-z_]', '', snapshot_id)
+    return f"{table_name}_{suffix}"[:63]
+
+
+def _relkind(bind, table_name: str):
+    return bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {'name': table_name}
+    ).scalar()
+
+
+def _create_gtfs_tables() -> None:
+    op.create_table(
+        'agency',
+        sa.Column('agency_id', sa.String(), nullable=False),
+        sa.Column('agency_name', sa.String(), nullable=False),
+        sa.Column('agency_url', sa.String(), nullable=False),
+        sa.Column('agency_timezone', sa.String(), nullable=False),
+        sa.Column('agency_lang', sa.String(), nullable=True),
+        sa.Column('agency_phone', sa.String(), nullable=True),
+        sa.Column('agency_fare_url', sa.String(), nullable=True),
+        sa.Column('agency_email', sa.String(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('agency_id', 'snapshot_id'),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'calendar',
+        sa.Column('service_id', sa.String(), nullable=False),
+        sa.Column('monday', sa.SmallInteger(), nullable=True),
+        sa.Column('tuesday', sa.SmallInteger(), nullable=True),
+        sa.Column('wednesday', sa.SmallInteger(), nullable=True),
+        sa.Column('thursday', sa.SmallInteger(), nullable=True),
+        sa.Column('friday', sa.SmallInteger(), nullable=True),
+        sa.Column('saturday', sa.SmallInteger(), nullable=True),
+        sa.Column('sunday', sa.SmallInteger(), nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('service_id', 'snapshot_id'),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'calendar_dates',
+        sa.Column('service_id', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('exception_type', sa.SmallInteger(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('service_id', 'date', 'snapshot_id'),
+        _snapshot_fk('fk_calendar_dates_calendar', ['service_id'], 'calendar', ['service_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'feed_info',
+        sa.Column('feed_publisher_name', sa.String(), nullable=True),
+        sa.Column('feed_publisher_url', sa.String(), nullable=True),
+        sa.Column('feed_lang', sa.String(), nullable=True),
+        sa.Column('feed_start_date', sa.Date(), nullable=True),
+        sa.Column('feed_end_date', sa.Date(), nullable=True),
+        sa.Column('feed_version', sa.String(), nullable=True),
+        sa.Column('feed_contact_email', sa.String(), nullable=True),
+        sa.Column('feed_contact_url', sa.String(), nullable=True),
+        sa.Column('id', sa.String(), nullable=False),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('id', 'snapshot_id'),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'routes',
+        sa.Column('route_id', sa.String(), nullable=False),
+        sa.Column('agency_id', sa.String(), nullable=True),
+        sa.Column('route_short_name', sa.String(), nullable=True),
+        sa.Column('route_long_name', sa.String(), nullable=True),
+        sa.Column('route_desc', sa.String(), nullable=True),
+        sa.Column('route_type', sa.SmallInteger(), nullable=False),
+        sa.Column('route_url', sa.String(), nullable=True),
+        sa.Column('route_color', sa.String(), nullable=True),
+        sa.Column('route_text_color', sa.String(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('route_id', 'snapshot_id'),
+        _snapshot_fk('fk_routes_agency', ['agency_id'], 'agency', ['agency_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'stops',
+        sa.Column('stop_id', sa.String(), nullable=False),
+        sa.Column('stop_name', sa.String(), nullable=False),
+        sa.Column('stop_desc', sa.String(), nullable=True),
+        sa.Column('stop_lat', sa.Float(), nullable=False),
+        sa.Column('stop_lon', sa.Float(), nullable=False),
+        sa.Column('zone_id', sa.String(), nullable=True),
+        sa.Column('stop_url', sa.String(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('stop_id', 'snapshot_id'),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'shapes',
+        sa.Column('shape_id', sa.String(), nullable=False),
+        sa.Column('shape_pt_lat', sa.Float(), nullable=False),
+        sa.Column('shape_pt_lon', sa.Float(), nullable=False),
+        sa.Column('shape_pt_sequence', sa.Integer(), nullable=False),
+        sa.Column('shape_dist_traveled', sa.Float(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('shape_id', 'shape_pt_sequence', 'snapshot_id'),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'fare_attributes',
+        sa.Column('fare_id', sa.String(), nullable=False),
+        sa.Column('agency_id', sa.String(), nullable=True),
+        sa.Column('price', sa.Numeric(), nullable=True),
+        sa.Column('currency_type', sa.String(), nullable=True),
+        sa.Column('payment_method', sa.SmallInteger(), nullable=True),
+        sa.Column('transfers', sa.SmallInteger(), nullable=True),
+        sa.Column('transfer_duration', sa.Integer(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('fare_id', 'snapshot_id'),
+        _snapshot_fk('fk_fare_attributes_agency', ['agency_id'], 'agency', ['agency_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'fare_rules',
+        sa.Column('fare_id', sa.String(), nullable=False),
+        sa.Column('route_id', sa.String(), nullable=False),
+        sa.Column('origin_id', sa.String(), nullable=True),
+        sa.Column('destination_id', sa.String(), nullable=True),
+        sa.Column('contains_id', sa.String(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('fare_id', 'route_id', 'snapshot_id'),
+        _snapshot_fk('fk_fare_rules_fare_attributes', ['fare_id'], 'fare_attributes', ['fare_id']),
+        _snapshot_fk('fk_fare_rules_routes', ['route_id'], 'routes', ['route_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'trips',
+        sa.Column('trip_id', sa.String(), nullable=False),
+        sa.Column('route_id', sa.String(), nullable=True),
+        sa.Column('service_id', sa.String(), nullable=True),
+        sa.Column('trip_headsign', sa.String(), nullable=True),
+        sa.Column('direction_id', sa.SmallInteger(), nullable=True),
+        sa.Column('block_id', sa.String(), nullable=True),
+        sa.Column('shape_id', sa.String(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('trip_id', 'snapshot_id'),
+        _snapshot_fk('fk_trips_routes', ['route_id'], 'routes', ['route_id']),
+        _snapshot_fk('fk_trips_calendar', ['service_id'], 'calendar', ['service_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+    op.create_table(
+        'stop_times',
+        sa.Column('trip_id', sa.String(), nullable=False),
+        sa.Column('stop_sequence', sa.Integer(), nullable=False),
+        sa.Column('arrival_time', sa.String(), nullable=True),
+        sa.Column('departure_time', sa.String(), nullable=True),
+        sa.Column('stop_id', sa.String(), nullable=True),
+        sa.Column('stop_headsign', sa.String(), nullable=True),
+        sa.Column('pickup_type', sa.SmallInteger(), nullable=True),
+        sa.Column('drop_off_type', sa.SmallInteger(), nullable=True),
+        sa.Column('shape_dist_traveled', sa.Float(), nullable=True),
+        *_snapshot_columns(),
+        sa.PrimaryKeyConstraint('trip_id', 'stop_sequence', 'snapshot_id'),
+        _snapshot_fk('fk_stop_times_trips', ['trip_id'], 'trips', ['trip_id']),
+        _snapshot_fk('fk_stop_times_stops', ['stop_id'], 'stops', ['stop_id']),
+        postgresql_partition_by=PARTITION_BY,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    relkinds = {table: _relkind(bind, table) for table in GTFS_TABLES}
+
+    if all(kind == 'p' for kind in relkinds.values()):
+        # create_all ile zaten partition'lı oluşturulmuş
+        legacy = []
+    else:
+        legacy = [table for table, kind in relkinds.items() if kind == 'r']
+        if any(kind == 'p' for kind in relkinds.values()):
+            raise RuntimeError(f"Partially partitioned GTFS schema, cannot migrate: {relkinds}")
+
+        # Eski (partition'sız) tablolar kenara alınır; isimleri yeni tablolarla çakışmasın diye
+        # PK/unique/FK constraint'leri düşürülür
+        for table in reversed(legacy):
+            op.rename_table(table, f'{table}_unpartitioned')
+        for table in reversed(legacy):
+            constraints = bind.execute(sa.text(
+                "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:name) AND contype IN ('p', 'u', 'f')"
+            ), {'name': f'{table}_unpartitioned'}).scalars().all()
+            for name in constraints:
+                op.execute(f'ALTER TABLE "{table}_unpartitioned" DROP CONSTRAINT IF EXISTS "{name}" CASCADE')
+
+        _create_gtfs_tables()
+
+    for table in GTFS_TABLES:
+        op.execute(f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    if legacy:
+        snapshot_ids = bind.execute(sa.text(" UNION ".join(
+            f'SELECT DISTINCT snapshot_id FROM "{table}_unpartitioned"' for table in legacy
+        ))).scalars().all()
+
+        for snapshot_id in snapshot_ids:
+            literal = snapshot_id.replace("'", "''")
+            for table in GTFS_TABLES:
+                op.execute(
+                    f'CREATE TABLE "{_partition_name(table, snapshot_id)}" '
+                    f'PARTITION OF "{table}" FOR VALUES IN (\'{literal}\')'
+                )
+
+        for table in legacy:
+            columns = ', '.join(
+                f'"{c}"' for c in bind.execute(sa.text(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() AND table_name = :name ORDER BY ordinal_position"
+                ), {'name': table}).scalars().all()
+            )
+            op.execute(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{table}_unpartitioned"')
+
+        for table in reversed(legacy):
+            op.drop_table(f'{table}_unpartitioned')
+
+    if _relkind(bind, 'ingest_jobs') is None:
+        op.create_table(
+            'ingest_jobs',
+            sa.Column('snapshot_id', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('priority', sa.Integer(), nullable=False),
+            sa.Column('source_path', sa.String(), nullable=False),
+            sa.Column('source_filename', sa.String(), nullable=True),
+            sa.Column('ingest_mode', sa.String(), nullable=False),
+            sa.Column('progress', sa.JSON(), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('worker_id', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('snapshot_id'),
+        )
+        op.create_index('ix_ingest_jobs_claim', 'ingest_jobs', ['status', 'priority', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ingest_jobs_claim', table_name='ingest_jobs')
+    op.drop_table('ingest_jobs')
+    # Partition'lar üst tabloyla birlikte silinir
+    for table in reversed(GTFS_TABLES):
+        op.drop_table(table)
@@ -0,0 +1,119 @@
+"""Add snapshots catalog table
+
+Snapshot listeleri GTFS tablolarından (DISTINCT agency.snapshot_id) türetilmek yerine
+ingest sırasında yazılan katalogdan okunur. Mevcut snapshot'lar (herhangi bir GTFS tablosunda
+satırı olan) partition'larından hesaplanan satır sayıları ve boyutlarla 'published' olarak
+kataloğa eklenir; katalogda zaten olanlara dokunulmaz.
+
+Tablo daha önce Base.metadata.create_all ile oluşturulduysa yeniden oluşturulmaz.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import json
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GTFS_TABLES = (
+    'agency', 'calendar', 'calendar_dates', 'feed_info', 'routes', 'stops',
+    'shapes', 'fare_attributes', 'fare_rules', 'trips', 'stop_times',
+)
+
+
+def _partition_name(table_name: str, snapshot_id: str) -> str:
+    # app.services.gtfs_staging.partition_name ile aynı kural
+    suffix = re.sub(r'[^0-9A-Za-z_]', '', snapshot_id)
+    return f"{table_name}_{suffix}"[:63]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'snapshots',
+        sa.Column('snapshot_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('source_filename', sa.String(), nullable=True),
+        sa.Column('source_sha256', sa.String(), nullable=True),
+        sa.Column('source_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('row_counts', sa.JSON(), nullable=True),
+        sa.Column('table_bytes', sa.JSON(), nullable=True),
+        sa.Column('total_rows', sa.BigInteger(), nullable=True),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('feed_version', sa.String(), nullable=True),
+        sa.Column('feed_start_date', sa.Date(), nullable=True),
+        sa.Column('feed_end_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('snapshot_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_snapshots_status_created', 'snapshots', ['status', 'created_at'], if_not_exists=True)
+
+    # Mevcut snapshot'ları kataloğa ekle - snapshot başına bir kez sayılır, sonra hiç.
+    # agency satırı olmayan snapshot'lar da kaçmasın diye tüm GTFS tablolarına bakılır.
+    bind = op.get_bind()
+    per_table = " UNION ALL ".join(
+        f'SELECT snapshot_id, min(created_at) AS created_at FROM "{table}" GROUP BY snapshot_id'
+        for table in GTFS_TABLES
+    )
+    snapshots = bind.execute(sa.text(f"""
+        SELECT s.snapshot_id, coalesce(min(s.created_at), now() AT TIME ZONE 'utc')
+        FROM ({per_table}) AS s
+        WHERE NOT EXISTS (SELECT 1 FROM snapshots c WHERE c.snapshot_id = s.snapshot_id)
+        GROUP BY s.snapshot_id
+    """)).all()
+
+    # create_all ile oluşturulmuş tabloda sonraki revizyonların NOT NULL 'feed' sütunu da vardır
+    has_feed = 'feed' in {column['name'] for column in sa.inspect(bind).get_columns('snapshots')}
+
+    for snapshot_id, created_at in snapshots:
+        row_counts, table_bytes = {}, {}
+        for table in GTFS_TABLES:
+            row_counts[table] = bind.execute(sa.text(
+                f'SELECT count(*) FROM "{table}" WHERE snapshot_id = :snapshot_id'
+            ), {'snapshot_id': snapshot_id}).scalar()
+            table_bytes[table] = bind.execute(sa.text(
+                "SELECT coalesce(pg_total_relation_size(to_regclass(:name)), 0)"
+            ), {'name': f'"{_partition_name(table, snapshot_id)}"'}).scalar()
+
+        feed = bind.execute(sa.text(
+            "SELECT feed_version, feed_start_date, feed_end_date FROM feed_info WHERE snapshot_id = :snapshot_id LIMIT 1"
+        ), {'snapshot_id': snapshot_id}).first()
+
+        bind.execute(sa.text(f"""
+            INSERT INTO snapshots (snapshot_id, status, row_counts, table_bytes, total_rows, total_bytes,
+                                   feed_version, feed_start_date, feed_end_date, created_at, published_at
+                                   {', feed' if has_feed else ''})
+            VALUES (:snapshot_id, 'published', :row_counts, :table_bytes, :total_rows, :total_bytes,
+                    :feed_version, :feed_start_date, :feed_end_date, :created_at, :created_at
+                    {", 'default'" if has_feed else ''})
+        """), {
+            'snapshot_id': snapshot_id,
+            'row_counts': json.dumps(row_counts),
+            'table_bytes': json.dumps(table_bytes),
+            'total_rows': sum(row_counts.values()),
+            'total_bytes': sum(table_bytes.values()),
+            'feed_version': feed.feed_version if feed else None,
+            'feed_start_date': feed.feed_start_date if feed else None,
+            'feed_end_date': feed.feed_end_date if feed else None,
+            'created_at': created_at,
+        })
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_snapshots_status_created', table_name='snapshots')
+    op.drop_table('snapshots')
@@ -0,0 +1,58 @@
+"""Add feed to snapshots and active snapshot pointers
+
+snapshot_id verilmeyen sorgular feed'in aktif snapshot'ına gider. Mevcut snapshot'lar
+'default' feed'ine atanır ve en yeni yayınlanmış snapshot aktif yapılır. create_all ile
+oluşturulmuş şemada mevcut sütun, indeks ve tablo yeniden oluşturulmaz.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('snapshots', sa.Column('feed', sa.String(), nullable=False, server_default='default'),
+                  if_not_exists=True)
+    op.alter_column('snapshots', 'feed', server_default=None)
+    op.create_index('ix_snapshots_feed_created', 'snapshots', ['feed', 'created_at'], if_not_exists=True)
+
+    op.create_table(
+        'active_snapshots',
+        sa.Column('feed', sa.String(), nullable=False),
+        sa.Column('snapshot_id', sa.String(), nullable=False),
+        sa.Column('previous_snapshot_id', sa.String(), nullable=True),
+        sa.Column('promoted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['snapshot_id'], ['snapshots.snapshot_id']),
+        sa.PrimaryKeyConstraint('feed'),
+        if_not_exists=True,
+    )
+
+    op.execute("""
+        INSERT INTO active_snapshots (feed, snapshot_id, promoted_at)
+        SELECT 'default', snapshot_id, now() AT TIME ZONE 'utc'
+        FROM snapshots
+        WHERE status = 'published'
+        ORDER BY created_at DESC
+        LIMIT 1
+        ON CONFLICT (feed) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('active_snapshots')
+    op.drop_index('ix_snapshots_feed_created', table_name='snapshots')
+    op.drop_column('snapshots', 'feed')
@@ -0,0 +1,44 @@
+"""Add lookup indexes for service queries
+
+Indeksler partition'lı üst tablolarda oluşturulur; PostgreSQL her partition'da (DEFAULT dahil)
+karşılığını kurar; mevcut indeksler atlanır. Oluşturma sırasında tablolara yazma bekler, okumalar devam eder.
+Yeni snapshot'ların partition'ları bu indeksleri staging'de kurup ATTACH ile bağlanır.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LOOKUP_INDEXES = (
+    ('ix_stop_times_stop_arrival', 'stop_times', ['stop_id', 'arrival_time']),
+    ('ix_trips_route', 'trips', ['route_id']),
+    ('ix_trips_service', 'trips', ['service_id']),
+    ('ix_routes_agency', 'routes', ['agency_id']),
+    ('ix_stops_zone', 'stops', ['zone_id']),
+    ('ix_fare_rules_route', 'fare_rules', ['route_id']),
+    ('ix_fare_attributes_agency', 'fare_attributes', ['agency_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in LOOKUP_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(LOOKUP_INDEXES):
+        op.drop_index(name, table_name=table)
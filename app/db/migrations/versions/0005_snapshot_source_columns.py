@@ -0,0 +1,31 @@
+"""Add source column order to the snapshot catalog
+
+Ingest, kaynak dosyaların sütun sırasını kataloğa yazar; GTFS ZIP export'u dosyaları bu
+sırayla yazar. Mevcut snapshot'larda değer boştur, export model sütun sırasını kullanır.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('snapshots', sa.Column('source_columns', sa.JSON(), nullable=True), if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('snapshots', 'source_columns')
@@ -0,0 +1,32 @@
+"""Add a per-snapshot write generation to the snapshot catalog
+
+BaseService CRUD yazımları snapshot'ın generation'ını aynı transaction'da artırır; yanıt
+cache'i ve Parquet önbelleği generation'ı anahtara katar. Mevcut snapshot'lar 0 ile başlar.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('snapshots', sa.Column('generation', sa.BigInteger(), server_default='0', nullable=False),
+                  if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('snapshots', 'generation')
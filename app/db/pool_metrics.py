@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+# Checkout bekleme süresi histogramının üst sınırları (saniye)
+WAIT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class PoolMetrics:
+    """Bir engine'in connection pool'u için process başına checkout istatistikleri
+
+    Bekleme süresi pool.connect() çağrısının tamamıdır (boş bağlantı beklemesi, yeni bağlantı
+    açılması ve pre-ping dahil). Değerler process'e özeldir; her uvicorn worker'ı kendi
+    pool'unu ve kendi sayaçlarını tutar.
+    """
+
+    def __init__(self, name: str, capacity: Optional[int] = None):
+        self.name = name
+        # pool_size + max_overflow; NullPool'da (PgBouncer modu) sınır yoktur
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.errors = 0
+            self.waiting = 0
+            self.peak_waiting = 0
+            self.peak_checked_out = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def begin_wait(self) -> None:
+        with self._lock:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+    def end_wait(self, wait: float, checked_out: Optional[int], outcome: str = 'checkout') -> None:
+        """outcome: 'checkout' (bağlantı alındı), 'timeout' (pool_timeout doldu), 'error' (bağlantı açılamadı)"""
+        with self._lock:
+            self.waiting -= 1
+            if outcome == 'timeout':
+                self.timeouts += 1
+            elif outcome == 'error':
+                self.errors += 1
+            else:
+                self.checkouts += 1
+            self.wait_sum += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.wait_buckets[next(i for i, bound in enumerate(WAIT_BUCKETS) if wait <= bound)] += 1
+            if checked_out is not None:
+                self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Anlık pool durumu + başlangıçtan beri birikmiş checkout istatistikleri"""
+        checked_out = _checked_out(pool)
+        with self._lock:
+            observed = self.checkouts + self.timeouts + self.errors
+            return {
+                'name': self.name,
+                'pool': type(pool).__name__,
+                'pid': os.getpid(),
+                'capacity': self.capacity,
+                'checked_out': checked_out,
+                'idle': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+                'saturation': _ratio(checked_out, self.capacity),
+                'peak_checked_out': self.peak_checked_out,
+                'peak_saturation': _ratio(self.peak_checked_out, self.capacity),
+                'waiting': self.waiting,
+                'peak_waiting': self.peak_waiting,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'wait_seconds': {
+                    'sum': round(self.wait_sum, 6),
+                    'avg': round(self.wait_sum / observed, 6) if observed else None,
+                    'max': round(self.wait_max, 6),
+                    # Kümülatif (le = "bu süreye kadar") - Prometheus histogram'ı ile aynı biçim
+                    'buckets': {
+                        ('+Inf' if math.isinf(bound) else str(bound)): count
+                        for bound, count in zip(WAIT_BUCKETS, _cumulative(self.wait_buckets))
+                    },
+                },
+            }
+
+
+class _MeteredPool:
+    """pool.connect()'i ölçen mixin; metrics sınıf özelliğidir ki pool.recreate() (dispose) sonrası da kalsın"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        metrics = self.metrics
+        metrics.begin_wait()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.end_wait(time.perf_counter() - started, None, 'timeout')
+            raise
+        except BaseException:
+            metrics.end_wait(time.perf_counter() - started, None, 'error')
+            raise
+        metrics.end_wait(time.perf_counter() - started, _checked_out(self))
+        return connection
+
+
+def metered_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """create_engine(poolclass=...) için checkout'ları metrics'e yazan pool sınıfı"""
+    return type(f"Metered{base.__name__}", (_MeteredPool, base), {'metrics': metrics})
+
+
+def _checked_out(pool: Pool) -> Optional[int]:
+    return pool.checkedout() if hasattr(pool, 'checkedout') else None
+
+
+def _ratio(value: Optional[int], capacity: Optional[int]) -> Optional[float]:
+    if value is None or not capacity:
+        return None
+    return round(value / capacity, 4)
+
+
+def _cumulative(counts):
+    total = 0
+    for count in counts:
+        total += count
+        yield total
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, List, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """GET istekleri için read replica seçimi (process başına)
+
+    Replica'lar round-robin sırayla denenir; bağlantı kurulamayan replica retry_after saniye
+    atlanır, süre dolunca tekrar denenir. Hiç sağlıklı replica yoksa okuma primary'ye düşer.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine], retry_after: float):
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self._next = 0
+        self._down_until: Dict[int, float] = {}
+
+    def candidates(self) -> List[AsyncEngine]:
+        """Bu istekte denenecek replica'lar: sıradaki replica'dan başlayarak, atlananlar hariç"""
+        if not self.engines:
+            return []
+
+        start = self._next
+        self._next = (start + 1) % len(self.engines)
+        now = time.monotonic()
+        ordered = self.engines[start:] + self.engines[:start]
+        return [engine for engine in ordered if self._down_until.get(id(engine), 0.0) <= now]
+
+    def mark_down(self, engine: AsyncEngine, error: BaseException) -> None:
+        """Replica'yı retry_after saniye devre dışı bırak"""
+        self._down_until[id(engine)] = time.monotonic() + self.retry_after
+        logger.warning(
+            f"Read replica {engine.url.render_as_string(hide_password=True)} unavailable, "
+            f"skipping it for {self.retry_after:.0f}s: {error}"
+        )
+
+    def status(self) -> List[dict]:
+        """Replica'ların erişilebilirlik durumu"""
+        now = time.monotonic()
+        return [
+            {
+                'url': engine.url.render_as_string(hide_password=True),
+                'available': self._down_until.get(id(engine), 0.0) <= now,
+            }
+            for engine in self.engines
+        ]
@@ -11,12 +11,12 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import __version__
+from app.api.deps import NEXT_CURSOR_HEADER
 from app.api.router import api_router
 from app.core.config import get_settings
 from app.core.logging_config import configure_logging
-from app.db.database import engine
-from app.models.base import Base
-from app.models import *  # noqa: F401,F403 - ensure all models are imported for Base.metadata
+from app.db.database import async_engine, engine, replica_engines, SessionLocal
+from app.services.ingest_queue import IngestWorker
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
@@ -24,7 +24,8 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     configure_logging(settings.DEBUG)
     logging.getLogger(__name__).info("Starting app v%s", __version__)
 
-    # Database connection check and logging
+    # Database connection check and logging. Şema Alembic'e aittir; uygulama başlamadan önce
+    # `alembic upgrade head` çalıştırılmalıdır (Docker imajı bunu başlangıçta yapar)
     try:
         with engine.connect() as connection:
             connection.execute(text("SELECT 1"))
@@ -33,15 +34,25 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
             engine.url.render_as_string(hide_password=True),
             getattr(engine.pool, "status", lambda: "unknown")(),
         )
-        Base.metadata.create_all(bind=engine)
     except SQLAlchemyError as exc:
         logging.getLogger(__name__).warning("DB init skipped: %s", exc)
 
+    # Kalıcı kuyruktan GTFS yükleme işlerini alan worker döngüsü
+    ingest_worker = None
+    if settings.INGEST_WORKER_ENABLED:
+        ingest_worker = IngestWorker(SessionLocal)
+        ingest_worker.start()
+
     try:
         yield
     finally:
-        logging.getLogger(__name__).info("Disposing database engine")
+        if ingest_worker is not None:
+            logging.getLogger(__name__).info("Stopping ingest worker")
+            await ingest_worker.stop()
+        logging.getLogger(__name__).info("Disposing database engines")
         engine.dispose()
+        for async_db_engine in (async_engine, *replica_engines):
+            await async_db_engine.dispose()
 
  
 
@@ -62,6 +73,7 @@ def create_app() -> FastAPI:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[NEXT_CURSOR_HEADER, "Link"],
         )
 
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
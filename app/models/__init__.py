@@ -1,23 +1,29 @@
+from .active_snapshot import ActiveSnapshot
 from .agency import Agency
 from .calendar import Calendar, CalendarDates
 from .fare_attributes import FareAttributes
 from .fare_rules import FareRules
 from .feed_info import FeedInfo
+from .ingest_job import IngestJob
 from .routes import Routes
 from .shapes import Shapes
+from .snapshot import Snapshot
 from .stops import Stops
 from .trips import Trips
 from .stop_times import StopTimes
 
 __all__ = [
+    "ActiveSnapshot",
     "Agency",
     "Calendar",
     "CalendarDates", 
     "FareAttributes",
     "FareRules",
     "FeedInfo",
+    "IngestJob",
     "Routes",
     "Shapes",
+    "Snapshot",
     "Stops",
     "Trips",
     "StopTimes",
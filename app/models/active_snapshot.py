@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey
+
+from app.models.base import Base
+
+
+class ActiveSnapshot(Base):
+    """Feed başına aktif snapshot işaretçisi - snapshot_id verilmeyen sorgular bu snapshot'a gider"""
+    __tablename__ = "active_snapshots"
+
+    feed = Column(String, primary_key=True)
+    snapshot_id = Column(String, ForeignKey("snapshots.snapshot_id"), nullable=False)
+    previous_snapshot_id = Column(String)                       # geri almak için bir önceki aktif snapshot
+    promoted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
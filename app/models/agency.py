@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, UniqueConstraint
+from sqlalchemy import Column, String
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class Agency(GTFSBase):
@@ -18,5 +18,5 @@ class Agency(GTFSBase):
     agency_email = Column(String)
 
     __table_args__ = (
-        UniqueConstraint('agency_id', 'snapshot_id', name='uq_agency_snapshot'),
+        SNAPSHOT_PARTITIONING,
     )
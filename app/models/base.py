@@ -2,21 +2,47 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, inspect
+from sqlalchemy import Column, String, DateTime, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# GTFS tabloları snapshot_id'ye göre LIST partition'lanır: her ingest edilen snapshot kendi
+# partition'ıdır (silme = DETACH + DROP), snapshot filtreli sorgular tek partition'a budanır.
+# Partition'ı olmayan snapshot'lara CRUD ile eklenen kayıtlar <tablo>_default'a düşer.
+# İndeksler snapshot_id ile başlamaz: budanmış partition'da snapshot_id sabittir ve öne eklenmesi
+# her indeks girdisine aynı UUID'yi yazar; (anahtar, sıralama) sütunları yeterlidir.
+SNAPSHOT_PARTITIONING = {'postgresql_partition_by': 'LIST (snapshot_id)'}
+
 
 class GTFSBase(Base):
     __abstract__ = True
-    
-    snapshot_id = Column(String, nullable=False, default=lambda: str(uuid.uuid4()))
+
+    # Partition anahtarı her PK/FK'nin parçası olmalıdır; PK'nin son sütunudur
+    snapshot_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
     @classmethod
     def get_primary_key_column(cls):
         """Primary key sütununu döndür"""
         mapper = inspect(cls)
         return mapper.primary_key[0]
+
+
+def default_partition_name(table_name: str) -> str:
+    return f"{table_name}_default"
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_default_partitions(metadata, connection, **kw) -> None:
+    """create_all ile oluşturulan partition'lı tablolara DEFAULT partition ekle"""
+    if connection.dialect.name != 'postgresql':
+        return
+
+    for table in metadata.sorted_tables:
+        if table.dialect_options['postgresql'].get('partition_by'):
+            connection.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{default_partition_name(table.name)}" '
+                f'PARTITION OF "{table.name}" DEFAULT'
+            ))
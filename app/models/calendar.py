@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, SmallInteger, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, SmallInteger, Date, ForeignKeyConstraint
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class Calendar(GTFSBase):
@@ -20,17 +20,20 @@ class Calendar(GTFSBase):
     end_date = Column(Date)
 
     __table_args__ = (
-        UniqueConstraint('service_id', 'snapshot_id', name='uq_calendar_snapshot'),
+        SNAPSHOT_PARTITIONING,
     )
 
 
 class CalendarDates(GTFSBase):
     __tablename__ = "calendar_dates"
 
-    service_id = Column(String, ForeignKey("calendar.service_id"), primary_key=True)
+    service_id = Column(String, primary_key=True)
     date = Column(Date, primary_key=True)
     exception_type = Column(SmallInteger)
 
     __table_args__ = (
-        UniqueConstraint('service_id', 'date', 'snapshot_id', name='uq_calendar_dates_snapshot'),
+        ForeignKeyConstraint(
+            ['service_id', 'snapshot_id'], ['calendar.service_id', 'calendar.snapshot_id'], name='fk_calendar_dates_calendar'
+        ),
+        SNAPSHOT_PARTITIONING,
     )
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, SmallInteger, Integer, Numeric, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, SmallInteger, Integer, Numeric, ForeignKeyConstraint, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class FareAttributes(GTFSBase):
     __tablename__ = "fare_attributes"
 
     fare_id = Column(String, primary_key=True)
-    agency_id = Column(String, ForeignKey("agency.agency_id"))
+    agency_id = Column(String)
     price = Column(Numeric)
     currency_type = Column(String)
     payment_method = Column(SmallInteger)
@@ -17,5 +17,9 @@ class FareAttributes(GTFSBase):
     transfer_duration = Column(Integer)
 
     __table_args__ = (
-        UniqueConstraint('fare_id', 'snapshot_id', name='uq_fare_attributes_snapshot'),
+        ForeignKeyConstraint(
+            ['agency_id', 'snapshot_id'], ['agency.agency_id', 'agency.snapshot_id'], name='fk_fare_attributes_agency'
+        ),
+        Index('ix_fare_attributes_agency', 'agency_id'),
+        SNAPSHOT_PARTITIONING,
     )
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, ForeignKeyConstraint, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class FareRules(GTFSBase):
     __tablename__ = "fare_rules"
 
-    fare_id = Column(String, ForeignKey("fare_attributes.fare_id"), primary_key=True)
-    route_id = Column(String, ForeignKey("routes.route_id"), primary_key=True)
+    fare_id = Column(String, primary_key=True)
+    route_id = Column(String, primary_key=True)
     origin_id = Column(String)
     destination_id = Column(String)
     contains_id = Column(String)
 
     __table_args__ = (
-        UniqueConstraint('fare_id', 'route_id', 'snapshot_id', name='uq_fare_rules_snapshot'),
+        ForeignKeyConstraint(
+            ['fare_id', 'snapshot_id'], ['fare_attributes.fare_id', 'fare_attributes.snapshot_id'], name='fk_fare_rules_fare_attributes'
+        ),
+        ForeignKeyConstraint(
+            ['route_id', 'snapshot_id'], ['routes.route_id', 'routes.snapshot_id'], name='fk_fare_rules_routes'
+        ),
+        # (fare_id, route_id) PK'si fare_id aramalarını karşılar
+        Index('ix_fare_rules_route', 'route_id'),
+        SNAPSHOT_PARTITIONING,
     )
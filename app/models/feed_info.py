@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Date, UniqueConstraint
+from sqlalchemy import Column, String, Date
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class FeedInfo(GTFSBase):
@@ -21,5 +21,5 @@ class FeedInfo(GTFSBase):
     id = Column(String, primary_key=True, default="default")
 
     __table_args__ = (
-        UniqueConstraint('id', 'snapshot_id', name='uq_feed_info_snapshot'),
+        SNAPSHOT_PARTITIONING,
     )
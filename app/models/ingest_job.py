@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index
+
+from app.models.base import Base
+
+
+class IngestJob(Base):
+    """GTFS yükleme işi - tüm uvicorn worker'ları ve node'lar arasında paylaşılan kuyruk kaydı"""
+    __tablename__ = "ingest_jobs"
+
+    snapshot_id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, default="queued")  # queued / processing / completed / failed
+    priority = Column(Integer, nullable=False, default=0)      # büyük değer önce işlenir, eşitlikte FIFO
+    source_path = Column(String, nullable=False)                # diske alınmış ZIP (çok node'da paylaşımlı dizin olmalı)
+    source_filename = Column(String)
+    ingest_mode = Column(String, nullable=False, default="insert")
+    progress = Column(JSON)                                     # GTFSUploadService.upload_status
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    completed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_ingest_jobs_claim", "status", "priority", "created_at"),
+    )
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, SmallInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, SmallInteger, ForeignKeyConstraint, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class Routes(GTFSBase):
     __tablename__ = "routes"
 
     route_id = Column(String, primary_key=True)
-    agency_id = Column(String, ForeignKey("agency.agency_id"))
+    agency_id = Column(String)
     route_short_name = Column(String)
     route_long_name = Column(String)
     route_desc = Column(String)
@@ -19,5 +19,9 @@ class Routes(GTFSBase):
     route_text_color = Column(String)
 
     __table_args__ = (
-        UniqueConstraint('route_id', 'snapshot_id', name='uq_routes_snapshot'),
+        ForeignKeyConstraint(
+            ['agency_id', 'snapshot_id'], ['agency.agency_id', 'agency.snapshot_id'], name='fk_routes_agency'
+        ),
+        Index('ix_routes_agency', 'agency_id'),
+        SNAPSHOT_PARTITIONING,
     )
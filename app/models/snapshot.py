@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, Date, DateTime, JSON, Index
+
+from app.models.base import Base
+
+# feed belirtilmeden yüklenen snapshot'ların ve sorguların feed'i
+DEFAULT_FEED = "default"
+
+
+class Snapshot(Base):
+    """Snapshot kataloğu - ingest sırasında yazılır, yayınla aynı transaction'da tamamlanır
+
+    Listeleme GTFS tablolarını taramaz; satır sayıları ve boyutlar yayın anında hesaplanır.
+    """
+    __tablename__ = "snapshots"
+
+    snapshot_id = Column(String, primary_key=True)
+    feed = Column(String, nullable=False, default=DEFAULT_FEED)  # aynı kaynağın snapshot'ları; aktif işaretçi feed başınadır
+    status = Column(String, nullable=False, default="queued")  # queued / loading / published / failed / archived
+    source_filename = Column(String)
+    source_sha256 = Column(String)                              # yüklenen ZIP'in hash'i (aynı feed'in tekrar yüklenmesini tanımak için)
+    source_bytes = Column(BigInteger)
+    row_counts = Column(JSON)                                   # tablo adı -> satır sayısı
+    source_columns = Column(JSON)                               # tablo adı -> kaynak dosyadaki sütun sırası (export için)
+    table_bytes = Column(JSON)                                  # tablo adı -> partition boyutu (indeksler dahil)
+    total_rows = Column(BigInteger)
+    total_bytes = Column(BigInteger)
+    generation = Column(BigInteger, nullable=False, default=0, server_default='0')  # CRUD yazımlarında artar (yanıt cache'i anahtarı)
+    feed_version = Column(String)                               # feed_info.txt'ten
+    feed_start_date = Column(Date)
+    feed_end_date = Column(Date)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    published_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_snapshots_status_created", "status", "created_at"),
+        Index("ix_snapshots_feed_created", "feed", "created_at"),
+    )
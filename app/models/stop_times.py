@@ -1,23 +1,31 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Integer, SmallInteger, Float, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, SmallInteger, Float, ForeignKeyConstraint, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class StopTimes(GTFSBase):
     __tablename__ = "stop_times"
 
-    trip_id = Column(String, ForeignKey("trips.trip_id"), primary_key=True)
+    trip_id = Column(String, primary_key=True)
     stop_sequence = Column(Integer, primary_key=True)
     arrival_time = Column(String)  # GTFS allows 24:xx:xx format
     departure_time = Column(String)  # GTFS allows 24:xx:xx format
-    stop_id = Column(String, ForeignKey("stops.stop_id"))
+    stop_id = Column(String)
     stop_headsign = Column(String)
     pickup_type = Column(SmallInteger)
     drop_off_type = Column(SmallInteger)
     shape_dist_traveled = Column(Float)
 
     __table_args__ = (
-        UniqueConstraint('trip_id', 'stop_sequence', 'snapshot_id', name='uq_stop_times_snapshot'),
+        ForeignKeyConstraint(
+            ['trip_id', 'snapshot_id'], ['trips.trip_id', 'trips.snapshot_id'], name='fk_stop_times_trips'
+        ),
+        ForeignKeyConstraint(
+            ['stop_id', 'snapshot_id'], ['stops.stop_id', 'stops.snapshot_id'], name='fk_stop_times_stops'
+        ),
+        # get_by_stop / get_schedule_for_stop: durak filtresi + varış saatine göre sıralı okuma
+        Index('ix_stop_times_stop_arrival', 'stop_id', 'arrival_time'),
+        SNAPSHOT_PARTITIONING,
     )
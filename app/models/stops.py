@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Float, UniqueConstraint
+from sqlalchemy import Column, String, Float, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class Stops(GTFSBase):
@@ -17,5 +17,6 @@ class Stops(GTFSBase):
     stop_url = Column(String)
 
     __table_args__ = (
-        UniqueConstraint('stop_id', 'snapshot_id', name='uq_stops_snapshot'),
+        Index('ix_stops_zone', 'zone_id'),
+        SNAPSHOT_PARTITIONING,
     )
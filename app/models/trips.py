@@ -1,21 +1,29 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, String, SmallInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, SmallInteger, ForeignKeyConstraint, Index
 
-from app.models.base import GTFSBase
+from app.models.base import GTFSBase, SNAPSHOT_PARTITIONING
 
 
 class Trips(GTFSBase):
     __tablename__ = "trips"
 
     trip_id = Column(String, primary_key=True)
-    route_id = Column(String, ForeignKey("routes.route_id"))
-    service_id = Column(String, ForeignKey("calendar.service_id"))
+    route_id = Column(String)
+    service_id = Column(String)
     trip_headsign = Column(String)
     direction_id = Column(SmallInteger)
     block_id = Column(String)
     shape_id = Column(String)  # References shapes.shape_id but no FK constraint due to composite PK
 
     __table_args__ = (
-        UniqueConstraint('trip_id', 'snapshot_id', name='uq_trips_snapshot'),
+        ForeignKeyConstraint(
+            ['route_id', 'snapshot_id'], ['routes.route_id', 'routes.snapshot_id'], name='fk_trips_routes'
+        ),
+        ForeignKeyConstraint(
+            ['service_id', 'snapshot_id'], ['calendar.service_id', 'calendar.snapshot_id'], name='fk_trips_calendar'
+        ),
+        Index('ix_trips_route', 'route_id'),
+        Index('ix_trips_service', 'service_id'),
+        SNAPSHOT_PARTITIONING,
     )
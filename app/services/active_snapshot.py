@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.active_snapshot import ActiveSnapshot
+from app.models.snapshot import DEFAULT_FEED, Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Worker (process) başına çözümleme cache'i: feed -> (snapshot_id, geçerlilik sonu)
+_cache: Dict[str, Tuple[Optional[str], float]] = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate_active_snapshot_cache(feed: Optional[str] = None) -> None:
+    """Bu worker'ın cache'ini boşalt (feed None ise tamamını); diğer worker'lar TTL ile yakalar"""
+    with _cache_lock:
+        if feed is None:
+            _cache.clear()
+        else:
+            _cache.pop(feed, None)
+
+
+def _active_query(feed: str):
+    return select(ActiveSnapshot.snapshot_id).where(ActiveSnapshot.feed == feed)
+
+
+def _cached(feed: str) -> Tuple[bool, Optional[str]]:
+    with _cache_lock:
+        cached = _cache.get(feed)
+    if cached is not None and cached[1] > time.monotonic():
+        return True, cached[0]
+    return False, None
+
+
+def _remember(feed: str, snapshot_id: Optional[str]) -> None:
+    with _cache_lock:
+        _cache[feed] = (snapshot_id, time.monotonic() + get_settings().ACTIVE_SNAPSHOT_CACHE_TTL)
+
+
+class ActiveSnapshotRegistry:
+    """active_snapshots tablosu: feed başına aktif snapshot işaretçisi
+
+    Çözümleme worker başına TTL cache'inden yapılır (istek başına sorgu yok); promote tek
+    satırlık bir upsert'tür, okuyucular eski ya da yeni snapshot'ı görür, arada bir durum yoktur.
+    """
+
+    def __init__(self, db: Union[Session, AsyncSession]):
+        self.db = db
+
+    def resolve(self, feed: str = DEFAULT_FEED) -> Optional[str]:
+        """Feed'in aktif snapshot_id'si (cache'ten, süresi dolduysa veritabanından)"""
+        hit, snapshot_id = _cached(feed)
+        if hit:
+            return snapshot_id
+
+        snapshot_id = self.db.execute(_active_query(feed)).scalar()
+        _remember(feed, snapshot_id)
+        return snapshot_id
+
+    async def resolve_async(self, feed: str = DEFAULT_FEED) -> Optional[str]:
+        """resolve() ile aynı, AsyncSession üzerinde (API istekleri)"""
+        hit, snapshot_id = _cached(feed)
+        if hit:
+            return snapshot_id
+
+        snapshot_id = (await self.db.execute(_active_query(feed))).scalar()
+        _remember(feed, snapshot_id)
+        return snapshot_id
+
+    def promote(self, snapshot_id: str, feed: str = DEFAULT_FEED) -> Optional[str]:
+        """Snapshot'ı feed'in aktif snapshot'ı yap, bir önceki aktif snapshot'ı döndür (commit etmez)
+
+        Yalnızca yayınlanmış snapshot'lar aktif olabilir; katalog satırı kilitlenir ki eşzamanlı
+        bir silme işaretçiyi silinmiş bir snapshot'a bırakmasın.
+        """
+        status = self.db.query(Snapshot.status).filter(
+            Snapshot.snapshot_id == snapshot_id
+        ).with_for_update(read=True).scalar()
+        if status != 'published':
+            raise ValueError(f"Snapshot {snapshot_id} is not published (status: {status})")
+
+        previous = self.db.query(ActiveSnapshot.snapshot_id).filter(
+            ActiveSnapshot.feed == feed
+        ).with_for_update().scalar()
+
+        values = {'snapshot_id': snapshot_id, 'previous_snapshot_id': previous, 'promoted_at': datetime.utcnow()}
+        self.db.execute(
+            insert(ActiveSnapshot)
+            .values(feed=feed, **values)
+            .on_conflict_do_update(index_elements=[ActiveSnapshot.feed], set_=values)
+        )
+        # Commit'ten önce boşaltılırsa araya giren bir istek eski değeri tekrar cache'leyebilir
+        event.listen(self.db, 'after_commit', lambda session: invalidate_active_snapshot_cache(feed), once=True)
+        logger.info(f"Snapshot {snapshot_id} promoted for feed '{feed}' (previous: {previous})")
+        return previous
+
+    def feeds_of(self, snapshot_id: str) -> List[str]:
+        """Snapshot'ın aktif olduğu feed'ler"""
+        rows = self.db.query(ActiveSnapshot.feed).filter(ActiveSnapshot.snapshot_id == snapshot_id).all()
+        return [row.feed for row in rows]
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Tüm feed'lerin aktif snapshot'ları"""
+        return [
+            {
+                'feed': a.feed,
+                'snapshot_id': a.snapshot_id,
+                'previous_snapshot_id': a.previous_snapshot_id,
+                'promoted_at': a.promoted_at.isoformat(),
+            }
+            for a in self.db.query(ActiveSnapshot).order_by(ActiveSnapshot.feed).all()
+        ]
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 
 from app.models.agency import Agency
 from app.schemas.agency import AgencyCreate, AgencyUpdate
@@ -13,48 +13,48 @@ from app.services.base_service import BaseService
 class AgencyService(BaseService[Agency, AgencyCreate, AgencyUpdate]):
     """Agency tablosu için özel servis"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Agency, db)
     
     # AGENCY-SPESİFİK OPERASYONLAR
     
-    def get_by_name(self, agency_name: str, snapshot_id: Optional[UUID] = None) -> Optional[Agency]:
+    async def get_by_name(self, agency_name: str, snapshot_id: Optional[UUID] = None) -> Optional[Agency]:
         """Agency adı ile ara"""
-        query = self.db.query(Agency).filter(Agency.agency_name.ilike(f"%{agency_name}%"))
+        query = select(Agency).where(Agency.agency_name.ilike(f"%{agency_name}%"))
         
         if snapshot_id:
-            query = query.filter(Agency.snapshot_id == str(snapshot_id))
+            query = query.where(Agency.snapshot_id == str(snapshot_id))
         
-        return query.first()
+        return await self._first(query)
     
-    def get_agencies_by_timezone(self, timezone: str, snapshot_id: Optional[UUID] = None) -> List[Agency]:
+    async def get_agencies_by_timezone(self, timezone: str, snapshot_id: Optional[UUID] = None) -> List[Agency]:
         """Zaman dilimi ile agency'leri getir"""
-        query = self.db.query(Agency).filter(Agency.agency_timezone == timezone)
+        query = select(Agency).where(Agency.agency_timezone == timezone)
         
         if snapshot_id:
-            query = query.filter(Agency.snapshot_id == str(snapshot_id))
+            query = query.where(Agency.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_agencies_with_phone(self, snapshot_id: Optional[UUID] = None) -> List[Agency]:
+    async def get_agencies_with_phone(self, snapshot_id: Optional[UUID] = None) -> List[Agency]:
         """Telefonu olan agency'leri getir"""
-        query = self.db.query(Agency).filter(Agency.agency_phone.isnot(None))
+        query = select(Agency).where(Agency.agency_phone.isnot(None))
         
         if snapshot_id:
-            query = query.filter(Agency.snapshot_id == str(snapshot_id))
+            query = query.where(Agency.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_agencies_with_email(self, snapshot_id: Optional[UUID] = None) -> List[Agency]:
+    async def get_agencies_with_email(self, snapshot_id: Optional[UUID] = None) -> List[Agency]:
         """Email'i olan agency'leri getir"""
-        query = self.db.query(Agency).filter(Agency.agency_email.isnot(None))
+        query = select(Agency).where(Agency.agency_email.isnot(None))
         
         if snapshot_id:
-            query = query.filter(Agency.snapshot_id == str(snapshot_id))
+            query = query.where(Agency.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def search_agencies(
+    async def search_agencies(
         self, 
         name: Optional[str] = None,
         timezone: Optional[str] = None,
@@ -65,27 +65,27 @@ class AgencyService(BaseService[Agency, AgencyCreate, AgencyUpdate]):
         limit: int = 100
     ) -> List[Agency]:
         """Gelişmiş agency arama"""
-        query = self.db.query(Agency)
+        query = select(Agency)
         
         if name:
-            query = query.filter(Agency.agency_name.ilike(f"%{name}%"))
+            query = query.where(Agency.agency_name.ilike(f"%{name}%"))
         
         if timezone:
-            query = query.filter(Agency.agency_timezone == timezone)
+            query = query.where(Agency.agency_timezone == timezone)
         
         if has_phone is not None:
             if has_phone:
-                query = query.filter(Agency.agency_phone.isnot(None))
+                query = query.where(Agency.agency_phone.isnot(None))
             else:
-                query = query.filter(Agency.agency_phone.is_(None))
+                query = query.where(Agency.agency_phone.is_(None))
         
         if has_email is not None:
             if has_email:
-                query = query.filter(Agency.agency_email.isnot(None))
+                query = query.where(Agency.agency_email.isnot(None))
             else:
-                query = query.filter(Agency.agency_email.is_(None))
+                query = query.where(Agency.agency_email.is_(None))
         
         if snapshot_id:
-            query = query.filter(Agency.snapshot_id == str(snapshot_id))
+            query = query.where(Agency.snapshot_id == str(snapshot_id))
         
-        return query.offset(skip).limit(limit).all()
+        return await self._all(query.offset(skip).limit(limit))
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import copy
 from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, select, tuple_
 from pydantic import BaseModel
 
 from app.models.base import GTFSBase
+from app.models.snapshot import Snapshot
+from app.services.pagination import Page, decode_cursor, encode_cursor, keyset_columns
+from app.services.projection import RowProjection, row_projection
+from app.services.snapshot_catalog import SnapshotCatalog
+from app.services.snapshot_generation import SnapshotGenerations
 
 ModelType = TypeVar("ModelType", bound=GTFSBase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -14,144 +20,210 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    """Tüm GTFS servisleri için temel CRUD operasyonları"""
-    
-    def __init__(self, model: Type[ModelType], db: Session):
+    """Tüm GTFS servisleri için temel CRUD operasyonları
+
+    AsyncSession üzerinde çalışır: sorgular event loop'u bloklamaz, aynı worker'daki
+    eşzamanlı istekler connection pool kadar paralel ilerler.
+    """
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
-    
+        self.projection: Optional[RowProjection] = None
+
+    def project(self, schema: Type[BaseModel]) -> "BaseService":
+        """Liste sorgularında entity yerine şema sütunlarını Row olarak döndüren kopya
+
+        GET liste uçlarının hızlı yolu: satırlar ORM nesnesine dönüştürülmez, router
+        RowsJSONResponse ile bunları Pydantic doğrulaması olmadan JSON'a yazar.
+        """
+        service = copy.copy(self)
+        service.projection = row_projection(self.model, schema)
+        return service
+
+    # SORGU YARDIMCILARI
+
+    async def _all(self, query) -> List[Any]:
+        """Entity sorgusunun tüm sonuçları (projeksiyon varsa şema sütunlarının satırları)"""
+        if self.projection is not None:
+            return list((await self.db.execute(self.projection.apply(query))).all())
+        return list((await self.db.execute(query)).scalars().all())
+
+    async def _first(self, query) -> Optional[Any]:
+        """Entity sorgusunun ilk sonucu"""
+        return (await self.db.execute(query.limit(1))).scalars().first()
+
+    async def _rows(self, query) -> List[Any]:
+        """Sütun/aggregate sorgusunun satırları"""
+        return list((await self.db.execute(query)).all())
+
+    async def _touch(self, *snapshot_ids: Any) -> None:
+        """Yazılan snapshot'ların generation'ını artır; yazımla aynı commit'te kalıcı olur (yanıt cache'i düşer)"""
+        await SnapshotGenerations(self.db).bump(snapshot_ids)
+
+    async def _page(self, query, cursor: Optional[str] = None, skip: int = 0, limit: int = 100) -> Page:
+        """Entity sorgusunu PK sırasıyla keyset sayfala
+
+        cursor, önceki sayfanın son satırından sonrasını (anahtar > cursor) ister; sayfa maliyeti
+        derinlikten bağımsızdır. limit + 1 satır okunur, sonraki sayfa yoksa next_cursor None'dır.
+        Geçersiz cursor InvalidCursor fırlatır.
+        """
+        columns = keyset_columns(self.model)
+        if cursor:
+            query = query.where(tuple_(*columns) > tuple_(*decode_cursor(self.model, cursor)))
+
+        rows = await self._all(query.order_by(*columns).offset(skip).limit(limit + 1))
+        if len(rows) > limit:
+            return Page(rows[:limit], encode_cursor(self.model, rows[limit - 1]))
+        return Page(rows, None)
+
     # TEMEL CRUD OPERASYONLARI
-    
-    def get_all(
-        self, 
+
+    async def get_page(
+        self,
+        snapshot_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Page:
+        """Kayıtları PK sırasıyla sayfa sayfa getir (items, next_cursor)"""
+        query = select(self.model)
+
+        if snapshot_id:
+            query = query.where(self.model.snapshot_id == str(snapshot_id))
+
+        return await self._page(query, cursor, skip, limit)
+
+    async def get_all(
+        self,
         snapshot_id: Optional[UUID] = None,
-        skip: int = 0, 
+        skip: int = 0,
         limit: int = 100
     ) -> List[ModelType]:
         """Tüm kayıtları getir"""
-        query = self.db.query(self.model)
-        
-        if snapshot_id:
-            query = query.filter(self.model.snapshot_id == str(snapshot_id))
-        
-        return query.order_by(desc(self.model.created_at)).offset(skip).limit(limit).all()
-    
-    def get_by_id(self, record_id: str, snapshot_id: Optional[UUID] = None) -> Optional[ModelType]:
+        return (await self.get_page(snapshot_id, skip=skip, limit=limit)).items
+
+    async def get_by_id(self, record_id: str, snapshot_id: Optional[UUID] = None) -> Optional[ModelType]:
         """ID ile kayıt getir"""
         pk_column = self.model.get_primary_key_column()
-        query = self.db.query(self.model).filter(pk_column == record_id)
-        
+        query = select(self.model).where(pk_column == record_id)
+
         if snapshot_id:
-            query = query.filter(self.model.snapshot_id == str(snapshot_id))
-        
-        return query.first()
-    
-    def create(self, obj_in: CreateSchemaType, snapshot_id: UUID) -> ModelType:
+            query = query.where(self.model.snapshot_id == str(snapshot_id))
+
+        return await self._first(query)
+
+    async def create(self, obj_in: CreateSchemaType, snapshot_id: UUID) -> ModelType:
         """Yeni kayıt oluştur"""
         obj_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict()
         obj_data['snapshot_id'] = str(snapshot_id)
-        
+
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self._touch(snapshot_id)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
         return db_obj
-    
-    def update(
-        self, 
-        record_id: str, 
+
+    async def update(
+        self,
+        record_id: str,
         obj_in: UpdateSchemaType,
         snapshot_id: Optional[UUID] = None
     ) -> Optional[ModelType]:
         """Kayıt güncelle"""
-        db_obj = self.get_by_id(record_id, snapshot_id)
+        db_obj = await self.get_by_id(record_id, snapshot_id)
         if not db_obj:
             return None
-        
+
         obj_data = obj_in.model_dump(exclude_unset=True) if hasattr(obj_in, 'model_dump') else obj_in.dict(exclude_unset=True)
-        
+
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_obj)
+
+        await self._touch(db_obj.snapshot_id)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
         return db_obj
-    
-    def delete(self, record_id: str, snapshot_id: Optional[UUID] = None) -> bool:
+
+    async def delete(self, record_id: str, snapshot_id: Optional[UUID] = None) -> bool:
         """Kayıt sil"""
-        db_obj = self.get_by_id(record_id, snapshot_id)
+        db_obj = await self.get_by_id(record_id, snapshot_id)
         if not db_obj:
             return False
-        
-        self.db.delete(db_obj)
-        self.db.commit()
+
+        await self.db.delete(db_obj)
+        await self._touch(db_obj.snapshot_id)
+        await self.db.commit()
         return True
-    
-    def get_count(self, snapshot_id: Optional[UUID] = None) -> int:
+
+    async def get_count(self, snapshot_id: Optional[UUID] = None) -> int:
         """Toplam kayıt sayısı"""
-        query = self.db.query(self.model)
-        
+        query = select(func.count()).select_from(self.model)
+
         if snapshot_id:
-            query = query.filter(self.model.snapshot_id == str(snapshot_id))
-        
-        return query.count()
-    
+            query = query.where(self.model.snapshot_id == str(snapshot_id))
+
+        return (await self.db.execute(query)).scalar_one()
+
     # SNAPSHOT İŞLEMLERİ
-    
-    def get_snapshots(self) -> List[Dict[str, Any]]:
-        """Tüm snapshot'ları listele"""
-        from sqlalchemy import distinct
-        
-        snapshots = self.db.query(
-            distinct(self.model.snapshot_id).label('snapshot_id'),
-            self.model.created_at
-        ).order_by(desc(self.model.created_at)).all()
-        
+
+    async def get_snapshots(self) -> List[Dict[str, Any]]:
+        """Yayınlanmış snapshot'ları bu tablonun (ingest anındaki) kayıt sayısıyla listele - tek katalog sorgusu"""
+        table_name = self.model.__tablename__
+        snapshots = await self._all(
+            select(Snapshot).where(Snapshot.status == 'published').order_by(Snapshot.created_at.desc())
+        )
         return [
             {
-                "snapshot_id": str(s.snapshot_id),
-                "created_at": s.created_at.isoformat(),
-                "record_count": self.get_count(s.snapshot_id)
+                "snapshot_id": s["snapshot_id"],
+                "created_at": s["created_at"],
+                "record_count": s["row_counts"].get(table_name, 0)
             }
-            for s in snapshots
+            for s in map(SnapshotCatalog.to_dict, snapshots)
         ]
-    
-    def delete_snapshot(self, snapshot_id: UUID) -> int:
+
+    async def delete_snapshot(self, snapshot_id: UUID) -> int:
         """Snapshot'taki tüm kayıtları sil"""
-        deleted_count = self.db.query(self.model).filter(
-            self.model.snapshot_id == str(snapshot_id)
-        ).delete()
-        
-        self.db.commit()
-        return deleted_count
-    
+        result = await self.db.execute(
+            delete(self.model).where(self.model.snapshot_id == str(snapshot_id))
+        )
+
+        await self._touch(snapshot_id)
+        await self.db.commit()
+        return result.rowcount
+
     # BULK OPERASYONLAR
-    
-    def bulk_create(self, objs_in: List[CreateSchemaType], snapshot_id: UUID) -> List[ModelType]:
+
+    async def bulk_create(self, objs_in: List[CreateSchemaType], snapshot_id: UUID) -> List[ModelType]:
         """Toplu kayıt oluştur"""
         db_objs = []
-        
+
         for obj_in in objs_in:
             obj_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict()
             obj_data['snapshot_id'] = str(snapshot_id)
             db_objs.append(self.model(**obj_data))
-        
+
         self.db.add_all(db_objs)
-        self.db.commit()
-        
+        await self._touch(snapshot_id)
+        await self.db.commit()
+
         for db_obj in db_objs:
-            self.db.refresh(db_obj)
-        
+            await self.db.refresh(db_obj)
+
         return db_objs
-    
-    def bulk_delete(self, record_ids: List[str], snapshot_id: Optional[UUID] = None) -> int:
+
+    async def bulk_delete(self, record_ids: List[str], snapshot_id: Optional[UUID] = None) -> int:
         """Toplu kayıt sil"""
         pk_column = self.model.get_primary_key_column()
-        query = self.db.query(self.model).filter(pk_column.in_(record_ids))
-        
+        query = delete(self.model).where(pk_column.in_(record_ids))
+
         if snapshot_id:
-            query = query.filter(self.model.snapshot_id == str(snapshot_id))
-        
-        deleted_count = query.delete(synchronize_session=False)
-        self.db.commit()
-        return deleted_count
+            query = query.where(self.model.snapshot_id == str(snapshot_id))
+
+        # Silinen satırların snapshot'ları (snapshot_id verilmediyse birden fazla olabilir)
+        result = await self.db.execute(query.returning(self.model.snapshot_id).execution_options(synchronize_session=False))
+        deleted_snapshot_ids = result.scalars().all()
+        await self._touch(*deleted_snapshot_ids)
+        await self.db.commit()
+        return len(deleted_snapshot_ids)
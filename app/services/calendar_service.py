@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.calendar import Calendar
 from app.schemas.calendar import CalendarCreate, CalendarUpdate
@@ -12,12 +13,12 @@ from app.services.base_service import BaseService
 class CalendarService(BaseService[Calendar, CalendarCreate, CalendarUpdate]):
     """Calendar tablosu için özel servis"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Calendar, db)
     
-    def get_active_services(self, snapshot_id: Optional[UUID] = None) -> List[Calendar]:
+    async def get_active_services(self, snapshot_id: Optional[UUID] = None) -> List[Calendar]:
         """Aktif servisleri getir (en az bir gün çalışan)"""
-        query = self.db.query(Calendar).filter(
+        query = select(Calendar).where(
             (Calendar.monday == 1) |
             (Calendar.tuesday == 1) |
             (Calendar.wednesday == 1) |
@@ -28,17 +29,17 @@ class CalendarService(BaseService[Calendar, CalendarCreate, CalendarUpdate]):
         )
         
         if snapshot_id:
-            query = query.filter(Calendar.snapshot_id == str(snapshot_id))
+            query = query.where(Calendar.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_weekend_services(self, snapshot_id: Optional[UUID] = None) -> List[Calendar]:
+    async def get_weekend_services(self, snapshot_id: Optional[UUID] = None) -> List[Calendar]:
         """Hafta sonu çalışan servisleri getir"""
-        query = self.db.query(Calendar).filter(
+        query = select(Calendar).where(
             (Calendar.saturday == 1) | (Calendar.sunday == 1)
         )
         
         if snapshot_id:
-            query = query.filter(Calendar.snapshot_id == str(snapshot_id))
+            query = query.where(Calendar.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, List, Optional, Sequence
+from weakref import WeakValueDictionary
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, Date, DateTime, Float, Integer, Numeric, SmallInteger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.table_export import TableExporter
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Önbellekteki dosyalar yanıta bu boyutta parçalarla akıtılır
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# SQLAlchemy tipi -> Arrow tipi (alt sınıflar önce: SmallInteger/BigInteger, Integer'dan türer)
+_ARROW_TYPES = (
+    (SmallInteger, pa.int16()),
+    (BigInteger, pa.int64()),
+    (Integer, pa.int32()),
+    (Float, pa.float64()),
+    # Ölçeksiz NUMERIC (ücretler) analiz istemcileri için float64 olarak yazılır
+    (Numeric, pa.float64()),
+    (DateTime, pa.timestamp('us')),
+    (Date, pa.date32()),
+)
+
+
+def arrow_type(column) -> pa.DataType:
+    """Sütunun Arrow tipi; eşlenmeyen tipler string yazılır"""
+    for sql_type, data_type in _ARROW_TYPES:
+        if isinstance(column.type, sql_type):
+            return data_type
+    return pa.string()
+
+
+def arrow_schema(keys: Sequence[str], columns: Sequence[Any]) -> pa.Schema:
+    """keys adlarıyla, columns'ın (ilk len(keys) sütunun) tipleriyle Arrow şeması"""
+    return pa.schema([pa.field(key, arrow_type(column)) for key, column in zip(keys, columns)])
+
+
+def record_batch(rows: Sequence[Sequence[Any]], schema: pa.Schema) -> pa.RecordBatch:
+    """Satır tuple'larını sütunlara çevirip RecordBatch kur; şema dışı sondaki sütunlar atlanır"""
+    values = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = [_arrow_array(column, field.type) for column, field in zip(values, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _arrow_array(values: Sequence[Any], data_type: pa.DataType) -> pa.Array:
+    if pa.types.is_floating(data_type):
+        # NUMERIC sütunları Decimal döner: tip önce çıkarılır (decimal128), sonra float64'e çevrilir
+        return pa.array(values).cast(data_type)
+    return pa.array(values, type=data_type)
+
+
+def ipc_stream(rows: Sequence[Sequence[Any]], schema: pa.Schema) -> bytes:
+    """Satırları tek batch'lik Arrow IPC stream'i olarak yaz (boş sonuç yalnızca şemadır)"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        if rows:
+            writer.write_batch(record_batch(rows, schema))
+    return sink.getvalue().to_pybytes()
+
+
+class ParquetCache:
+    """Yayınlanmış snapshot tablolarının yerel diskteki Parquet kopyaları
+
+    Yayınlanmış snapshot değişmez: tablo ilk istendiğinde server-side cursor'dan (TableExporter)
+    bir kez yazılır, sonraki istekler dosyadan sunulur. Dosya adı snapshot generation'ını taşır;
+    CRUD yazımından sonra yeni dosya yazılır, eskisi silinir. Dosya önce aynı dizinde geçici adla
+    yazılır ve rename ile yerine konur; yarım dosya sunulmaz, eşzamanlı yazan worker'lar
+    birbirini bozmaz. İstekler yol değil açık handle alır: eski generation'ı sunan bir yanıt,
+    dosya başka bir worker'da silinse de handle üzerinden okumayı bitirir. Snapshot kaldırılınca
+    dizini silinir (evict).
+    """
+
+    # Aynı process'te aynı dosyayı bekleyen istekler tek yazımı bekler; kilidi tutan
+    # istek kalmayınca kayıt düşer (sözlük her snapshot/tablo/generation ile büyümez)
+    _locks: "WeakValueDictionary[Path, asyncio.Lock]" = WeakValueDictionary()
+
+    def __init__(self, cache_dir: Optional[str] = None, row_group_rows: int = 100_000):
+        self.root = Path(cache_dir or Path(tempfile.gettempdir()) / 'gtfs_parquet_cache')
+        self.row_group_rows = row_group_rows
+
+    def path(self, snapshot_id: str, table_name: str, generation: int = 0) -> Path:
+        return self.root / str(snapshot_id) / f"{table_name}.g{generation}.parquet"
+
+    async def open(self, db: AsyncSession, snapshot_id: str, exporter: TableExporter, generation: int = 0) -> BinaryIO:
+        """Tablonun (snapshot generation'ındaki) Parquet dosyasını okumak için aç; yoksa önce yazılır
+
+        Varlık kontrolü ile açma arasında dosyanın silinebileceği bir aralık yoktur: mevcut dosya
+        doğrudan açılır, yeni yazılan dosya rename'den önce açılır. Handle'ı çağıran kapatır.
+        """
+        table_name = exporter.model.__tablename__
+        path = self.path(snapshot_id, table_name, generation)
+        try:
+            return path.open('rb')
+        except FileNotFoundError:
+            pass
+
+        async with self._locks.setdefault(path, asyncio.Lock()):
+            try:
+                return path.open('rb')
+            except FileNotFoundError:
+                handle = await self._write(db, snapshot_id, exporter, path)
+            for stale in path.parent.glob(f"{table_name}.g*.parquet"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        return handle
+
+    async def _write(self, db: AsyncSession, snapshot_id: str, exporter: TableExporter, path: Path) -> BinaryIO:
+        """Dosyayı yaz ve yerine konmadan önce açılmış handle'ını döndür"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        schema = arrow_schema(exporter.keys, exporter.columns)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+
+        writer = pq.ParquetWriter(tmp_path, schema, compression='zstd')
+        try:
+            # Cursor batch'leri row group boyutuna kadar biriktirilir (küçük row group'lar taramayı yavaşlatır)
+            pending: List[pa.RecordBatch] = []
+            pending_rows = 0
+            async for rows in exporter.batches(db, snapshot_id):
+                pending.append(await asyncio.to_thread(record_batch, rows, schema))
+                pending_rows += len(rows)
+                if pending_rows >= self.row_group_rows:
+                    await asyncio.to_thread(writer.write_table, pa.Table.from_batches(pending, schema))
+                    pending, pending_rows = [], 0
+            if pending:
+                await asyncio.to_thread(writer.write_table, pa.Table.from_batches(pending, schema))
+            writer.close()
+            handle = tmp_path.open('rb')
+            try:
+                os.replace(tmp_path, path)
+            except BaseException:
+                handle.close()
+                raise
+            return handle
+        except BaseException:
+            writer.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    async def chunks(handle: BinaryIO, chunk_size: int = FILE_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Açık dosyayı parçalar halinde oku; akış bitince ya da yarıda kalınca handle kapanır"""
+        try:
+            while chunk := await asyncio.to_thread(handle.read, chunk_size):
+                yield chunk
+        finally:
+            handle.close()
+
+    def evict(self, snapshot_id: str) -> None:
+        """Snapshot'ın önbellekteki dosyalarını sil (bu node'daki)"""
+        shutil.rmtree(self.root / str(snapshot_id), ignore_errors=True)
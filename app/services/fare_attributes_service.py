@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.fare_attributes import FareAttributes
 from app.schemas.fare_attributes import FareAttributesCreate, FareAttributesUpdate
@@ -12,23 +13,23 @@ from app.services.base_service import BaseService
 class FareAttributesService(BaseService[FareAttributes, FareAttributesCreate, FareAttributesUpdate]):
     """FareAttributes tablosu için özel servis"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(FareAttributes, db)
     
-    def get_by_agency(self, agency_id: str, snapshot_id: Optional[UUID] = None) -> List[FareAttributes]:
+    async def get_by_agency(self, agency_id: str, snapshot_id: Optional[UUID] = None) -> List[FareAttributes]:
         """Agency ID'ye göre ücret tarifelerini getir"""
-        query = self.db.query(FareAttributes).filter(FareAttributes.agency_id == agency_id)
+        query = select(FareAttributes).where(FareAttributes.agency_id == agency_id)
         
         if snapshot_id:
-            query = query.filter(FareAttributes.snapshot_id == str(snapshot_id))
+            query = query.where(FareAttributes.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_by_currency(self, currency_type: str, snapshot_id: Optional[UUID] = None) -> List[FareAttributes]:
+    async def get_by_currency(self, currency_type: str, snapshot_id: Optional[UUID] = None) -> List[FareAttributes]:
         """Para birimi ile ücret tarifelerini getir"""
-        query = self.db.query(FareAttributes).filter(FareAttributes.currency_type == currency_type)
+        query = select(FareAttributes).where(FareAttributes.currency_type == currency_type)
         
         if snapshot_id:
-            query = query.filter(FareAttributes.snapshot_id == str(snapshot_id))
+            query = query.where(FareAttributes.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
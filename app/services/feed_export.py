@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import zipfile
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.gtfs_upload import GTFSUploadService
+from app.services.table_export import TableExporter
+
+
+class _ZipSink:
+    """ZipFile'ın yazdığı byte'ları gönderilene kadar tutan, seek edilemeyen hedef
+
+    Seek edilemeyen hedefe yazan ZipFile her üyenin boyutunu ve CRC'sini üyeden sonra data
+    descriptor olarak yazar; arşiv tek geçişte, geçici dosya olmadan üretilir.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class FeedExporter:
+    """Yayınlanmış bir snapshot'ı GTFS ZIP'i olarak akıtan servis
+
+    Dosyalar tablo tablo server-side cursor'dan okunur (TableExporter) ve deflate edilip hemen
+    gönderilir; bellek feed boyutundan bağımsızdır. Dosyalar ve sütunlar kaynak ZIP'teki gibidir:
+    yüklenmiş dosyalar, kaynak başlıktaki sütun sırasıyla (katalogda yoksa model sırası), GTFS
+    biçiminde (tarihler YYYYMMDD, NULL boş alan).
+    """
+
+    def __init__(
+        self,
+        snapshot: Dict[str, Any],
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        batch_rows: int = 5000,
+    ):
+        self.snapshot = snapshot
+        self.session_factory = session_factory
+        self.batch_rows = batch_rows
+
+    def members(self) -> List[Tuple[str, TableExporter]]:
+        """(dosya adı, exporter) - kaynakta olan dosyalar, yükleme sırasıyla"""
+        source_columns = self.snapshot.get('source_columns') or {}
+        row_counts = self.snapshot.get('row_counts') or {}
+
+        members = []
+        for filename, model_class in GTFSUploadService.GTFS_FILES_MAPPING.items():
+            table_name = model_class.__tablename__
+            columns: Optional[List[str]] = source_columns.get(table_name)
+            # Sütun sırası kaydı olmayan (0005 öncesi) snapshot'larda satırı olan dosyalar yazılır
+            if columns is None and (source_columns or not row_counts.get(table_name)):
+                continue
+            members.append((filename, TableExporter(model_class, self.batch_rows, columns)))
+        return members
+
+    def _zip_info(self, filename: str) -> zipfile.ZipInfo:
+        published_at = self.snapshot.get('published_at') or self.snapshot.get('created_at')
+        timestamp = datetime.fromisoformat(published_at) if published_at else datetime.utcnow()
+        info = zipfile.ZipInfo(filename, date_time=timestamp.timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        return info
+
+    def _needs_zip64(self, table_name: str) -> bool:
+        # Boyut önceden bilinmez; partition boyutu (indeksler dahil) CSV metninin üst sınırıdır
+        table_bytes = (self.snapshot.get('table_bytes') or {}).get(table_name)
+        return table_bytes is None or table_bytes >= zipfile.ZIP64_LIMIT
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """ZIP'in byte'larını üret: her batch deflate edildikçe, en sonda central directory"""
+        snapshot_id = self.snapshot['snapshot_id']
+        sink = _ZipSink()
+
+        async with self.session_factory() as db:
+            with zipfile.ZipFile(sink, 'w') as archive:
+                for filename, exporter in self.members():
+                    info = self._zip_info(filename)
+                    with archive.open(info, 'w', force_zip64=self._needs_zip64(exporter.model.__tablename__)) as member:
+                        async for chunk in exporter.stream(db, snapshot_id, 'csv'):
+                            # Deflate CPU işidir; event loop diğer istekleri beklemesin
+                            await asyncio.to_thread(member.write, chunk)
+                            if data := sink.drain():
+                                yield data
+            yield sink.drain()
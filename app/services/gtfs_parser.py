@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, TextIO
+
+import pandas as pd
+from sqlalchemy import Date, Float, Integer, SmallInteger, BigInteger
+
+# Snapshot ve zaman damgası sütunları ingest sırasında eklenir, dosyadan okunmaz
+GENERATED_COLUMNS = ('snapshot_id', 'created_at', 'updated_at')
+
+# SQLAlchemy tipi -> pandas nullable dtype
+_INTEGER_DTYPES = (
+    (SmallInteger, 'Int16'),
+    (BigInteger, 'Int64'),
+    (Integer, 'Int32'),
+)
+
+
+def build_dtype_map(model_class) -> Dict[str, str]:
+    """Model sütunları için dönüşüm tipi haritası: 'int16' / 'int32' / 'int64' / 'float' / 'date' / 'str'"""
+    dtype_map = {}
+
+    for column in model_class.__table__.columns:
+        if column.name in GENERATED_COLUMNS:
+            continue
+
+        kind = 'str'
+        for sa_type, pandas_dtype in _INTEGER_DTYPES:
+            if isinstance(column.type, sa_type):
+                kind = pandas_dtype
+                break
+        else:
+            if isinstance(column.type, Float):
+                kind = 'float'
+            elif isinstance(column.type, Date):
+                kind = 'date'
+
+        dtype_map[column.name] = kind
+
+    return dtype_map
+
+
+def _coerce_frame(frame: pd.DataFrame, dtype_map: Dict[str, str]) -> pd.DataFrame:
+    """Chunk'ı sütun bazında model tiplerine çevir, boş değerleri NULL yap"""
+    # Modelde olmayan sütunları at, başlıklardaki boşlukları temizle
+    frame.columns = frame.columns.str.strip()
+    frame = frame.drop(columns=[c for c in frame.columns if c not in dtype_map])
+
+    for column in frame.columns:
+        kind = dtype_map[column]
+        series = frame[column]
+
+        if kind == 'float':
+            frame[column] = pd.to_numeric(series, errors='raise')
+        elif kind.startswith('Int'):
+            frame[column] = pd.to_numeric(series, errors='raise').astype(kind)
+        elif kind == 'date':
+            # GTFS tarihleri YYYYMMDD formatındadır
+            frame[column] = pd.to_datetime(series, format='%Y%m%d', errors='raise').dt.date
+        else:
+            frame[column] = series.astype(object).where(series.notna(), None)
+
+    return frame
+
+
+def scalar_defaults(model_class) -> Dict[str, Any]:
+    """Dosyada bulunmayabilecek, sabit Python default'u olan sütunlar (ör. feed_info.id)
+
+    Bu default'lar SQLAlchemy tarafında uygulanır; COPY ve staging tabloları onları görmez.
+    """
+    return {
+        column.name: column.default.arg
+        for column in model_class.__table__.columns
+        if column.name not in GENERATED_COLUMNS and column.default is not None and column.default.is_scalar
+    }
+
+
+def iter_gtfs_frames(member: TextIO, model_class, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """GTFS CSV akışını, model tiplerine çevrilmiş DataFrame chunk'ları olarak oku
+
+    frame.attrs['source_columns'], dosyadaki (modelde karşılığı olan) sütunların başlıktaki sırasıdır.
+    """
+    dtype_map = build_dtype_map(model_class)
+    defaults = scalar_defaults(model_class)
+
+    reader = pd.read_csv(
+        member,
+        dtype=str,
+        keep_default_na=False,
+        na_values=[''],
+        skip_blank_lines=True,
+        chunksize=chunk_rows,
+    )
+
+    with reader:
+        for chunk in reader:
+            frame = _coerce_frame(chunk, dtype_map)
+            frame.attrs['source_columns'] = list(frame.columns)
+            for column, value in defaults.items():
+                if column not in frame.columns:
+                    frame[column] = value
+            yield frame
+
+
+def stamp_frame(frame: pd.DataFrame, snapshot_id: str, now: datetime) -> pd.DataFrame:
+    """Snapshot ve zaman damgası sütunlarını sabit değer olarak ekle"""
+    frame['snapshot_id'] = snapshot_id
+    frame['created_at'] = now
+    frame['updated_at'] = now
+    return frame
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """executemany için NA değerleri None olan sözlük listesine çevir"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def frame_to_copy_csv(frame: pd.DataFrame) -> str:
+    """COPY ... (FORMAT csv) için başlıksız CSV metni; NULL'lar tırnaksız boş alan olarak yazılır"""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False, na_rep='', lineterminator='\n')
+    return buffer.getvalue()
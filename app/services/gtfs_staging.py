@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import Column, MetaData, Table, text
+from sqlalchemy.orm import Session
+
+from app.models.base import default_partition_name
+
+logger = logging.getLogger(__name__)
+
+# Yayınlanmamış snapshot tabloları canlı şemadan ayrı tutulur; API ve cleanup sorguları bu şemaya bakmaz
+STAGING_SCHEMA = 'gtfs_staging'
+
+# Arşivlenen snapshot'ların detach edilmiş partition'ları
+ARCHIVE_SCHEMA = 'gtfs_archive'
+
+# Doğrulama hatalarında raporlanan örnek değer sayısı
+SAMPLE_LIMIT = 5
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    """DDL'de bind parametresi kullanılamaz (FOR VALUES IN ...)"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def qualified_name(table: Table) -> str:
+    """COPY / ham SQL için şema nitelikli, tırnaklı tablo adı"""
+    if table.schema:
+        return f"{_quote(table.schema)}.{_quote(table.name)}"
+    return _quote(table.name)
+
+
+def partition_name(table_name: str, snapshot_id: str) -> str:
+    """Snapshot partition'ının adı (PostgreSQL 63 karakter sınırının altında)"""
+    suffix = re.sub(r'[^0-9A-Za-z_]', '', snapshot_id)
+    return f"{table_name}_{suffix}"[:63]
+
+
+def natural_key(model_class) -> List[str]:
+    """Snapshot içindeki tekil anahtar: PK sütunları, snapshot_id hariç"""
+    return [c.name for c in model_class.__table__.primary_key.columns if c.name != 'snapshot_id']
+
+
+class StagingArea:
+    """Bir snapshot'ın partition'larının yüklenip yayına hazırlandığı indekssiz, constraint'siz tablolar
+
+    Her staging tablosu, yayında canlı tablonun o snapshot'a ait partition'ı olur:
+
+    1. Dosyalar FK sırası gözetmeden (tamamen paralel) staging'e yüklenir.
+    2. Tekillik ve referanslar tablo başına tek bir SQL sorgusuyla doğrulanır.
+    3. PK ve indeksler her tabloda bir kez, toplu olarak oluşturulur.
+    4. Tablolar tek transaction'da ATTACH PARTITION ile canlı tablolara bağlanır; PostgreSQL
+       hazır indeksleri partition'lı indekslere bağlar, yeniden oluşturmaz.
+
+    Canlı tablolar ingest boyunca hiç yazılmaz; yarım yüklenmiş ya da yarım indekslenmiş
+    bir snapshot görünmez.
+    """
+
+    def __init__(self, snapshot_id: str, models: Sequence):
+        self.snapshot_id = snapshot_id
+        self.models = list(models)
+        self._tables: Dict[str, Table] = {}
+
+    def table(self, model_class) -> Table:
+        """Writer'ların INSERT/COPY hedefi olarak kullandığı staging tablosu"""
+        name = model_class.__tablename__
+        if name not in self._tables:
+            self._tables[name] = Table(
+                partition_name(name, self.snapshot_id),
+                MetaData(),
+                *(Column(c.name, c.type) for c in model_class.__table__.columns),
+                schema=STAGING_SCHEMA,
+            )
+        return self._tables[name]
+
+    def create(self, db: Session) -> None:
+        """Staging tablolarını canlı tablolardan türet (yalnızca sütunlar, NOT NULL ve default'lar)
+
+        Tablolar UNLOGGED değildir: yayında partition olarak kalırlar ve crash sonrası boşalmamalıdır.
+        """
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote(STAGING_SCHEMA)}"))
+        for model_class in self.models:
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {qualified_name(self.table(model_class))} "
+                f"(LIKE {_quote(model_class.__tablename__)} INCLUDING DEFAULTS)"
+            ))
+
+    def drop(self, db: Session) -> None:
+        """Yayınlanmamış staging tablolarını sil (commit etmez)"""
+        for model_class in self.models:
+            db.execute(text(f"DROP TABLE IF EXISTS {qualified_name(self.table(model_class))}"))
+
+    def validate(self, db: Session, filenames: Dict[str, str]) -> List[str]:
+        """Tekillik ve referans bütünlüğünü tablo başına tek sorguyla kontrol et, hataları döndür
+
+        filenames: tablo adı -> GTFS dosya adı (hata mesajları için)
+        """
+        errors = []
+        staged = {model_class.__tablename__: model_class for model_class in self.models}
+
+        for model_class in self.models:
+            filename = filenames.get(model_class.__tablename__, model_class.__tablename__)
+            staging = qualified_name(self.table(model_class))
+
+            key = natural_key(model_class)
+            key_list = ', '.join(_quote(c) for c in key)
+            duplicates = db.execute(text(
+                f"SELECT {key_list}, count(*) FROM {staging} "
+                f"GROUP BY {key_list} HAVING count(*) > 1 LIMIT {SAMPLE_LIMIT}"
+            )).all()
+            for row in duplicates:
+                values = ', '.join(str(v) for v in row[:-1])
+                errors.append(f"{filename}: duplicate ({', '.join(key)}) = ({values}), {row[-1]} rows")
+
+            for foreign_key in model_class.__table__.foreign_keys:
+                column = foreign_key.parent.name
+                if column == 'snapshot_id':
+                    continue
+                parent_table = foreign_key.column.table.name
+                parent_column = foreign_key.column.name
+                # Snapshot kendi içinde tutarlı olmalı: referans aynı ZIP'teki dosyaya karşı kontrol edilir
+                parent_staging = qualified_name(self.table(staged[parent_table]))
+                missing = db.execute(text(
+                    f"SELECT DISTINCT c.{_quote(column)} FROM {staging} c "
+                    f"WHERE c.{_quote(column)} IS NOT NULL AND NOT EXISTS ("
+                    f"SELECT 1 FROM {parent_staging} p WHERE p.{_quote(parent_column)} = c.{_quote(column)}"
+                    f") LIMIT {SAMPLE_LIMIT}"
+                )).scalars().all()
+                if missing:
+                    sample = ', '.join(str(v) for v in missing)
+                    errors.append(f"{filename}: {column} references unknown {parent_table}.{parent_column} ({sample})")
+
+        return errors
+
+    def build_indexes(self, db: Session, model_class) -> None:
+        """Tablonun PK'sini ve indekslerini yüklemeden sonra tek seferde oluştur (commit etmez)
+
+        Sütunlar canlı tablodakiyle aynı sırada olmalıdır ki ATTACH PARTITION indeksleri eşleştirsin.
+        """
+        table = model_class.__table__
+        staging = qualified_name(self.table(model_class))
+
+        pk_columns = ', '.join(_quote(c.name) for c in table.primary_key.columns)
+        db.execute(text(f"ALTER TABLE {staging} ADD PRIMARY KEY ({pk_columns})"))
+
+        for index in table.indexes:
+            columns = ', '.join(_quote(c.name) for c in index.columns)
+            unique = 'UNIQUE ' if index.unique else ''
+            db.execute(text(f"CREATE {unique}INDEX ON {staging} ({columns})"))
+
+    def publish(self, db: Session) -> None:
+        """Staging tablolarını canlı tablolara partition olarak bağla (commit etmez)
+
+        models FK sırasında olmalıdır: referans verilen partition'lar önce bağlanır. Kilitler
+        commit'e kadar tutulur:
+
+        - Üst tablo SHARE UPDATE EXCLUSIVE ile kilitlenir; snapshot'a budanmış sorgular beklemez.
+        - <tablo>_default ACCESS EXCLUSIVE ile kilitlenir ve yeni snapshot_id'ye ait satır olmadığı
+          doğrulanana kadar taranır. Budanmayan (snapshot filtresiz) sorgular ve DEFAULT'a düşen
+          CRUD yazımları bekler; DEFAULT partition'lar bu yüzden boş ya da küçük tutulmalıdır.
+        - FK'ler partition başına tek bir toplu sorguyla doğrulanır; referans verilen tablolar
+          SHARE ROW EXCLUSIVE ile kilitlenir, bu tablolara yazmalar bekler.
+
+        DEFAULT'ta bu snapshot'a ait satır varsa ATTACH başarısız olur; bu durum kilit almadan
+        önce kontrol edilir ve RuntimeError fırlatılır.
+        """
+        live_schema = db.execute(text("SELECT current_schema()")).scalar()
+
+        stray = self._default_partition_rows(db, live_schema)
+        if stray:
+            raise RuntimeError(
+                f"Snapshot {self.snapshot_id} has rows in DEFAULT partitions ({', '.join(stray)}), "
+                f"nothing was published"
+            )
+
+        for model_class in self.models:
+            staging_table = self.table(model_class)
+            db.execute(text(f"ALTER TABLE {qualified_name(staging_table)} SET SCHEMA {_quote(live_schema)}"))
+            db.execute(text(
+                f"ALTER TABLE {_quote(model_class.__tablename__)} "
+                f"ATTACH PARTITION {_quote(live_schema)}.{_quote(staging_table.name)} "
+                f"FOR VALUES IN ({_literal(self.snapshot_id)})"
+            ))
+            logger.debug(f"Attached {staging_table.name} to {model_class.__tablename__}")
+
+    def _default_partition_rows(self, db: Session, live_schema: str) -> List[str]:
+        """Bu snapshot'ın CRUD ile DEFAULT partition'a düşmüş satırlarını içeren tablolar
+
+        Sorgular yalnızca ACCESS SHARE alır; DEFAULT küçük tutulduğu sürece taramalar kısadır.
+        """
+        tables = []
+        for model_class in self.models:
+            default = f"{_quote(live_schema)}.{_quote(default_partition_name(model_class.__tablename__))}"
+            if db.execute(text("SELECT to_regclass(:name)"), {'name': default}).scalar() is None:
+                continue
+            found = db.execute(
+                text(f"SELECT 1 FROM {default} WHERE snapshot_id = :snapshot_id LIMIT 1"),
+                {'snapshot_id': self.snapshot_id},
+            ).first()
+            if found:
+                tables.append(model_class.__tablename__)
+        return tables
+
+    @classmethod
+    def drop_for_snapshot(cls, db: Session, snapshot_id: str, models: Iterable) -> None:
+        """Yarıda kalmış bir ingest'in staging tablolarını temizle (commit etmez)"""
+        cls(snapshot_id, models).drop(db)
+
+
+def detach_snapshot_partitions(db: Session, snapshot_id: str, models: Sequence, archive: bool = False) -> int:
+    """Snapshot partition'larını canlı tablolardan ayır ve sil ya da arşiv şemasına taşı (commit etmez)
+
+    Satır silinmez, yalnızca katalog güncellenir; süre partition boyutundan bağımsızdır.
+    models FK sırasında olmalıdır, ters sırayla ayrılır. Ayrılan partition sayısını döndürür.
+    """
+    detached = 0
+    live_schema = db.execute(text("SELECT current_schema()")).scalar()
+    if archive:
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote(ARCHIVE_SCHEMA)}"))
+
+    for model_class in reversed(list(models)):
+        partition = f"{_quote(live_schema)}.{_quote(partition_name(model_class.__tablename__, snapshot_id))}"
+        if db.execute(text("SELECT to_regclass(:name)"), {'name': partition}).scalar() is None:
+            continue
+
+        db.execute(text(f"ALTER TABLE {_quote(model_class.__tablename__)} DETACH PARTITION {partition}"))
+        if archive:
+            # Ayrılan partition FK'lerini tablo olarak korur; arşivde canlı tablolara referans kalmamalı
+            for constraint in model_class.__table__.foreign_key_constraints:
+                db.execute(text(f"ALTER TABLE {partition} DROP CONSTRAINT IF EXISTS {_quote(constraint.name)}"))
+            db.execute(text(f"ALTER TABLE {partition} SET SCHEMA {_quote(ARCHIVE_SCHEMA)}"))
+        else:
+            db.execute(text(f"DROP TABLE {partition}"))
+        detached += 1
+
+    return detached
@@ -1,27 +1,82 @@
 from __future__ import annotations
 
 import asyncio
-import csv
 import io
+import itertools
 import logging
 import uuid
+import time
 import zipfile
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Iterable, Iterator, Optional, TextIO, Union
 from collections import OrderedDict
 from pathlib import Path
 
-import pandas as pd
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Table
 
+from app.core.config import get_settings
 from app.models import (
     Agency, Routes, Stops, Trips, StopTimes, Calendar, CalendarDates,
     Shapes, FareAttributes, FareRules, FeedInfo
 )
+from app.services.columnar_export import ParquetCache
+from app.services.gtfs_parser import frame_to_copy_csv, frame_to_records, iter_gtfs_frames, stamp_frame
+from app.services.active_snapshot import ActiveSnapshotRegistry
+from app.services.gtfs_staging import StagingArea, detach_snapshot_partitions, qualified_name
+from app.services.snapshot_catalog import SnapshotCatalog, source_sha256
+from app.services.snapshot_generation import invalidate_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Desteklenen yazma yolları: 'insert' = executemany batch, 'copy' = PostgreSQL COPY FROM STDIN
+INGEST_MODES = ('insert', 'copy')
+
+
+class _IngestAborted(Exception):
+    """Başka bir dosya başarısız olduğu için yükleme yarıda bırakıldı"""
+
+
+class _CopyStream:
+    """COPY FROM STDIN'e CSV parçalarını sırayla veren dosya benzeri nesne"""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _CountingReader(io.RawIOBase):
+    """ZIP üyesinden okunan (sıkıştırılmamış) byte sayısını ilerleme kaydına yazan sarmalayıcı"""
+
+    def __init__(self, raw, stats: Dict[str, Any]):
+        self._raw = raw
+        self._stats = stats
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        self._stats['bytes_read'] += count
+        return count
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
 
 class GTFSUploadService:
     """GTFS dosya yükleme ve işleme servisi"""
@@ -41,49 +96,108 @@ class GTFSUploadService:
         'stop_times.txt': StopTimes,            # ← stop_times (trips'e bağımlı)
     })
 
-    def __init__(self, db: Session):
+    # Parse edilip writer'a tek seferde verilen chunk boyutu (satır)
+    CHUNK_ROWS = 20000
+
+    def __init__(
+        self,
+        db: Session,
+        ingest_mode: str = 'insert',
+        parallelism: Optional[int] = None,
+        session_factory: Optional[sessionmaker] = None,
+        snapshot_id: Optional[str] = None,
+    ):
+        if ingest_mode not in INGEST_MODES:
+            raise ValueError(f"Unknown ingest mode: {ingest_mode}")
+
         self.db = db
-        self.snapshot_id = str(uuid.uuid4())
+        self.ingest_mode = ingest_mode
+        # Dosyalar her zaman snapshot'ın staging tablolarına yüklenir, canlı tablolar yalnızca
+        # yayın adımında tek transaction'da yazılır.
+        # parallelism == 1: tüm dosyalar self.db üzerinde sırayla yüklenir.
+        # parallelism > 1: dosyalar ayrı bağlantılarda eşzamanlı yüklenir (staging'de FK yoktur).
+        self.parallelism = max(1, parallelism or get_settings().INGEST_PARALLELISM)
+        self._session_factory = session_factory
+        self.snapshot_id = snapshot_id or str(uuid.uuid4())
+        self._staging: Optional[StagingArea] = None
+        self._aborted = False
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._file_started: Dict[str, float] = {}
+        # Dosya adı -> kaynak dosyadaki sütun sırası (export aynı sırayla yazar)
+        self._source_columns: Dict[str, List[str]] = {}
         self.upload_status = {
             'snapshot_id': self.snapshot_id,
             'status': 'pending',
+            'ingest_mode': ingest_mode,
+            'phase': None,
             'total_files': 0,
             'processed_files': 0,
+            'file_stats': {},
+            'rows_loaded': 0,
+            'bytes_total': 0,
+            'bytes_read': 0,
+            'rows_per_sec': None,
+            'elapsed_seconds': 0.0,
+            'eta_seconds': None,
             'errors': [],
             'started_at': datetime.utcnow(),
             'completed_at': None,
         }
 
-    async def process_gtfs_zip(self, zip_content: bytes) -> Dict[str, Any]:
-        """ZIP dosyasını işle ve veritabanına yükle"""
+    async def process_gtfs_zip(self, zip_source: Union[bytes, str, Path]) -> Dict[str, Any]:
+        """ZIP dosyasını işle ve veritabanına yükle
+
+        zip_source diskteki bir ZIP yolu (tercih edilen, sınırlı bellek) ya da ham bytes olabilir.
+        """
         try:
             self.upload_status['status'] = 'processing'
+            self.upload_status['started_at'] = datetime.utcnow()
+            self._started = time.perf_counter()
+
+            # Katalog kaydı: kaynak hash'i ve boyutu, durum 'loading'
+            await self._begin_catalog(zip_source)
             
-            # ZIP dosyasını aç
-            with zipfile.ZipFile(io.BytesIO(zip_content), 'r') as zip_file:
+            # ZIP dosyasını aç - yol verildiyse üyeler diskten parça parça okunur
+            if isinstance(zip_source, (bytes, bytearray)):
+                zip_source = io.BytesIO(zip_source)
+
+            with zipfile.ZipFile(zip_source, 'r') as zip_file:
                 file_list = zip_file.namelist()
                 gtfs_files = [f for f in file_list if f in self.GTFS_FILES_MAPPING]
                 
                 self.upload_status['total_files'] = len(gtfs_files)
+                for filename in gtfs_files:
+                    self.upload_status['file_stats'][filename] = {
+                        'status': 'pending',
+                        'rows': 0,
+                        'bytes_read': 0,
+                        'bytes_total': zip_file.getinfo(filename).file_size,
+                        'elapsed_seconds': None,
+                        'rows_per_sec': None,
+                    }
                 logger.info(f"Processing {len(gtfs_files)} GTFS files for snapshot {self.snapshot_id}")
 
-                # Her dosyayı işle - DOĞRU SIRA (GTFS_FILES_MAPPING sırasında)
-                for filename in self.GTFS_FILES_MAPPING.keys():
-                    if filename in gtfs_files:
-                        try:
-                            await self._process_single_file(zip_file, filename)
-                            self.upload_status['processed_files'] += 1
-                            logger.info(f"Processed {filename} ({self.upload_status['processed_files']}/{self.upload_status['total_files']})")
-                        except Exception as e:
-                            logger.error(f"Error processing {filename}: {e}")
-                            self.upload_status['errors'].append(f"{filename}: {str(e)}")
+                ordered_files = [f for f in self.GTFS_FILES_MAPPING.keys() if f in gtfs_files]
+                await self._create_staging()
+
+                # Dosyalar staging'e eşzamanlı yüklenir - ilk hatada kalanlar bırakılır
+                self.upload_status['phase'] = 'loading'
+                await self._run_files(
+                    ordered_files,
+                    lambda filename: self._load_file(zip_file, filename),
+                )
+
+            # Doğrula ve yayınla - snapshot ancak bu commit ile görünür olur
+            await self._validate_and_publish()
+            await asyncio.get_running_loop().run_in_executor(None, self.db.commit)
 
             # Tamamlandı durumunu güncelle
-            self.upload_status['status'] = 'completed' if not self.upload_status['errors'] else 'completed_with_errors'
+            self.upload_status['status'] = 'completed'
+            self.upload_status['phase'] = None
             self.upload_status['completed_at'] = datetime.utcnow()
-            
-            # Commit transaction
-            self.db.commit()
+            self._finished = time.perf_counter()
+            self._refresh_progress()
             
             logger.info(f"GTFS upload completed for snapshot {self.snapshot_id}")
             return self.upload_status
@@ -92,100 +206,415 @@ class GTFSUploadService:
             self.upload_status['status'] = 'failed'
             self.upload_status['errors'].append(f"Fatal error: {str(e)}")
             self.upload_status['completed_at'] = datetime.utcnow()
+            self._finished = time.perf_counter()
             
-            # Rollback on error
+            # Rollback on error - hiçbir şey yayınlanmadı, staging tabloları atılır
             self.db.rollback()
+            if self._staging is not None:
+                self._drop_staging()
+            self._fail_catalog()
             
             logger.error(f"GTFS upload failed for snapshot {self.snapshot_id}: {str(e)}")
             return self.upload_status
 
-    async def _process_single_file(self, zip_file: zipfile.ZipFile, filename: str) -> None:
-        """Tek bir GTFS dosyasını işle"""
+    async def _run_files(
+        self,
+        filenames: Iterable[str],
+        load: Callable[[str], Awaitable[None]],
+    ) -> None:
+        """Dosyaları en fazla `parallelism` eşzamanlılıkla yükle
+
+        Snapshot atomik yayınlandığından tek bir dosyanın hatası tüm yüklemeyi geçersiz kılar:
+        henüz başlamamış dosyalar atlanır, yüklenmekte olanlar bir sonraki chunk'ta bırakılır.
+        """
+        semaphore = asyncio.Semaphore(self.parallelism)
+
+        async def run(filename: str) -> None:
+            async with semaphore:
+                if self._aborted:
+                    self._set_file_status(filename, 'skipped')
+                    return
+                try:
+                    await load(filename)
+                except _IngestAborted:
+                    self._set_file_status(filename, 'skipped')
+                    return
+                except Exception as e:
+                    self._aborted = True
+                    self._set_file_status(filename, 'failed')
+                    logger.error(f"Error processing {filename}: {e}")
+                    self.upload_status['errors'].append(f"{filename}: {str(e)}")
+                    return
+
+                self._set_file_status(filename, 'completed')
+                self.upload_status['processed_files'] += 1
+                logger.info(f"Processed {filename} ({self.upload_status['processed_files']}/{self.upload_status['total_files']})")
+
+        await asyncio.gather(*(run(filename) for filename in filenames))
+
+        if self._aborted:
+            raise RuntimeError("Ingest aborted, nothing was published")
+
+    def _check_aborted(self) -> None:
+        """Writer'lar her chunk'tan önce çağırır; başka bir dosya başarısız olduysa yüklemeyi bırak"""
+        if self._aborted:
+            raise _IngestAborted()
+
+    async def _create_staging(self) -> None:
+        """Tüm GTFS tabloları için staging tablolarını oluştur; paralel session'lar görebilsin diye commit et
+
+        ZIP'te olmayan dosyalar için de (boş) tablo oluşturulur: her snapshot her tabloda bir partition'a sahiptir.
+        """
+        self._staging = StagingArea(self.snapshot_id, list(self.GTFS_FILES_MAPPING.values()))
+
+        def create() -> None:
+            self._staging.create(self.db)
+            self.db.commit()
+
+        await asyncio.get_running_loop().run_in_executor(None, create)
+
+    async def _validate_and_publish(self) -> None:
+        """Staging'i toplu doğrula ve hatasızsa canlı tablolara tek transaction'da yayınla (commit etmez)"""
+        loop = asyncio.get_running_loop()
+        filenames = {model.__tablename__: f for f, model in self.GTFS_FILES_MAPPING.items()}
+
+        self.upload_status['phase'] = 'validating'
+        errors = await loop.run_in_executor(None, self._staging.validate, self.db, filenames)
+        if errors:
+            self.upload_status['errors'].extend(errors)
+            raise RuntimeError(f"Validation failed with {len(errors)} error(s), nothing was published")
+
+        # Doğrulama sorgularının staging kilitleri bırakılmalı: indeksleme ayrı bağlantılarda ACCESS EXCLUSIVE alır
+        if self.parallelism > 1:
+            await loop.run_in_executor(None, self.db.commit)
+
+        self.upload_status['phase'] = 'indexing'
+        await self._build_indexes()
+
+        self.upload_status['phase'] = 'publishing'
+        await loop.run_in_executor(None, self._staging.publish, self.db)
+        # Katalog istatistikleri ve aktif işaretçi ATTACH ile aynı transaction'da: yayınlanan snapshot
+        # her zaman kataloglu, otomatik promote'ta okuyucular yeni snapshot'ı commit ile birlikte görür
+        await loop.run_in_executor(None, self._publish_catalog)
+        logger.info(f"Published snapshot {self.snapshot_id}")
+
+    def _publish_catalog(self) -> None:
+        """Katalog kaydını tamamla ve ayarlıysa snapshot'ı feed'inin aktif snapshot'ı yap (commit etmez)"""
+        catalog = SnapshotCatalog(self.db)
+        catalog.publish(self.snapshot_id, self._staging.models, self._row_counts(), self._table_columns())
+        if get_settings().SNAPSHOT_AUTO_PROMOTE:
+            ActiveSnapshotRegistry(self.db).promote(self.snapshot_id, catalog.feed_of(self.snapshot_id))
+
+    async def _build_indexes(self) -> None:
+        """Staging tablolarının PK ve indekslerini oluştur - paralel modda tablolar ayrı bağlantılarda eşzamanlı"""
+        loop = asyncio.get_running_loop()
+        rows = self._row_counts()
+        # En büyük tablolar önce başlar, küçükler boşta kalan bağlantılara dağılır
+        models = sorted(self._staging.models, key=lambda m: rows.get(m.__tablename__, 0), reverse=True)
+
+        if self.parallelism == 1:
+            for model_class in models:
+                await loop.run_in_executor(None, self._staging.build_indexes, self.db, model_class)
+            return
+
+        semaphore = asyncio.Semaphore(self.parallelism)
+
+        def build(model_class) -> None:
+            db = self._new_session()
+            try:
+                self._staging.build_indexes(db, model_class)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        async def run(model_class) -> None:
+            async with semaphore:
+                await loop.run_in_executor(None, build, model_class)
+
+        await asyncio.gather(*(run(model_class) for model_class in models))
+
+    def _table_columns(self) -> Dict[str, List[str]]:
+        """Tablo adı -> kaynak dosyanın sütun sırası"""
+        return {
+            self.GTFS_FILES_MAPPING[filename].__tablename__: columns
+            for filename, columns in self._source_columns.items()
+        }
+
+    def _row_counts(self) -> Dict[str, int]:
+        """Tablo adı -> staging'e yazılan satır sayısı"""
+        return {
+            self.GTFS_FILES_MAPPING[filename].__tablename__: stats['rows']
+            for filename, stats in self.upload_status['file_stats'].items()
+        }
+
+    async def _begin_catalog(self, zip_source: Union[bytes, str, Path]) -> None:
+        """Kaynak ZIP'i hash'le ve snapshot'ı katalogda 'loading' olarak işaretle"""
+        loop = asyncio.get_running_loop()
+        sha256 = await loop.run_in_executor(None, source_sha256, zip_source)
+        if isinstance(zip_source, (bytes, bytearray)):
+            source_bytes = len(zip_source)
+        else:
+            source_bytes = Path(zip_source).stat().st_size
+        await loop.run_in_executor(None, SnapshotCatalog(self.db).begin, self.snapshot_id, sha256, source_bytes)
+
+    def _fail_catalog(self) -> None:
+        """Başarısız ingest'i katalogda işaretle"""
+        try:
+            SnapshotCatalog(self.db).set_status(self.snapshot_id, 'failed')
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Could not mark snapshot {self.snapshot_id} as failed in catalog: {e}")
+
+    def _drop_staging(self) -> None:
+        """Başarısız ingest'in staging tablolarını sil"""
+        try:
+            self._staging.drop(self.db)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Could not drop staging tables for snapshot {self.snapshot_id}: {e}")
+
+    def _new_session(self) -> Session:
+        """Paralel yükleme/indeksleme için ayrı bağlantılı session"""
+        if self._session_factory is None:
+            from app.db.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _target_table(self, model_class) -> Table:
+        """Writer'ların yazdığı tablo: snapshot'ın staging tablosu"""
+        return self._staging.table(model_class)
+
+    async def _load_file(self, zip_file: zipfile.ZipFile, filename: str) -> None:
+        """Dosyayı yükle - paralel modda kendi session'ında yükleyip commit et"""
+        if self.parallelism == 1:
+            await self._process_single_file(zip_file, filename, self.db)
+            return
+
+        loop = asyncio.get_running_loop()
+        db = self._new_session()
+        try:
+            await self._process_single_file(zip_file, filename, db)
+            await loop.run_in_executor(None, db.commit)
+        except Exception:
+            await loop.run_in_executor(None, db.rollback)
+            raise
+        finally:
+            db.close()
+
+    def _file_stats(self, filename: str) -> Dict[str, Any]:
+        """Dosyanın ilerleme kaydı (ZIP dışından çağrılan testler için varsayılanla)"""
+        return self.upload_status['file_stats'].setdefault(
+            filename, {'status': 'pending', 'rows': 0, 'bytes_read': 0, 'bytes_total': None,
+                       'elapsed_seconds': None, 'rows_per_sec': None}
+        )
+
+    def _set_file_status(self, filename: str, status: str) -> None:
+        """Dosya durumunu güncelle, biten dosyanın süresini dondur"""
+        stats = self._file_stats(filename)
+        stats['status'] = status
+
+        if filename in self._file_started:
+            elapsed = time.perf_counter() - self._file_started.pop(filename)
+            stats['elapsed_seconds'] = round(elapsed, 3)
+            stats['rows_per_sec'] = round(stats['rows'] / elapsed, 1) if elapsed > 0 else None
+
+    def _refresh_progress(self) -> None:
+        """Türetilmiş metrikleri güncelle: dosya ve toplam rows/sec, okunan byte, ETA"""
+        now = time.perf_counter()
+        status = self.upload_status
+        file_stats = status['file_stats'].values()
+
+        for filename, started in list(self._file_started.items()):
+            stats = status['file_stats'][filename]
+            elapsed = now - started
+            stats['elapsed_seconds'] = round(elapsed, 3)
+            stats['rows_per_sec'] = round(stats['rows'] / elapsed, 1) if elapsed > 0 else None
+
+        elapsed = (self._finished or now) - self._started
+        # Atlanan/başarısız dosyaların kalan byte'ları hiçbir zaman okunmayacak
+        bytes_total = sum(s['bytes_total'] or 0 for s in file_stats if s['status'] not in ('skipped', 'failed'))
+        bytes_read = sum(s['bytes_read'] for s in file_stats)
+
+        status['rows_loaded'] = sum(s['rows'] for s in file_stats)
+        status['bytes_total'] = sum(s['bytes_total'] or 0 for s in file_stats)
+        status['bytes_read'] = bytes_read
+        status['elapsed_seconds'] = round(elapsed, 3)
+        status['rows_per_sec'] = round(status['rows_loaded'] / elapsed, 1) if elapsed > 0 else None
+
+        if status['completed_at'] is not None:
+            status['eta_seconds'] = 0
+        elif bytes_read > 0:
+            status['eta_seconds'] = round(max(bytes_total - bytes_read, 0) / (bytes_read / elapsed), 1)
+
+    async def _process_single_file(self, zip_file: zipfile.ZipFile, filename: str, db: Session) -> None:
+        """Tek bir GTFS dosyasını seçili ingest moduna göre işle"""
+        stats = self._file_stats(filename)
+        stats['status'] = 'loading'
+        self._file_started[filename] = time.perf_counter()
+
+        if self.ingest_mode == 'copy':
+            row_count = await self._copy_single_file(zip_file, filename, db)
+        else:
+            row_count = await self._insert_single_file(zip_file, filename, db)
+
+        stats['rows'] = row_count
+        elapsed = time.perf_counter() - self._file_started[filename]
+        logger.info(f"{filename}: {row_count} rows in {elapsed:.2f}s ({self.ingest_mode})")
+
+    async def _insert_single_file(self, zip_file: zipfile.ZipFile, filename: str, db: Session) -> int:
+        """Dosyayı chunk'lar halinde parse edip batch INSERT ile yükle, yazılan satır sayısını döndür"""
         model_class = self.GTFS_FILES_MAPPING[filename]
+        row_count = 0
+        now = datetime.utcnow()
+        loop = asyncio.get_running_loop()
         
-        # Dosya içeriğini oku
-        with zip_file.open(filename) as file:
-            content = file.read().decode('utf-8')
-        
-        # CSV olarak parse et
-        csv_reader = csv.DictReader(io.StringIO(content))
-        
-        # Batch insert için verileri hazırla
-        batch_data = []
-        batch_size = 500  # 1000'den 500'e düşür
-        
-        for row in csv_reader:
-            # Snapshot ID ekle
-            row['snapshot_id'] = self.snapshot_id
-            row['created_at'] = datetime.utcnow()
-            row['updated_at'] = datetime.utcnow()
-            
-            # Boş stringleri None'a çevir
-            cleaned_row = {k: (v if v != '' else None) for k, v in row.items()}
-            batch_data.append(cleaned_row)
-            
-            # Batch boyutuna ulaştığında veritabanına yaz
-            if len(batch_data) >= batch_size:
-                await self._bulk_insert(model_class, batch_data)
-                batch_data = []
-                
-                # CPU'ya nefes aldır - EVENT LOOP'A CONTROL VER
-                await asyncio.sleep(0.001)  # 1ms yield
-        
-        # Kalan verileri yaz
-        if batch_data:
-            await self._bulk_insert(model_class, batch_data)
+        # Dosya chunk chunk okunur - içerik hiçbir zaman tek parça belleğe alınmaz.
+        # Parse işlemi de thread pool'da çalışır, event loop bloklanmaz.
+        stats = self._file_stats(filename)
+        with self._open_member(zip_file, filename, stats) as member:
+            frames = iter_gtfs_frames(member, model_class, self.CHUNK_ROWS)
+
+            while (frame := await loop.run_in_executor(None, next, frames, None)) is not None:
+                self._check_aborted()
+                self._source_columns.setdefault(filename, frame.attrs['source_columns'])
+                stamp_frame(frame, self.snapshot_id, now)
+                await self._bulk_insert(self._target_table(model_class), frame_to_records(frame), db)
+                row_count += len(frame)
+                stats['rows'] = row_count
+
+        return row_count
+
+    @staticmethod
+    def _open_member(zip_file: zipfile.ZipFile, filename: str, stats: Optional[Dict[str, Any]] = None) -> TextIO:
+        """ZIP üyesini artımlı decode eden bir metin akışı olarak aç (BOM'u atlar)
+
+        stats verilirse okunan byte sayısı stats['bytes_read'] üzerine yazılır.
+        """
+        member = zip_file.open(filename)
+        if stats is not None:
+            member = io.BufferedReader(_CountingReader(member, stats))
+        return io.TextIOWrapper(member, encoding='utf-8-sig', newline='')
+
+    async def _copy_single_file(self, zip_file: zipfile.ZipFile, filename: str, db: Session) -> int:
+        """Dosyayı ZIP üyesinden chunk'lar halinde parse edip COPY FROM STDIN ile akıt"""
+        model_class = self.GTFS_FILES_MAPPING[filename]
+        table = self._target_table(model_class)
+        now = datetime.utcnow()
+
+        # COPY, session'ın transaction'ı içinde aynı bağlantı üzerinden çalışır
+        raw_connection = db.connection().connection
+
+        stats = self._file_stats(filename)
+
+        def track(frame):
+            self._check_aborted()
+            self._source_columns.setdefault(filename, frame.attrs['source_columns'])
+            stats['rows'] += len(frame)
+            return stamp_frame(frame, self.snapshot_id, now)
+
+        def run_copy() -> int:
+            with self._open_member(zip_file, filename, stats) as member:
+                frames = iter_gtfs_frames(member, model_class, self.CHUNK_ROWS)
+                first = next(frames, None)
+                if first is None:
+                    return 0
+
+                # Sütun listesi ilk chunk'tan alınır; tüm chunk'lar aynı başlığı paylaşır
+                track(first)
+                column_list = ', '.join(f'"{c}"' for c in first.columns)
+                copy_sql = f"COPY {qualified_name(table)} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+                chunks = itertools.chain(
+                    [frame_to_copy_csv(first)],
+                    (frame_to_copy_csv(track(frame)) for frame in frames),
+                )
+                stream = _CopyStream(chunks)
+                with raw_connection.cursor() as cursor:
+                    if hasattr(cursor, 'copy_expert'):
+                        # psycopg2
+                        cursor.copy_expert(copy_sql, stream)
+                    else:
+                        # psycopg 3
+                        with cursor.copy(copy_sql) as copy:
+                            while chunk := stream.read(65536):
+                                copy.write(chunk)
+                    return cursor.rowcount
 
-    async def _bulk_insert(self, model_class, data: List[Dict[str, Any]]) -> None:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, run_copy)
+
+    async def _bulk_insert(self, table: Table, data: List[Dict[str, Any]], db: Session) -> None:
         """Bulk insert işlemi - Non-blocking"""
         if not data:
             return
             
         try:
             # SQLAlchemy Core kullanarak bulk insert
-            table = model_class.__table__
-            
             # Blocking operation'ı thread pool'da çalıştır
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
                 None,  # Default thread pool
-                lambda: self.db.execute(table.insert(), data)
+                lambda: db.execute(table.insert(), data)
             )
             
             # Event loop'a control ver
             await asyncio.sleep(0)
             
         except Exception as e:
-            logger.error(f"Bulk insert error for {model_class.__name__}: {str(e)}")
+            logger.error(f"Bulk insert error for {table.name}: {str(e)}")
             raise
 
     def get_upload_status(self) -> Dict[str, Any]:
-        """Upload durumunu döndür"""
+        """Upload durumunu güncel ilerleme metrikleriyle döndür"""
+        self._refresh_progress()
         return self.upload_status
 
     @classmethod
-    async def cleanup_old_snapshots(cls, db: Session, keep_count: int = 5) -> None:
-        """Eski snapshot'ları temizle"""
+    def purge_snapshot(cls, db: Session, snapshot_id: str, archive: bool = False) -> Dict[str, int]:
+        """Snapshot verisini kaldır (commit etmez, katalog kaydına dokunmaz)
+
+        Snapshot partition'ları DETACH + DROP edilir (archive=True ise gtfs_archive şemasına taşınır);
+        satır satır silme yalnızca DEFAULT partition'a düşmüş CRUD kayıtları için yapılır.
+        """
+        models = list(cls.GTFS_FILES_MAPPING.values())
+        dropped_partitions = detach_snapshot_partitions(db, snapshot_id, models, archive=archive)
+
+        # Partition'ı olmayan snapshot'a CRUD ile eklenmiş kayıtlar (sorgu DEFAULT partition'a budanır)
+        deleted_records = 0
+        for model_class in reversed(models):
+            deleted_records += db.query(model_class).filter(
+                model_class.snapshot_id == snapshot_id
+            ).delete(synchronize_session=False)
+
+        # Yarıda kalmış ingest'in staging tabloları
+        StagingArea.drop_for_snapshot(db, snapshot_id, models)
+
+        # Bu node'daki Parquet kopyaları (diğer node'lar katalogda yayınlanmış olmayan snapshot'ı sunmaz)
+        ParquetCache(get_settings().EXPORT_CACHE_DIR).evict(snapshot_id)
+
+        logger.debug(f"Snapshot {snapshot_id}: {dropped_partitions} partition kaldırıldı, {deleted_records} kayıt silindi")
+        return {'dropped_partitions': dropped_partitions, 'deleted_records': deleted_records}
+
+    @classmethod
+    def cleanup_old_snapshots(cls, db: Session, keep_count: int = 5) -> None:
+        """Eski snapshot'ları temizle - en son keep_count snapshot dışındakilerin partition'ları kaldırılır"""
         try:
-            # Her tablo için eski snapshot'ları sil
-            for model_class in cls.GTFS_FILES_MAPPING.values():
-                table_name = model_class.__tablename__
-                
-                # En son keep_count kadar snapshot'ı tut
-                cleanup_query = text(f"""
-                    DELETE FROM {table_name} 
-                    WHERE snapshot_id NOT IN (
-                        SELECT DISTINCT snapshot_id 
-                        FROM {table_name} 
-                        ORDER BY created_at DESC 
-                        LIMIT :keep_count
-                    )
-                """)
-                
-                db.execute(cleanup_query, {'keep_count': keep_count})
-            
+            catalog = SnapshotCatalog(db)
+            old_snapshots = catalog.expired(keep_count)
+
+            for snapshot_id in old_snapshots:
+                cls.purge_snapshot(db, snapshot_id)
+                catalog.delete(snapshot_id)
+
             db.commit()
-            logger.info(f"Cleaned up old snapshots, kept latest {keep_count}")
+            for snapshot_id in old_snapshots:
+                invalidate_snapshot(snapshot_id)
+            logger.info(f"Cleaned up {len(old_snapshots)} old snapshots, kept latest {keep_count}")
             
         except Exception as e:
             db.rollback()
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.core.logging_config import configure_logging
+from app.models.ingest_job import IngestJob
+from app.models.snapshot import DEFAULT_FEED
+from app.services.gtfs_upload import GTFSUploadService
+from app.services.snapshot_catalog import SnapshotCatalog
+
+logger = logging.getLogger(__name__)
+
+# Kuyruktan iş alma (claim) adımlarını tüm worker'lar arasında sıralayan advisory lock anahtarı
+CLAIM_LOCK_KEY = 0x67746673  # 'gtfs'
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Ingest process'i çöken işten sonra yeni iş almadan önce beklenecek en uzun süre (saniye)
+MAX_FAILURE_BACKOFF = 60.0
+
+
+def _to_json(value: Dict[str, Any]) -> Dict[str, Any]:
+    """upload_status'u JSON sütununa yazılabilir hale getir (datetime -> ISO string)"""
+    return orjson.loads(orjson.dumps(value))
+
+
+class IngestJobQueue:
+    """ingest_jobs tablosu üzerinde kalıcı, worker'lar arası GTFS yükleme kuyruğu"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        snapshot_id: str,
+        source_path: str,
+        source_filename: Optional[str] = None,
+        ingest_mode: str = 'insert',
+        priority: int = 0,
+        feed: str = DEFAULT_FEED,
+    ) -> IngestJob:
+        """Yeni işi kuyruğa ekle ve snapshot'ı katalogda 'queued' olarak kaydet"""
+        job = IngestJob(
+            snapshot_id=snapshot_id,
+            status='queued',
+            priority=priority,
+            source_path=str(source_path),
+            source_filename=source_filename,
+            ingest_mode=ingest_mode,
+            created_at=datetime.utcnow(),
+        )
+        self.db.add(job)
+        SnapshotCatalog(self.db).register(
+            snapshot_id,
+            feed=feed,
+            source_filename=source_filename,
+            source_bytes=os.path.getsize(source_path) if os.path.exists(source_path) else None,
+        )
+        self.db.commit()
+        return job
+
+    def get(self, snapshot_id: str) -> Optional[IngestJob]:
+        """Snapshot ID ile iş getir"""
+        return self.db.get(IngestJob, snapshot_id)
+
+    def delete(self, snapshot_id: str) -> bool:
+        """İş kaydını sil (commit etmez)"""
+        return self.db.query(IngestJob).filter(IngestJob.snapshot_id == snapshot_id).delete() > 0
+
+    def claim_next(self, worker_id: str, max_concurrent: int) -> Optional[IngestJob]:
+        """Sıradaki işi al: önce yüksek öncelik, eşitlikte en eski
+
+        Claim'ler advisory lock ile sıralanır; böylece tüm worker ve node'lar genelinde
+        aynı anda en fazla `max_concurrent` iş 'processing' durumunda olur.
+        """
+        try:
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': CLAIM_LOCK_KEY})
+
+            running = self.db.query(func.count(IngestJob.snapshot_id)).filter(
+                IngestJob.status == 'processing'
+            ).scalar()
+            if running >= max_concurrent:
+                self.db.rollback()
+                return None
+
+            job = self.db.query(IngestJob).filter(
+                IngestJob.status == 'queued'
+            ).order_by(
+                IngestJob.priority.desc(), IngestJob.created_at.asc()
+            ).with_for_update(skip_locked=True).first()
+
+            if not job:
+                self.db.rollback()
+                return None
+
+            now = datetime.utcnow()
+            job.status = 'processing'
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+            self.db.commit()
+            self.db.refresh(job)
+            return job
+
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def heartbeat(self, snapshot_id: str, progress: Dict[str, Any]) -> None:
+        """Çalışan işin ilerlemesini ve canlılık zamanını yaz"""
+        self.db.query(IngestJob).filter(IngestJob.snapshot_id == snapshot_id).update(
+            {'progress': _to_json(progress), 'heartbeat_at': datetime.utcnow()},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    def finish(self, snapshot_id: str, progress: Dict[str, Any]) -> None:
+        """İşi sonuç durumuyla kapat"""
+        now = datetime.utcnow()
+        self.db.query(IngestJob).filter(IngestJob.snapshot_id == snapshot_id).update(
+            {
+                'status': progress.get('status', 'failed'),
+                'progress': _to_json(progress),
+                'heartbeat_at': now,
+                'completed_at': now,
+            },
+            synchronize_session=False,
+        )
+        if progress.get('status') == 'failed':
+            # Servis dışında (ör. process çökmesi) biten işler de katalogda başarısız görünmeli
+            SnapshotCatalog(self.db).set_status(snapshot_id, 'failed')
+        self.db.commit()
+
+    def release(self, snapshot_id: str, max_attempts: Optional[int] = None, error: Optional[str] = None) -> bool:
+        """Yarım kalan işi kısmi verisini silerek tekrar kuyruğa al
+
+        max_attempts verilirse (işin process'i çöktü) deneme hakkı kalmayan iş `error` ile 'failed' olur;
+        kapanışta bırakılan işler koşulsuz kuyruğa döner. İş tekrar kuyruğa alındıysa True döner.
+        """
+        job = self.db.query(IngestJob).filter(IngestJob.snapshot_id == snapshot_id).with_for_update().first()
+        if job is None:
+            self.db.rollback()
+            return False
+
+        GTFSUploadService.purge_snapshot(self.db, snapshot_id)
+        requeued = self._requeue_or_fail(job, max_attempts, error)
+        self.db.commit()
+        return requeued
+
+    def recover_stale(self, stale_after: timedelta, max_attempts: int) -> int:
+        """Heartbeat'i kesilmiş (çöken worker'a ait) işleri kurtar
+
+        Deneme hakkı kalan işler kısmi verisi silinip tekrar kuyruğa alınır, kalmayanlar 'failed' olur.
+        """
+        cutoff = datetime.utcnow() - stale_after
+        stale_jobs = self.db.query(IngestJob).filter(
+            IngestJob.status == 'processing',
+            IngestJob.heartbeat_at < cutoff,
+        ).with_for_update(skip_locked=True).all()
+
+        for job in stale_jobs:
+            GTFSUploadService.purge_snapshot(self.db, job.snapshot_id)
+            worker_id = job.worker_id
+            if self._requeue_or_fail(job, max_attempts, 'Worker lost, retry limit reached'):
+                logger.warning(f"Re-queueing stale ingest job {job.snapshot_id} (worker {worker_id}, attempt {job.attempts})")
+
+        self.db.commit()
+        return len(stale_jobs)
+
+    def _requeue_or_fail(self, job: IngestJob, max_attempts: Optional[int], error: Optional[str]) -> bool:
+        """Deneme hakkı varsa (ya da sınır verilmediyse) işi kuyruğa döndür, yoksa 'failed' yap (commit etmez)"""
+        catalog = SnapshotCatalog(self.db)
+        if max_attempts is None or job.attempts < max_attempts:
+            job.status = 'queued'
+            job.worker_id = None
+            job.progress = None
+            catalog.set_status(job.snapshot_id, 'queued')
+            return True
+
+        logger.error(f"Ingest job {job.snapshot_id} failed after {job.attempts} attempts: {error}")
+        job.status = 'failed'
+        job.completed_at = datetime.utcnow()
+        job.progress = {**(job.progress or {}), 'status': 'failed', 'errors': [error or 'Retry limit reached']}
+        catalog.set_status(job.snapshot_id, 'failed')
+        return False
+
+    @staticmethod
+    def to_status(job: IngestJob) -> Dict[str, Any]:
+        """İş kaydını /upload/{id}/status yanıtına çevir"""
+        status = {
+            'snapshot_id': job.snapshot_id,
+            'status': job.status,
+            'total_files': 0,
+            'processed_files': 0,
+            'errors': [],
+            'started_at': job.started_at,
+            'completed_at': job.completed_at,
+        }
+        status.update(job.progress or {})
+        # Kuyruk alanları her zaman iş kaydından gelir
+        status.update({
+            'status': job.status,
+            'priority': job.priority,
+            'attempts': job.attempts,
+            'queued_at': job.created_at,
+        })
+        return status
+
+
+def _run_queue_method(session_factory: sessionmaker, method: str, *args):
+    """Kuyruk metodunu kısa ömürlü bir session ile çalıştır (thread pool'da)"""
+    db = session_factory()
+    try:
+        return getattr(IngestJobQueue(db), method)(*args)
+    finally:
+        db.close()
+
+
+async def execute_ingest_job(
+    session_factory: sessionmaker,
+    snapshot_id: str,
+    source_path: str,
+    ingest_mode: str,
+    heartbeat_interval: float,
+) -> None:
+    """Tek bir işi çalıştır, ilerlemeyi periyodik olarak kuyruğa yaz
+
+    Hem API process'inde (inline) hem de ayrı ingest process'inde aynı şekilde çalışır;
+    API tarafı ilerlemeyi sadece ingest_jobs tablosundan okur.
+    """
+    loop = asyncio.get_running_loop()
+    db = session_factory()
+    service = GTFSUploadService(db, ingest_mode=ingest_mode, snapshot_id=snapshot_id)
+
+    async def report_progress() -> None:
+        while True:
+            await asyncio.sleep(heartbeat_interval)
+            try:
+                await loop.run_in_executor(
+                    None, _run_queue_method, session_factory, 'heartbeat', snapshot_id, service.get_upload_status()
+                )
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for {snapshot_id}: {e}")
+
+    reporter = loop.create_task(report_progress())
+    try:
+        result = await service.process_gtfs_zip(source_path)
+        reporter.cancel()
+        await loop.run_in_executor(None, _run_queue_method, session_factory, 'finish', snapshot_id, result)
+        logger.info(f"GTFS upload completed for snapshot {snapshot_id}: {result['status']}")
+
+        try:
+            os.unlink(source_path)
+        except OSError as e:
+            logger.warning(f"Could not remove spooled upload {source_path}: {e}")
+
+    except asyncio.CancelledError:
+        # Kapanış: işi başka bir worker'ın alması için geri bırak
+        reporter.cancel()
+        db.rollback()
+        await asyncio.shield(loop.run_in_executor(None, _run_queue_method, session_factory, 'release', snapshot_id))
+        raise
+    except Exception as e:
+        reporter.cancel()
+        logger.error(f"Error in ingest job {snapshot_id}: {e}")
+        failed = {**service.get_upload_status(), 'status': 'failed'}
+        failed['errors'] = failed['errors'] + [str(e)]
+        await loop.run_in_executor(None, _run_queue_method, session_factory, 'finish', snapshot_id, failed)
+    finally:
+        db.close()
+
+
+def _init_ingest_process(cpu_affinity: Optional[List[int]], nice: int, pids=None) -> None:
+    """Ingest process'ini API worker'larından izole et: CPU affinity ve düşük öncelik
+
+    PID'ini `pids` kuyruğuyla worker'a bildirir; worker kapanışta çalışan process'leri bununla sonlandırır.
+    """
+    configure_logging(get_settings().DEBUG)
+    if pids is not None:
+        pids.put(os.getpid())
+
+    if cpu_affinity and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpu_affinity)
+    if nice:
+        os.nice(nice)
+
+    logger.info(f"Ingest process {os.getpid()} ready (cpus={cpu_affinity or 'all'}, nice={nice})")
+
+
+def run_ingest_job_in_process(snapshot_id: str, source_path: str, ingest_mode: str, heartbeat_interval: float) -> None:
+    """Process pool girişi: kendi engine'i ve event loop'u ile işi çalıştır"""
+    from app.db.database import SessionLocal
+
+    asyncio.run(execute_ingest_job(SessionLocal, snapshot_id, source_path, ingest_mode, heartbeat_interval))
+
+
+class IngestWorker:
+    """Kuyruktaki GTFS yükleme işlerini çalıştıran worker döngüsü (her uvicorn process'inde bir tane)
+
+    INGEST_EXECUTOR='inline' işi bu process'in event loop'unda, 'process' ise CPU'su
+    ayrılmış ayrı bir process pool'da çalıştırır.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.max_concurrent = max(1, settings.INGEST_MAX_CONCURRENT_JOBS)
+        self.poll_interval = settings.INGEST_POLL_INTERVAL
+        self.heartbeat_interval = settings.INGEST_HEARTBEAT_INTERVAL
+        self.stale_after = timedelta(seconds=settings.INGEST_STALE_JOB_SECONDS)
+        self.max_attempts = settings.INGEST_MAX_ATTEMPTS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.executor = settings.INGEST_EXECUTOR
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._running: Dict[asyncio.Task, str] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        # Üst üste çöken iş sayısı ve bir sonraki claim'in yapılabileceği zaman (loop.time())
+        self._failures = 0
+        self._claim_after = 0.0
+
+        if self.executor == 'process':
+            # Parse ve DB yazımı ayrı process'lerde: API event loop'u sadece işi devreder
+            self._mp_context = multiprocessing.get_context('spawn')
+            self._process_pids = self._mp_context.SimpleQueue()
+            self._known_pids: set = set()
+            self._pool = self._new_pool()
+        elif self.executor != 'inline':
+            raise ValueError(f"Unknown ingest executor: {self.executor}")
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        settings = get_settings()
+        return ProcessPoolExecutor(
+            max_workers=self.max_concurrent,
+            mp_context=self._mp_context,
+            initializer=_init_ingest_process,
+            initargs=(settings.INGEST_CPU_AFFINITY, settings.INGEST_PROCESS_NICE, self._process_pids),
+        )
+
+    def _ingest_processes(self) -> List[multiprocessing.Process]:
+        """Bu worker'ın hâlâ yaşayan ingest process'leri (başlarken PID'ini bildirenler)"""
+        while not self._process_pids.empty():
+            self._known_pids.add(self._process_pids.get())
+        return [process for process in multiprocessing.active_children() if process.pid in self._known_pids]
+
+    def start(self) -> None:
+        """Worker döngüsünü başlat"""
+        self._loop_task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Ingest worker {self.worker_id} started (max {self.max_concurrent} concurrent jobs, {self.executor})")
+
+    async def stop(self) -> None:
+        """Döngüyü durdur; yarım kalan işleri tekrar kuyruğa bırak"""
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+
+        in_flight = list(self._running.values())
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+        if self._pool is not None:
+            # Çalışan ingest process'leri sonlandır, ardından işlerini kuyruğa geri bırak
+            for process in self._ingest_processes():
+                process.terminate()
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+            loop = asyncio.get_running_loop()
+            for snapshot_id in in_flight:
+                try:
+                    await loop.run_in_executor(None, self._with_queue, 'release', snapshot_id)
+                except Exception as e:
+                    logger.warning(f"Could not release ingest job {snapshot_id}: {e}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_recovery = datetime.min
+
+        while True:
+            try:
+                if datetime.utcnow() - last_recovery > self.stale_after / 2:
+                    await loop.run_in_executor(None, self._with_queue, 'recover_stale', self.stale_after, self.max_attempts)
+                    last_recovery = datetime.utcnow()
+
+                job = None
+                # Çöken işten sonra geri çekil: bozuk dosya/ortam claim -> çökme döngüsüne girmesin
+                if len(self._running) < self.max_concurrent and loop.time() >= self._claim_after:
+                    job = await loop.run_in_executor(None, self._with_queue, 'claim_next', self.worker_id, self.max_concurrent)
+
+                if job is not None:
+                    task = loop.create_task(self._execute(job.snapshot_id, job.source_path, job.ingest_mode))
+                    self._running[task] = job.snapshot_id
+                    task.add_done_callback(lambda t: self._running.pop(t, None))
+                    continue
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ingest worker poll failed: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    def _with_queue(self, method: str, *args):
+        """Kuyruk metodunu kısa ömürlü bir session ile çalıştır (thread pool'da)"""
+        return _run_queue_method(self.session_factory, method, *args)
+
+    async def _execute(self, snapshot_id: str, source_path: str, ingest_mode: str) -> None:
+        """İşi yapılandırılan executor'da çalıştır"""
+        logger.info(f"Worker {self.worker_id} processing snapshot {snapshot_id} ({self.executor})")
+
+        if self._pool is None:
+            await execute_ingest_job(self.session_factory, snapshot_id, source_path, ingest_mode, self.heartbeat_interval)
+            return
+
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            await loop.run_in_executor(
+                pool, run_ingest_job_in_process, snapshot_id, source_path, ingest_mode, self.heartbeat_interval
+            )
+            self._failures = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Ingest process'i çöktü - deneme hakkı kalmışsa iş tekrar kuyruğa, yoksa 'failed'
+            logger.error(f"Ingest process failed for {snapshot_id}: {e!r}")
+            if isinstance(e, BrokenProcessPool):
+                self._replace_pool(pool)
+
+            self._failures += 1
+            backoff = min(self.poll_interval * 2 ** (self._failures - 1), MAX_FAILURE_BACKOFF)
+            self._claim_after = loop.time() + backoff
+            await loop.run_in_executor(
+                None, self._with_queue, 'release', snapshot_id, self.max_attempts, f"Ingest process crashed: {e!r}"
+            )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Çöken process pool'u yenisiyle değiştir (aynı pool'daki diğer işler de düşer, bir kez değiştirilir)"""
+        if self._pool is not broken:
+            return
+        logger.warning(f"Ingest process pool of worker {self.worker_id} is broken, starting a new one")
+        self._pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import date, datetime
+from typing import Any, List, NamedTuple, Optional
+
+import orjson
+from sqlalchemy import Column, inspect
+
+
+class InvalidCursor(ValueError):
+    """Çözülemeyen ya da başka bir tabloya ait cursor"""
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def keyset_columns(model_class) -> List[Column]:
+    """Sayfalama sırası: PK sütunları, PK indeksiyle aynı sırada (anahtar..., snapshot_id)
+
+    Snapshot filtreli sorgu tek partition'ın PK indeksini sırayla okur; filtresiz sorguda
+    partition'ların PK indeksleri Merge Append ile birleşir. Sıra tekildir, sayfalar kaymaz.
+    """
+    return list(inspect(model_class).primary_key)
+
+
+def encode_cursor(model_class, row: Any) -> str:
+    """Satırın sayfalama anahtarından opak cursor (base64url JSON, tablo adıyla birlikte)"""
+    values = [getattr(row, column.key) for column in keyset_columns(model_class)]
+    payload = orjson.dumps([model_class.__tablename__, values])
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+
+def decode_cursor(model_class, cursor: str) -> List[Any]:
+    """Cursor'daki anahtar değerleri, PK sütunlarının Python tiplerine çevrilmiş olarak"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        table_name, values = orjson.loads(payload)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+    columns = keyset_columns(model_class)
+    if table_name != model_class.__tablename__ or not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor(f"Cursor does not belong to {model_class.__tablename__}")
+
+    try:
+        return [_from_json(column, value) for column, value in zip(columns, values)]
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+def _from_json(column: Column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Tuple, Type
+
+import orjson
+from pydantic import BaseModel
+
+from app.services.pagination import keyset_columns
+
+
+class RowProjection:
+    """Read şemasının alanlarını Core sütunları olarak seçip satırları doğrudan JSON'a yazan projeksiyon
+
+    Entity sorgusu (select(Model)) şema alanlarının sütunlarına daraltılır; sonuç ORM nesnesine
+    dönüştürülmez, Pydantic ile doğrulanmaz - tuple'lar orjson ile tek geçişte serileştirilir.
+    Yanıt, response_model'in ürettiği JSON ile aynıdır (alan sırası şemadaki sıradır,
+    Decimal Pydantic'teki gibi string yazılır).
+    """
+
+    def __init__(self, model, schema: Type[BaseModel]):
+        self.keys: Tuple[str, ...] = tuple(schema.model_fields)
+        # Keyset cursor'ı için şemada olmayan PK sütunları (snapshot_id) sona eklenir, JSON'a yazılmaz
+        extra = [column for column in keyset_columns(model) if column.key not in self.keys]
+        self.columns = [getattr(model, key) for key in self.keys] + extra
+
+    def apply(self, query):
+        """Entity sorgusunu (filtre, join ve sıralama aynı kalarak) projeksiyon sütunlarına daralt"""
+        return query.with_only_columns(*self.columns)
+
+    def dumps(self, rows: Iterable[Any]) -> bytes:
+        keys = self.keys
+        # zip en kısada durur: şema dışı keyset sütunları yanıta girmez
+        return orjson.dumps([dict(zip(keys, row)) for row in rows], default=json_default)
+
+
+@lru_cache(maxsize=None)
+def row_projection(model, schema: Type[BaseModel]) -> RowProjection:
+    """(model, şema) başına tek projeksiyon"""
+    return RowProjection(model, schema)
+
+
+def json_default(value: Any) -> Any:
+    """orjson default'u: Decimal, Pydantic'teki gibi string yazılır"""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import get_settings
+
+
+class CachedResponse(NamedTuple):
+    snapshot_id: str
+    status_code: int
+    headers: List[Tuple[str, str]]   # content-length hariç
+    body: bytes
+    etag: str                        # gövdenin hash'i: güçlü (strong) ETag
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """Worker (process) içi yanıt cache'i: toplam gövde boyutuyla sınırlı, LRU ile boşalan
+
+    Anahtar (yol, query parametreleri, snapshot_id, generation, ...) çağıranın sorumluluğundadır;
+    generation anahtarda olduğundan CRUD yazımından sonra eski kayıtlar okunmaz, LRU ile düşer
+    (yazan worker evict_snapshot ile hemen boşaltır). max_bytes'tan büyük yanıt cache'lenmez.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        size = entry.size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def evict_snapshot(self, snapshot_id: str) -> None:
+        """Snapshot'ın tüm kayıtlarını düşür"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.snapshot_id == str(snapshot_id)]
+            for key in stale:
+                self._bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'pid': os.getpid(),
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+@lru_cache
+def get_response_cache():
+    """Worker'ın yanıt cache'i: RESPONSE_CACHE_BACKEND 'memory' (process içi) ya da 'shared' (node'daki tüm worker'lar)
+
+    İkisi aynı arayüzdedir; RESPONSE_CACHE_MAX_BYTES 0 ise cache kapalıdır.
+    """
+    settings = get_settings()
+    if settings.RESPONSE_CACHE_BACKEND == 'shared' and settings.RESPONSE_CACHE_MAX_BYTES > 0:
+        # shared_cache CachedResponse'u bu modülden alır
+        from app.services.shared_cache import SharedResponseCache
+
+        return SharedResponseCache(shared_cache_path(settings), settings.RESPONSE_CACHE_MAX_BYTES)
+    return ResponseCache(settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+def shared_cache_path(settings) -> str:
+    """Paylaşılan cache dosyası: verilmediyse /dev/shm'de (yoksa temp dizininde), veritabanı başına bir dosya"""
+    if settings.RESPONSE_CACHE_SHARED_PATH:
+        return settings.RESPONSE_CACHE_SHARED_PATH
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    database = hashlib.blake2b(settings.DATABASE_URL.encode(), digest_size=6).hexdigest()
+    return os.path.join(directory, f'gtfs_response_cache-{database}')
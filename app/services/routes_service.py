@@ -2,83 +2,85 @@ from __future__ import annotations
 
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 
 from app.models.routes import Routes
 from app.schemas.routes import RoutesCreate, RoutesUpdate
 from app.services.base_service import BaseService
+from app.services.pagination import Page
 
 
 class RoutesService(BaseService[Routes, RoutesCreate, RoutesUpdate]):
     """Routes tablosu için özel servis"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Routes, db)
     
     # ROUTES-SPESİFİK OPERASYONLAR
     
-    def get_by_agency(self, agency_id: str, snapshot_id: Optional[UUID] = None) -> List[Routes]:
+    async def get_by_agency(self, agency_id: str, snapshot_id: Optional[UUID] = None) -> List[Routes]:
         """Agency ID'ye göre route'ları getir"""
-        query = self.db.query(Routes).filter(Routes.agency_id == agency_id)
+        query = select(Routes).where(Routes.agency_id == agency_id)
         
         if snapshot_id:
-            query = query.filter(Routes.snapshot_id == str(snapshot_id))
+            query = query.where(Routes.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_by_route_type(self, route_type: int, snapshot_id: Optional[UUID] = None) -> List[Routes]:
+    async def get_by_route_type(self, route_type: int, snapshot_id: Optional[UUID] = None) -> List[Routes]:
         """Route tipi ile ara (0=Tram, 1=Metro, 2=Rail, 3=Bus, etc.)"""
-        query = self.db.query(Routes).filter(Routes.route_type == route_type)
+        query = select(Routes).where(Routes.route_type == route_type)
         
         if snapshot_id:
-            query = query.filter(Routes.snapshot_id == str(snapshot_id))
+            query = query.where(Routes.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def search_routes(
+    async def search_routes(
         self,
         short_name: Optional[str] = None,
         long_name: Optional[str] = None,
         route_type: Optional[int] = None,
         agency_id: Optional[str] = None,
         snapshot_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[Routes]:
-        """Gelişmiş route arama"""
-        query = self.db.query(Routes)
+    ) -> Page:
+        """Gelişmiş route arama (keyset sayfalı)"""
+        query = select(Routes)
         
         if short_name:
-            query = query.filter(Routes.route_short_name.ilike(f"%{short_name}%"))
+            query = query.where(Routes.route_short_name.ilike(f"%{short_name}%"))
         
         if long_name:
-            query = query.filter(Routes.route_long_name.ilike(f"%{long_name}%"))
+            query = query.where(Routes.route_long_name.ilike(f"%{long_name}%"))
         
         if route_type is not None:
-            query = query.filter(Routes.route_type == route_type)
+            query = query.where(Routes.route_type == route_type)
         
         if agency_id:
-            query = query.filter(Routes.agency_id == agency_id)
+            query = query.where(Routes.agency_id == agency_id)
         
         if snapshot_id:
-            query = query.filter(Routes.snapshot_id == str(snapshot_id))
+            query = query.where(Routes.snapshot_id == str(snapshot_id))
         
-        return query.offset(skip).limit(limit).all()
+        return await self._page(query, cursor, skip, limit)
     
-    def get_route_types_summary(self, snapshot_id: Optional[UUID] = None) -> List[dict]:
+    async def get_route_types_summary(self, snapshot_id: Optional[UUID] = None) -> List[dict]:
         """Route tiplerinin özeti (kaç tane bus, metro vs.)"""
         from sqlalchemy import func
         
-        query = self.db.query(
+        query = select(
             Routes.route_type,
             func.count(Routes.route_id).label('count')
         ).group_by(Routes.route_type)
         
         if snapshot_id:
-            query = query.filter(Routes.snapshot_id == str(snapshot_id))
+            query = query.where(Routes.snapshot_id == str(snapshot_id))
         
-        results = query.all()
+        results = await self._rows(query)
         
         # Route type açıklamaları
         type_names = {
@@ -101,11 +103,11 @@ class RoutesService(BaseService[Routes, RoutesCreate, RoutesUpdate]):
             for r in results
         ]
     
-    def get_routes_with_colors(self, snapshot_id: Optional[UUID] = None) -> List[Routes]:
+    async def get_routes_with_colors(self, snapshot_id: Optional[UUID] = None) -> List[Routes]:
         """Rengi olan route'ları getir"""
-        query = self.db.query(Routes).filter(Routes.route_color.isnot(None))
+        query = select(Routes).where(Routes.route_color.isnot(None))
         
         if snapshot_id:
-            query = query.filter(Routes.snapshot_id == str(snapshot_id))
+            query = query.where(Routes.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+import orjson
+
+from app.services.response_cache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GTFSRC01'
+WAYS = 4                      # anahtarın yerleşebileceği slot sayısı (set-associative)
+
+# magic, slot sayısı, veri bölgesi boyutu, head (veri halkasında bir sonraki yazımın mutlak konumu)
+_HEADER = struct.Struct('<8sIxxxxQQ')
+# seq (seqlock: tek = yazılıyor), anahtar hash'i, snapshot hash'i, mutlak konum, uzunluk
+_SLOT = struct.Struct('<Q16sQQI4x')
+_U64 = struct.Struct('<Q')
+_META_LENGTH = struct.Struct('<I')
+_HEAD_OFFSET = 24
+
+
+def _digest(value: str, size: int) -> bytes:
+    return hashlib.blake2b(value.encode(), digest_size=size).digest()
+
+
+def _snapshot_hash(snapshot_id: str) -> int:
+    return int.from_bytes(_digest(str(snapshot_id), 8), 'little')
+
+
+class SharedResponseCache:
+    """Aynı node'daki tüm worker process'lerinin paylaştığı, mmap'li dosyada tutulan yanıt cache'i
+
+    ResponseCache ile aynı arayüzdür (get, put, evict_snapshot, clear, stats). Dosya bir slot
+    tablosu ve bir veri halkasından oluşur:
+
+    - Yazımlar (put, evict, clear) flock ile sıralanır. Yanıt halkanın head'ine yazılır; head,
+      byte'lar yazılmadan önce ilerletilir. Slot seqlock ile güncellenir (seq tek iken yazım var).
+    - Okuma kilitsizdir: slot ve veri kopyalanır, ardından seq değişmemiş ve head kopyalanan
+      bölgenin üzerine yazılacak kadar ilerlememişse kopya geçerlidir; değilse miss sayılır.
+
+    Halka dolunca en eski yanıtların üzerine yazılır (FIFO); okuma paylaşılan belleğe yazmadığı
+    için LRU sırası tutulmaz. hits/misses/evictions sayaçları worker başınadır.
+
+    Dosya adı düzeni (slot sayısı, veri boyutu) içerir: farklı ayarlarla açan worker kendi dosyasını
+    kullanır, başka process'lerin map ettiği dosya hiçbir zaman kesilip yeniden boyutlandırılmaz.
+    """
+
+    def __init__(self, path: str, max_bytes: int, slots: Optional[int] = None):
+        self.max_bytes = max_bytes
+        slots = slots or max(1024, max_bytes // 8192)
+        self.sets = max(1, slots // WAYS)
+        self.slots = self.sets * WAYS
+        self.path = f"{path}-{self.slots}s-{max_bytes}b"
+        self._slots_offset = _HEADER.size
+        self._data_offset = self._slots_offset + self.slots * _SLOT.size
+        self._thread_lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+        size = self._data_offset + max_bytes
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = self._open(size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def _open(self, size: int) -> int:
+        """Düzeni tutan dosyayı aç; yoksa (ya da bozuksa) hazırlanmış yeni dosyayı atomik olarak yerine koy"""
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            fd = None
+        if fd is not None:
+            if os.fstat(fd).st_size == size and self._header_matches(fd):
+                return fd
+            os.close(fd)
+
+        # Boş slot tablosu ve halka sıfırlardan oluşur: header yazılmış dosya yayınlanmaya hazırdır
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(temp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, _HEADER.pack(MAGIC, self.slots, self.max_bytes, 0), 0)
+            try:
+                # link var olan dosyanın üzerine yazmaz: eşzamanlı açan worker'lardan biri kazanır
+                os.link(temp_path, self.path)
+            except FileExistsError:
+                existing = os.open(self.path, os.O_RDWR)
+                if os.fstat(existing).st_size == size and self._header_matches(existing):
+                    os.close(fd)
+                    return existing
+                os.close(existing)
+                # Bozuk dosya: yeni inode ile değiştirilir, eskisini map etmiş process'ler etkilenmez
+                logger.warning(f"Replacing corrupt shared response cache file {self.path}")
+                os.replace(temp_path, self.path)
+            return fd
+        except BaseException:
+            os.close(fd)
+            raise
+        finally:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _header_matches(self, fd: int) -> bool:
+        magic, slots, data_size, _ = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+        return magic == MAGIC and slots == self.slots and data_size == self.max_bytes
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        # flock process'ler arasında, thread lock aynı process'in thread'leri arasında sıralar
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _key_hash(self, key: Hashable) -> Tuple[bytes, int]:
+        # hash() process başına rastgeledir; anahtar her worker'da aynı byte'lara çevrilir
+        key_hash = _digest(repr(key), 16)
+        return key_hash, int.from_bytes(key_hash[:8], 'little') % self.sets
+
+    def _slot_offset(self, set_index: int, way: int) -> int:
+        return self._slots_offset + (set_index * WAYS + way) * _SLOT.size
+
+    def _head(self) -> int:
+        return _U64.unpack_from(self._mm, _HEAD_OFFSET)[0]
+
+    def _is_live(self, position: int, length: int, head: int) -> bool:
+        return length > 0 and position + self.max_bytes >= head
+
+    # OKUMA (kilitsiz)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        key_hash, set_index = self._key_hash(key)
+        for way in range(WAYS):
+            offset = self._slot_offset(set_index, way)
+            seq, slot_key, _, position, length = _SLOT.unpack_from(self._mm, offset)
+            if seq & 1 or slot_key != key_hash or length == 0:
+                continue
+
+            start = self._data_offset + position % self.max_bytes
+            payload = self._mm[start:start + length]
+            # Kopya sırasında slot değiştiyse ya da bölgenin üzerine yazılmaya başlandıysa geçersiz
+            if _U64.unpack_from(self._mm, offset)[0] != seq or not self._is_live(position, length, self._head()):
+                break
+            if payload[:16] != key_hash:
+                break
+            self.hits += 1
+            return _decode(payload)
+
+        self.misses += 1
+        return None
+
+    # YAZMA (flock)
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        key_hash, set_index = self._key_hash(key)
+        payload = key_hash + _encode(entry)
+        length = len(payload)
+        if length > self.max_bytes:
+            return
+
+        with self._write_lock():
+            head = self._head()
+            physical = head % self.max_bytes
+            if physical + length > self.max_bytes:
+                # Yanıt halkanın sonuna bölünmez, başa geçilir
+                head += self.max_bytes - physical
+                physical = 0
+            position, new_head = head, head + length
+
+            # Önce head: üzerine yazılacak bölgeyi okuyan worker'lar kopyalarını geçersiz sayar
+            _U64.pack_into(self._mm, _HEAD_OFFSET, new_head)
+            start = self._data_offset + physical
+            self._mm[start:start + length] = payload
+
+            way = self._choose_way(set_index, key_hash, new_head)
+            self._write_slot(self._slot_offset(set_index, way), key_hash, _snapshot_hash(entry.snapshot_id), position, length)
+
+    def _choose_way(self, set_index: int, key_hash: bytes, head: int) -> int:
+        """Aynı anahtarın slot'u, yoksa boş/üzerine yazılmış slot, yoksa en eski yanıtınki"""
+        oldest_way, oldest_position = 0, None
+        for way in range(WAYS):
+            _, slot_key, _, position, length = _SLOT.unpack_from(self._mm, self._slot_offset(set_index, way))
+            if slot_key == key_hash or not self._is_live(position, length, head):
+                return way
+            if oldest_position is None or position < oldest_position:
+                oldest_way, oldest_position = way, position
+        self.evictions += 1
+        return oldest_way
+
+    def _write_slot(self, offset: int, key_hash: bytes, snapshot_hash: int, position: int, length: int) -> None:
+        seq = _U64.unpack_from(self._mm, offset)[0]
+        _U64.pack_into(self._mm, offset, seq + 1)
+        _SLOT.pack_into(self._mm, offset, seq + 1, key_hash, snapshot_hash, position, length)
+        _U64.pack_into(self._mm, offset, seq + 2)
+
+    def evict_snapshot(self, snapshot_id: str) -> None:
+        """Snapshot'ın tüm kayıtlarını düşür (tüm worker'lar için)"""
+        snapshot_hash = _snapshot_hash(snapshot_id)
+        with self._write_lock():
+            for slot in range(self.slots):
+                offset = self._slots_offset + slot * _SLOT.size
+                _, slot_key, slot_snapshot, _, length = _SLOT.unpack_from(self._mm, offset)
+                if length and slot_snapshot == snapshot_hash:
+                    self._write_slot(offset, slot_key, 0, 0, 0)
+
+    def clear(self) -> None:
+        with self._write_lock():
+            for slot in range(self.slots):
+                offset = self._slots_offset + slot * _SLOT.size
+                if _SLOT.unpack_from(self._mm, offset)[4]:
+                    self._write_slot(offset, bytes(16), 0, 0, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        head = self._head()
+        entries = used = 0
+        for slot in range(self.slots):
+            _, _, _, position, length = _SLOT.unpack_from(self._mm, self._slots_offset + slot * _SLOT.size)
+            if self._is_live(position, length, head):
+                entries += 1
+                used += length
+        return {
+            'backend': 'shared',
+            'pid': os.getpid(),
+            'path': self.path,
+            'entries': entries,
+            'bytes': used,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def _encode(entry: CachedResponse) -> bytes:
+    meta = orjson.dumps([entry.snapshot_id, entry.status_code, entry.headers, entry.etag])
+    return _META_LENGTH.pack(len(meta)) + meta + entry.body
+
+
+def _decode(payload: bytes) -> CachedResponse:
+    (meta_length,) = _META_LENGTH.unpack_from(payload, 16)
+    meta_end = 16 + _META_LENGTH.size + meta_length
+    snapshot_id, status_code, headers, etag = orjson.loads(payload[16 + _META_LENGTH.size:meta_end])
+    return CachedResponse(snapshot_id, status_code, [tuple(header) for header in headers], payload[meta_end:], etag)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.active_snapshot import ActiveSnapshot
+from app.models.snapshot import DEFAULT_FEED, Snapshot
+from app.services.gtfs_staging import partition_name
+
+logger = logging.getLogger(__name__)
+
+# Kaynak ZIP hash'lenirken okunan blok boyutu
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def source_sha256(zip_source: Union[bytes, bytearray, str, Path]) -> str:
+    """Yüklenen ZIP'in SHA-256'sı - yol verildiyse dosya parça parça okunur"""
+    digest = hashlib.sha256()
+    if isinstance(zip_source, (bytes, bytearray)):
+        digest.update(zip_source)
+        return digest.hexdigest()
+
+    with open(zip_source, 'rb') as source:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotCatalog:
+    """snapshots tablosu: snapshot başına tek satırlık, ingest sırasında yazılan katalog
+
+    Listeleme ve cleanup GTFS tablolarını taramaz; satır sayıları, boyutlar ve feed_info
+    tarihleri yayınla aynı transaction'da yazılır.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def register(
+        self,
+        snapshot_id: str,
+        feed: str = DEFAULT_FEED,
+        source_filename: Optional[str] = None,
+        source_bytes: Optional[int] = None,
+    ) -> None:
+        """Kuyruğa alınan snapshot'ı kataloğa ekle (commit etmez)"""
+        self.db.add(Snapshot(
+            snapshot_id=snapshot_id,
+            feed=feed,
+            status='queued',
+            source_filename=source_filename,
+            source_bytes=source_bytes,
+            created_at=datetime.utcnow(),
+        ))
+
+    def begin(self, snapshot_id: str, sha256: str, source_bytes: int) -> None:
+        """Ingest başladı: kaydı 'loading' yap, yoksa oluştur (kuyruk dışı yüklemeler) ve commit et"""
+        values = {'status': 'loading', 'source_sha256': sha256, 'source_bytes': source_bytes}
+        self.db.execute(
+            insert(Snapshot)
+            .values(snapshot_id=snapshot_id, feed=DEFAULT_FEED, created_at=datetime.utcnow(), **values)
+            .on_conflict_do_update(index_elements=[Snapshot.snapshot_id], set_=values)
+        )
+        self.db.commit()
+
+    def publish(
+        self,
+        snapshot_id: str,
+        models: Sequence,
+        row_counts: Dict[str, int],
+        source_columns: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        """Yayınlanan snapshot'ın istatistiklerini yaz (commit etmez - ATTACH ile aynı transaction'da)
+
+        row_counts ingest sırasında yazılan satır sayılarıdır; boyutlar partition'lardan okunur.
+        source_columns, kaynak dosyaların sütun sırasıdır (ZIP export'u aynı sırayla yazar).
+        """
+        partitions = {partition_name(m.__tablename__, snapshot_id): m.__tablename__ for m in models}
+        sizes = self.db.execute(text("""
+            SELECT relname, pg_total_relation_size(oid)
+            FROM pg_class
+            WHERE relnamespace = current_schema()::regnamespace AND relname = ANY(:names)
+        """), {'names': list(partitions)}).all()
+        table_bytes = {partitions[name]: size for name, size in sizes}
+
+        feed = self.db.execute(text("""
+            SELECT feed_version, feed_start_date, feed_end_date
+            FROM feed_info WHERE snapshot_id = :snapshot_id LIMIT 1
+        """), {'snapshot_id': snapshot_id}).first()
+
+        counts = {m.__tablename__: row_counts.get(m.__tablename__, 0) for m in models}
+        self.db.query(Snapshot).filter(Snapshot.snapshot_id == snapshot_id).update(
+            {
+                'status': 'published',
+                'row_counts': counts,
+                'source_columns': source_columns,
+                'table_bytes': table_bytes,
+                'total_rows': sum(counts.values()),
+                'total_bytes': sum(table_bytes.values()),
+                'feed_version': feed.feed_version if feed else None,
+                'feed_start_date': feed.feed_start_date if feed else None,
+                'feed_end_date': feed.feed_end_date if feed else None,
+                'published_at': datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+
+    def set_status(self, snapshot_id: str, status: str) -> None:
+        """Durumu güncelle (commit etmez)"""
+        self.db.query(Snapshot).filter(Snapshot.snapshot_id == snapshot_id).update(
+            {'status': status}, synchronize_session=False
+        )
+
+    def delete(self, snapshot_id: str) -> bool:
+        """Katalog kaydını sil (commit etmez)"""
+        return self.db.query(Snapshot).filter(Snapshot.snapshot_id == snapshot_id).delete() > 0
+
+    def feed_of(self, snapshot_id: str) -> str:
+        """Snapshot'ın feed'i"""
+        return self.db.query(Snapshot.feed).filter(Snapshot.snapshot_id == snapshot_id).scalar() or DEFAULT_FEED
+
+    def get(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Tek snapshot'ın katalog kaydı"""
+        snapshot = self.db.get(Snapshot, snapshot_id)
+        return self.to_dict(snapshot) if snapshot else None
+
+    def list(self, status: Optional[str] = 'published', feed: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Snapshot'ları en yeniden eskiye listele - tek indeksli okuma (status/feed None ise hepsi)"""
+        query = self.db.query(Snapshot)
+        if status:
+            query = query.filter(Snapshot.status == status)
+        if feed:
+            query = query.filter(Snapshot.feed == feed)
+        return [self.to_dict(s) for s in query.order_by(Snapshot.created_at.desc()).all()]
+
+    def expired(self, keep_count: int) -> List[str]:
+        """Her feed'de en yeni keep_count yayınlanmış snapshot dışındakilerin ID'leri
+
+        Bir feed'in aktif snapshot'ı eski olsa da hiçbir zaman döndürülmez.
+        """
+        ranked = self.db.query(
+            Snapshot.snapshot_id,
+            func.row_number().over(partition_by=Snapshot.feed, order_by=Snapshot.created_at.desc()).label('rank'),
+        ).filter(Snapshot.status == 'published').subquery()
+        rows = self.db.query(ranked.c.snapshot_id).filter(
+            ranked.c.rank > keep_count,
+            ~self.db.query(ActiveSnapshot).filter(ActiveSnapshot.snapshot_id == ranked.c.snapshot_id).exists(),
+        ).all()
+        return [row.snapshot_id for row in rows]
+
+    @staticmethod
+    def to_dict(snapshot: Snapshot) -> Dict[str, Any]:
+        """Katalog kaydını API yanıtına çevir"""
+        return {
+            'snapshot_id': snapshot.snapshot_id,
+            'feed': snapshot.feed,
+            'status': snapshot.status,
+            'created_at': snapshot.created_at.isoformat() if snapshot.created_at else None,
+            'published_at': snapshot.published_at.isoformat() if snapshot.published_at else None,
+            'source_filename': snapshot.source_filename,
+            'source_sha256': snapshot.source_sha256,
+            'source_bytes': snapshot.source_bytes,
+            'total_rows': snapshot.total_rows,
+            'total_bytes': snapshot.total_bytes,
+            'row_counts': snapshot.row_counts or {},
+            'source_columns': snapshot.source_columns or {},
+            'table_bytes': snapshot.table_bytes or {},
+            'generation': snapshot.generation or 0,
+            'feed_version': snapshot.feed_version,
+            'feed_start_date': snapshot.feed_start_date.isoformat() if snapshot.feed_start_date else None,
+            'feed_end_date': snapshot.feed_end_date.isoformat() if snapshot.feed_end_date else None,
+        }
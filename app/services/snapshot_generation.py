@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.snapshot import Snapshot
+from app.services.response_cache import get_response_cache
+
+# Worker (process) başına cache: snapshot_id -> (generation, geçerlilik sonu)
+_cache: Dict[str, Tuple[Optional[int], float]] = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate_generation_cache(snapshot_id: Optional[str] = None) -> None:
+    """Bu worker'ın cache'ini boşalt (snapshot_id None ise tamamını); diğer worker'lar TTL ile yakalar"""
+    with _cache_lock:
+        if snapshot_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(snapshot_id), None)
+
+
+def invalidate_snapshot(snapshot_id: str) -> None:
+    """Snapshot'ın verisi değişti ya da kaldırıldı (commit'ten sonra): generation ve yanıt cache'i kayıtlarını düşür"""
+    invalidate_generation_cache(snapshot_id)
+    get_response_cache().evict_snapshot(str(snapshot_id))
+
+
+class SnapshotGenerations:
+    """snapshots.generation: snapshot verisinin CRUD ile kaç kez değiştiği
+
+    Yayınlanmış snapshot'ın verisi yalnızca BaseService yazımlarıyla değişir; her yazım sayacı
+    aynı transaction'da artırır. Yanıt cache'i ve Parquet önbelleği anahtarlarına generation'ı
+    katar: yazımdan sonra eski kayıtlar bir daha okunmaz. Çözümleme worker başına TTL cache'inden
+    yapılır; yazan worker commit'te kendi kaydını düşürür, diğerleri en geç TTL sonunda görür.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def resolve_async(self, snapshot_id: str) -> Optional[int]:
+        """Yayınlanmış snapshot'ın generation'ı; katalogda olmayan ya da henüz/artık yayında olmayan snapshot için None
+
+        Kuyruktaki/yüklenen snapshot'ın verisi yayınla değişir ama generation artmaz: bu snapshot'ların
+        yanıtları cache'lenmemelidir.
+        """
+        snapshot_id = str(snapshot_id)
+        with _cache_lock:
+            cached = _cache.get(snapshot_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        row = (await self.db.execute(
+            select(Snapshot.generation, Snapshot.status).where(Snapshot.snapshot_id == snapshot_id)
+        )).first()
+        generation = row.generation if row is not None and row.status == 'published' else None
+        with _cache_lock:
+            _cache[snapshot_id] = (generation, time.monotonic() + get_settings().RESPONSE_CACHE_GENERATION_TTL)
+        return generation
+
+    async def bump(self, snapshot_ids: Iterable[str]) -> None:
+        """Snapshot'ların generation'ını artır (commit etmez; commit'ten sonra bu worker'ın cache'i düşer)"""
+        snapshot_ids = sorted({str(snapshot_id) for snapshot_id in snapshot_ids if snapshot_id})
+        if not snapshot_ids:
+            return
+
+        await self.db.execute(
+            update(Snapshot)
+            .where(Snapshot.snapshot_id.in_(snapshot_ids))
+            .values(generation=Snapshot.generation + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Commit'ten önce düşürülürse araya giren bir istek eski değeri tekrar cache'leyebilir
+        def invalidate(session) -> None:
+            for snapshot_id in snapshot_ids:
+                invalidate_snapshot(snapshot_id)
+
+        event.listen(self.db.sync_session, 'after_commit', invalidate, once=True)
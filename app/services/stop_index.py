@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from app.core.config import get_settings
+
+EARTH_RADIUS_KM = 6371.0088
+# Yarıçap bu değeri aşarsa küre üzerindeki her nokta kapsanır
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+LonRanges = List[Tuple[float, float]]
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """(lat, lon) ile dizilerdeki noktalar arasındaki büyük çember mesafesi (km)"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def radius_bounds(lat: float, lon: float, radius_km: float) -> Tuple[float, float, LonRanges]:
+    """Yarıçaplı dairenin (küresel başlık) sınır kutusu: enlem aralığı ve boylam aralıkları
+
+    Boylam genişliği enleme göre hesaplanır; başlık kutbu içeriyorsa tüm boylamlar, 180. meridyeni
+    aşıyorsa iki aralık döner.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    lat_lo, lat_hi = lat - math.degrees(angular), lat + math.degrees(angular)
+    if lat_lo <= -90 or lat_hi >= 90 or angular >= math.pi / 2:
+        return max(lat_lo, -90.0), min(lat_hi, 90.0), [(-180.0, 180.0)]
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat)))))
+    lon_lo, lon_hi = lon - dlon, lon + dlon
+    if lon_lo < -180:
+        return lat_lo, lat_hi, [(lon_lo + 360, 180.0), (-180.0, lon_hi)]
+    if lon_hi > 180:
+        return lat_lo, lat_hi, [(lon_lo, 180.0), (-180.0, lon_hi - 360)]
+    return lat_lo, lat_hi, [(lon_lo, lon_hi)]
+
+
+class StopIndex:
+    """Bir snapshot'ın duraklarının bellek içi mekânsal indeksi: NumPy dizileri üzerinde ızgara
+
+    Duraklar cell_degrees'lik hücrelere ayrılır ve hücre anahtarına (enlem satırı, boylam sütunu)
+    göre sıralanır; bir kutunun her enlem satırı sıralı dizide tek bir aralıktır (searchsorted).
+    Aday duraklara kesin haversine mesafesi uygulanır. Satırlar (PK sırasıyla) olduğu gibi tutulur,
+    sorgular veritabanına gitmez.
+    """
+
+    def __init__(self, rows: Sequence[Sequence[Any]], keys: Sequence[str], cell_degrees: float = 0.01):
+        self.rows = list(rows)
+        self.keys = tuple(keys)
+        self.cell_degrees = cell_degrees
+        lat_at, lon_at = self.keys.index('stop_lat'), self.keys.index('stop_lon')
+        self.lat = np.fromiter((row[lat_at] for row in self.rows), dtype=np.float64, count=len(self.rows))
+        self.lon = np.fromiter((row[lon_at] for row in self.rows), dtype=np.float64, count=len(self.rows))
+
+        self._lat_cells = int(math.ceil(180 / cell_degrees)) + 1
+        self._lon_cells = int(math.ceil(360 / cell_degrees)) + 1
+        cell_keys = self._lat_cell(self.lat) * self._lon_cells + self._lon_cell(self.lon)
+        self._order = np.argsort(cell_keys, kind='stable')
+        self._cell_keys = cell_keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _lat_cell(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_degrees), 0, self._lat_cells - 1).astype(np.int64)
+
+    def _lon_cell(self, lon):
+        return np.clip(np.floor((np.asarray(lon) + 180) / self.cell_degrees), 0, self._lon_cells - 1).astype(np.int64)
+
+    def _candidates(self, lat_lo: float, lat_hi: float, lon_ranges: LonRanges) -> np.ndarray:
+        """Kutuyla kesişen hücrelerdeki durakların (PK sıralı) indeksleri"""
+        lat_rows = np.arange(self._lat_cell(lat_lo), self._lat_cell(lat_hi) + 1, dtype=np.int64) * self._lon_cells
+        starts, ends = [], []
+        for lon_lo, lon_hi in lon_ranges:
+            starts.append(np.searchsorted(self._cell_keys, lat_rows + self._lon_cell(lon_lo), 'left'))
+            ends.append(np.searchsorted(self._cell_keys, lat_rows + self._lon_cell(lon_hi), 'right'))
+        starts, ends = np.concatenate(starts), np.concatenate(ends)
+
+        # Aralıkları tek seferde birleştir: her aralığın konumları start, start + 1, ..., end - 1
+        lengths = ends - starts
+        starts, lengths = starts[lengths > 0], lengths[lengths > 0]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return np.sort(self._order[offsets + np.arange(lengths.sum())])
+
+    def in_bounding_box(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> List[Sequence[Any]]:
+        """Kutudaki (sınırlar dahil) duraklar, PK sırasıyla"""
+        if min_lat > max_lat or min_lon > max_lon or not self.rows:
+            return []
+        candidates = self._candidates(min_lat, max_lat, [(min_lon, max_lon)])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = candidates[(lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)]
+        return [self.rows[i] for i in inside]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[Sequence[Any], float]]:
+        """radius_km içindeki en yakın limit durak: (satır, km), mesafeye (eşitlikte PK'ya) göre sıralı"""
+        if not self.rows:
+            return []
+        candidates = self._candidates(*radius_bounds(lat, lon, radius_km))
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+
+        nearest = np.argsort(distances, kind='stable')[:limit]
+        return [(self.rows[candidates[i]], float(distances[i])) for i in nearest]
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[Sequence[Any], float]]:
+        """Mesafeden bağımsız en yakın k durak; arama yarıçapı k durak bulunana kadar büyütülür
+
+        r yarıçapında k durak varsa dışarıdaki her durak r'den uzaktır: sonuç kesin k-en-yakındır.
+        """
+        radius_km = max(1.0, self.cell_degrees * 111.0)
+        while True:
+            found = self.within_radius(lat, lon, radius_km, k)
+            if len(found) >= k or radius_km >= HALF_CIRCUMFERENCE_KM:
+                return found
+            radius_km = min(radius_km * 4, HALF_CIRCUMFERENCE_KM)
+
+
+class StopIndexCache:
+    """Worker başına, snapshot başına bir StopIndex; en az yakın zamanda kullanılan snapshot düşer
+
+    İndeks (snapshot_id, generation) içindir: CRUD yazımı generation'ı artırınca ilk sorguda yeniden
+    kurulur. Aynı snapshot'ın indeksini bekleyen eşzamanlı istekler tek kurulumu bekler.
+    """
+
+    def __init__(self, max_snapshots: int):
+        self.max_snapshots = max_snapshots
+        self._indexes: "OrderedDict[str, Tuple[int, StopIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Kurulumu bekleyen istek kalmayınca snapshot'ın kilidi düşer
+        self._build_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+    def _cached(self, snapshot_id: str, generation: int) -> Optional[StopIndex]:
+        with self._lock:
+            cached = self._indexes.get(snapshot_id)
+            if cached is None or cached[0] != generation:
+                return None
+            self._indexes.move_to_end(snapshot_id)
+            return cached[1]
+
+    async def get(self, snapshot_id: str, generation: int, build: Callable[[], Awaitable[StopIndex]]) -> StopIndex:
+        index = self._cached(snapshot_id, generation)
+        if index is not None:
+            return index
+
+        async with self._build_locks.setdefault(snapshot_id, asyncio.Lock()):
+            index = self._cached(snapshot_id, generation)
+            if index is None:
+                index = await build()
+                with self._lock:
+                    self._indexes[snapshot_id] = (generation, index)
+                    self._indexes.move_to_end(snapshot_id)
+                    while len(self._indexes) > self.max_snapshots:
+                        self._indexes.popitem(last=False)
+        return index
+
+
+@lru_cache
+def get_stop_indexes() -> StopIndexCache:
+    """Worker'ın durak indeksi cache'i (STOP_INDEX_MAX_SNAPSHOTS)"""
+    return StopIndexCache(get_settings().STOP_INDEX_MAX_SNAPSHOTS)
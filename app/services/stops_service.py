@@ -1,33 +1,40 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, or_, text, select
 
 from app.models.stops import Stops
-from app.schemas.stops import StopsCreate, StopsUpdate
+from app.schemas.stops import StopsCreate, StopsRead, StopsUpdate
 from app.services.base_service import BaseService
+from app.services.projection import row_projection
+from app.services.snapshot_generation import SnapshotGenerations
+from app.services.stop_index import StopIndex, get_stop_indexes, radius_bounds
+
+# Durak indeksinin satırları: StopsRead alanları (JSON yanıtlarının ve project(StopsRead)'in düzeni)
+STOP_ROWS = row_projection(Stops, StopsRead)
 
 
 class StopsService(BaseService[Stops, StopsCreate, StopsUpdate]):
     """Stops tablosu için özel servis"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Stops, db)
     
     # STOPS-SPESİFİK OPERASYONLAR
     
-    def search_by_name(self, name: str, snapshot_id: Optional[UUID] = None) -> List[Stops]:
+    async def search_by_name(self, name: str, snapshot_id: Optional[UUID] = None) -> List[Stops]:
         """Stop adı ile ara"""
-        query = self.db.query(Stops).filter(Stops.stop_name.ilike(f"%{name}%"))
+        query = select(Stops).where(Stops.stop_name.ilike(f"%{name}%"))
         
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_stops_in_bounding_box(
+    async def get_stops_in_bounding_box(
         self,
         min_lat: float,
         max_lat: float, 
@@ -35,8 +42,17 @@ class StopsService(BaseService[Stops, StopsCreate, StopsUpdate]):
         max_lon: float,
         snapshot_id: Optional[UUID] = None
     ) -> List[Stops]:
-        """Belirli bir coğrafi alan içindeki stop'ları getir"""
-        query = self.db.query(Stops).filter(
+        """Belirli bir coğrafi alan içindeki stop'ları getir
+
+        Servis project(StopsRead) ile oluşturulmuşsa yayınlanmış snapshot'ın sorgusu bellek içi
+        durak indeksinden (PK sırasıyla) cevaplanır.
+        """
+        if self.projection is STOP_ROWS:
+            index = await self.spatial_index(snapshot_id)
+            if index is not None:
+                return index.in_bounding_box(min_lat, max_lat, min_lon, max_lon)
+
+        query = select(Stops).where(
             and_(
                 Stops.stop_lat >= min_lat,
                 Stops.stop_lat <= max_lat,
@@ -46,73 +62,87 @@ class StopsService(BaseService[Stops, StopsCreate, StopsUpdate]):
         )
         
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def find_nearby_stops(
+    async def find_nearby_stops(
         self,
         latitude: float,
         longitude: float,
         radius_km: float = 1.0,
         snapshot_id: Optional[UUID] = None,
         limit: int = 50
-    ) -> List[Tuple[Stops, float]]:
-        """Belirli bir noktaya yakın stop'ları mesafe ile getir"""
-        # Basit koordinat tabanlı filtre (yaklaşık)
-        # Radius'u derece cinsine çevir (kabaca 1 derece = 111 km)
-        degree_radius = radius_km / 111.0
-        
-        query = self.db.query(Stops).filter(
-            and_(
-                Stops.stop_lat >= latitude - degree_radius,
-                Stops.stop_lat <= latitude + degree_radius,
-                Stops.stop_lon >= longitude - degree_radius,
-                Stops.stop_lon <= longitude + degree_radius
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """radius_km içindeki en yakın limit stop, haversine mesafesiyle (km) ve mesafeye göre sıralı"""
+        index = await self.spatial_index(snapshot_id)
+        if index is None:
+            # Katalogda olmayan snapshot: dairenin sınır kutusundaki adaylar üzerinde geçici indeks
+            lat_lo, lat_hi, lon_ranges = radius_bounds(latitude, longitude, radius_km)
+            index = await self._build_index(
+                Stops.stop_lat.between(lat_lo, lat_hi),
+                or_(*(Stops.stop_lon.between(lon_lo, lon_hi) for lon_lo, lon_hi in lon_ranges)),
+                snapshot_id=snapshot_id,
             )
-        )
-        
+        return self._with_fields(index.within_radius(latitude, longitude, radius_km, limit))
+
+    async def find_nearest_stops(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        snapshot_id: Optional[UUID] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Mesafe sınırı olmadan en yakın k stop (haversine, km)"""
+        index = await self.spatial_index(snapshot_id)
+        if index is None:
+            index = await self._build_index(snapshot_id=snapshot_id)
+        return self._with_fields(index.nearest(latitude, longitude, k))
+
+    async def spatial_index(self, snapshot_id: Optional[UUID] = None) -> Optional[StopIndex]:
+        """Snapshot'ın (generation'ındaki) durak indeksi - ilk istekte kurulur, worker'da cache'lenir
+
+        snapshot yoksa ya da yayınlanmış değilse (yükleniyor ya da CRUD ile oluşturulmuş) None döner.
+        """
+        if not snapshot_id:
+            return None
+        generation = await SnapshotGenerations(self.db).resolve_async(str(snapshot_id))
+        if generation is None:
+            return None
+        return await get_stop_indexes().get(str(snapshot_id), generation, partial(self._build_index, snapshot_id=snapshot_id))
+
+    async def _build_index(self, *conditions, snapshot_id: Optional[UUID] = None) -> StopIndex:
+        query = select(Stops).where(*conditions)
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
-        
-        results = query.limit(limit).all()
-        
-        # Basit mesafe hesaplama (Euclidean distance yaklaşımı)
-        nearby_stops = []
-        for stop in results:
-            # Kabaca mesafe hesaplama
-            lat_diff = float(stop.stop_lat) - latitude
-            lon_diff = float(stop.stop_lon) - longitude
-            distance = (lat_diff**2 + lon_diff**2)**0.5 * 111  # km cinsine çevir
-            
-            if distance <= radius_km:
-                nearby_stops.append((stop, round(distance, 3)))
-        
-        # Mesafeye göre sırala
-        nearby_stops.sort(key=lambda x: x[1])
-        return nearby_stops[:limit]
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
+        rows = await self._rows(STOP_ROWS.apply(query.order_by(Stops.stop_id)))
+        return StopIndex(rows, STOP_ROWS.keys)
+
+    @staticmethod
+    def _with_fields(found: List[Tuple[Any, float]]) -> List[Tuple[Dict[str, Any], float]]:
+        return [(dict(zip(STOP_ROWS.keys, row)), distance) for row, distance in found]
     
-    def get_stops_by_zone(self, zone_id: str, snapshot_id: Optional[UUID] = None) -> List[Stops]:
+    async def get_stops_by_zone(self, zone_id: str, snapshot_id: Optional[UUID] = None) -> List[Stops]:
         """Zone ID'ye göre stop'ları getir"""
-        query = self.db.query(Stops).filter(Stops.zone_id == zone_id)
+        query = select(Stops).where(Stops.zone_id == zone_id)
         
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_stops_with_urls(self, snapshot_id: Optional[UUID] = None) -> List[Stops]:
+    async def get_stops_with_urls(self, snapshot_id: Optional[UUID] = None) -> List[Stops]:
         """URL'si olan stop'ları getir"""
-        query = self.db.query(Stops).filter(Stops.stop_url.isnot(None))
+        query = select(Stops).where(Stops.stop_url.isnot(None))
         
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
         
-        return query.all()
+        return await self._all(query)
     
-    def get_geographic_bounds(self, snapshot_id: Optional[UUID] = None) -> dict:
+    async def get_geographic_bounds(self, snapshot_id: Optional[UUID] = None) -> dict:
         """Tüm stop'ların coğrafi sınırlarını getir"""
-        query = self.db.query(
+        query = select(
             func.min(Stops.stop_lat).label('min_lat'),
             func.max(Stops.stop_lat).label('max_lat'),
             func.min(Stops.stop_lon).label('min_lon'),
@@ -120,9 +150,9 @@ class StopsService(BaseService[Stops, StopsCreate, StopsUpdate]):
         )
         
         if snapshot_id:
-            query = query.filter(Stops.snapshot_id == str(snapshot_id))
+            query = query.where(Stops.snapshot_id == str(snapshot_id))
         
-        result = query.first()
+        result = (await self._rows(query))[0]
         
         return {
             "min_latitude": float(result.min_lat) if result.min_lat else None,
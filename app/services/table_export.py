@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import Date, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.gtfs_parser import GENERATED_COLUMNS, scalar_defaults
+from app.services.pagination import keyset_columns
+from app.services.projection import json_default
+
+# format -> (media type, dosya uzantısı)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+
+class TableExporter:
+    """Bir GTFS tablosunun snapshot'ındaki tüm satırları NDJSON ya da CSV olarak akıtan servis
+
+    Satırlar server-side cursor'dan batch_rows'luk parçalar halinde okunur ve her parça
+    kodlanıp hemen gönderilir: bellek tablo boyutundan bağımsızdır, sayfa başına sorgu yoktur.
+    Sütunlar GTFS dosyasının sütunlarıdır (snapshot_id, zaman damgaları ve feed_info.id gibi
+    dosyada olmayan sütunlar hariç) ya da verilen columns sırasıdır; CSV çıktısı GTFS
+    formatındadır (tarihler YYYYMMDD) ve yeniden yüklenebilir.
+    """
+
+    def __init__(self, model_class, batch_rows: int = 5000, columns: Optional[Sequence[str]] = None):
+        self.model = model_class
+        self.batch_rows = batch_rows
+        table_columns = model_class.__table__.columns
+        if columns:
+            self.columns = [table_columns[name] for name in columns]
+        else:
+            skipped = set(GENERATED_COLUMNS) | set(scalar_defaults(model_class))
+            self.columns = [column for column in table_columns if column.name not in skipped]
+        self.keys = [column.name for column in self.columns]
+
+    def query(self, snapshot_id: str):
+        """Snapshot'ın satırları, PK sırasıyla (tek partition'ın PK indeksinden)"""
+        return (
+            select(*self.columns)
+            .where(self.model.snapshot_id == str(snapshot_id))
+            .order_by(*keyset_columns(self.model))
+            .execution_options(yield_per=self.batch_rows)
+        )
+
+    async def stream(self, db: AsyncSession, snapshot_id: str, export_format: str) -> AsyncIterator[bytes]:
+        """Kodlanmış parçaları üret; CSV'de ilk parça başlık satırıdır"""
+        encode = self._csv_encoder() if export_format == 'csv' else self._encode_ndjson
+        if export_format == 'csv':
+            yield encode([self.keys])
+
+        async for rows in self.batches(db, snapshot_id):
+            yield encode(rows)
+
+    async def batches(self, db: AsyncSession, snapshot_id: str) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        """Satırları server-side cursor'dan batch_rows'luk parçalar halinde üret"""
+        result = await db.stream(self.query(snapshot_id))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+
+    def _encode_ndjson(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        keys = self.keys
+        return b''.join(orjson.dumps(dict(zip(keys, row)), default=json_default) + b'\n' for row in rows)
+
+    def _csv_encoder(self) -> Callable[[Sequence[Sequence[Any]]], bytes]:
+        # Tarih sütunları GTFS biçiminde (YYYYMMDD) yazılır; NULL boş alandır
+        date_indexes = [i for i, column in enumerate(self.columns) if isinstance(column.type, Date)]
+
+        def encode(rows: Sequence[Sequence[Any]]) -> bytes:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            if date_indexes:
+                rows = [_gtfs_dates(row, date_indexes) for row in rows]
+            writer.writerows(rows)
+            return buffer.getvalue().encode()
+
+        return encode
+
+
+def _gtfs_dates(row: Sequence[Any], date_indexes: List[int]) -> List[Any]:
+    values = list(row)
+    for i in date_indexes:
+        if isinstance(values[i], date):
+            values[i] = values[i].strftime('%Y%m%d')
+    return values
@@ -0,0 +1,149 @@
+"""GTFSUploadService.process_gtfs_zip için uçtan uca ingest benchmark'ı
+
+Sentetik bir feed üretir, DATABASE_URL'deki (yerel) PostgreSQL'e yükler ve
+tablo başına rows/sec, peak RSS ve toplam süreyi JSON olarak raporlar.
+--baseline verilirse sonuçlar önceki bir çalıştırmayla karşılaştırılır ve
+izin verilen eşiğin üzerindeki gerilemelerde sıfırdan farklı kodla çıkılır.
+
+Örnek:
+    python -m benchmarks.ingest_benchmark --mode copy --stops 20000 --output bench.json
+    python -m benchmarks.ingest_benchmark --mode copy --baseline bench.json --max-regression 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.synthetic_feed import FeedScale, generate_feed
+
+
+def _peak_rss_mb() -> float:
+    """Process'in en yüksek RSS değeri (Linux'ta ru_maxrss KB cinsindendir)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_benchmark(scale: FeedScale, ingest_mode: str, parallelism: int, keep: bool = False) -> Dict[str, Any]:
+    """Feed'i üret, yükle ve ölçümleri döndür"""
+    from app.db.database import SessionLocal, engine
+    from app.models.base import Base
+    from app.services.gtfs_upload import GTFSUploadService
+
+    Base.metadata.create_all(bind=engine)
+
+    with tempfile.TemporaryDirectory(prefix='gtfs_bench_') as tmp:
+        feed_path = Path(tmp) / 'feed.zip'
+
+        started = time.perf_counter()
+        expected = generate_feed(feed_path, scale)
+        generate_seconds = time.perf_counter() - started
+
+        db = SessionLocal()
+        try:
+            service = GTFSUploadService(db, ingest_mode=ingest_mode, parallelism=parallelism)
+
+            started = time.perf_counter()
+            status = asyncio.run(service.process_gtfs_zip(feed_path))
+            ingest_seconds = time.perf_counter() - started
+
+            if not keep:
+                GTFSUploadService.purge_snapshot(db, service.snapshot_id)
+                db.commit()
+        finally:
+            db.close()
+
+    tables = {
+        filename: {
+            'rows': stats['rows'],
+            'expected_rows': expected.get(filename),
+            'seconds': stats['elapsed_seconds'],
+            'rows_per_sec': stats['rows_per_sec'],
+        }
+        for filename, stats in status['file_stats'].items()
+    }
+
+    return {
+        'status': status['status'],
+        'errors': status['errors'],
+        'ingest_mode': ingest_mode,
+        'parallelism': parallelism,
+        'scale': asdict(scale),
+        'generate_seconds': round(generate_seconds, 3),
+        'wall_seconds': round(ingest_seconds, 3),
+        'rows_total': status['rows_loaded'],
+        'rows_per_sec': round(status['rows_loaded'] / ingest_seconds, 1) if ingest_seconds else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'tables': tables,
+    }
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Baseline'a göre eşik üstü gerilemeleri listele"""
+    regressions = []
+
+    def check(label: str, current, previous, higher_is_better: bool) -> None:
+        if not current or not previous:
+            return
+        change = (previous - current) / previous if higher_is_better else (current - previous) / previous
+        if change > max_regression:
+            regressions.append(f"{label}: {previous} -> {current} ({change:+.0%})")
+
+    check('wall_seconds', result['wall_seconds'], baseline.get('wall_seconds'), higher_is_better=False)
+    check('peak_rss_mb', result['peak_rss_mb'], baseline.get('peak_rss_mb'), higher_is_better=False)
+    for filename, stats in result['tables'].items():
+        previous = baseline.get('tables', {}).get(filename, {})
+        # Çok küçük tablolarda rows/sec gürültüdür
+        if (stats['rows'] or 0) >= 10000:
+            check(f"{filename} rows_per_sec", stats['rows_per_sec'], previous.get('rows_per_sec'), higher_is_better=True)
+
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    defaults = FeedScale()
+    parser = argparse.ArgumentParser(description="End-to-end GTFS ingest benchmark")
+    parser.add_argument('--mode', choices=('insert', 'copy'), default='copy')
+    parser.add_argument('--parallelism', type=int, default=4)
+    parser.add_argument('--keep', action='store_true', help="Do not delete the loaded snapshot afterwards")
+    parser.add_argument('--output', type=Path, help="Write the result JSON here")
+    parser.add_argument('--baseline', type=Path, help="Compare against a previous result JSON")
+    parser.add_argument('--max-regression', type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    scale = FeedScale(**{field: getattr(args, field) for field in asdict(FeedScale())})
+
+    result = run_benchmark(scale, args.mode, args.parallelism, keep=args.keep)
+    report = json.dumps(result, indent=2)
+    print(report)
+
+    if args.output:
+        args.output.write_text(report)
+
+    if result['status'] != 'completed':
+        print(f"Ingest did not complete cleanly: {result['status']}", file=sys.stderr)
+        return 1
+
+    if args.baseline:
+        regressions = compare_to_baseline(result, json.loads(args.baseline.read_text()), args.max_regression)
+        if regressions:
+            print("Ingest regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""GET liste uçlarının yanıt üretim maliyeti: ORM + Pydantic yolu ile satır → JSON hızlı yolu
+
+Sentetik bir feed'i DATABASE_URL'deki (yerel) PostgreSQL'e yükler ve aynı sorgu için iki yolu
+karşılaştırır:
+
+- orm: select(Model) → ORM nesneleri → response_model doğrulaması (from_attributes) ve json
+  modunda dump → ORJSONResponse (FastAPI'nin response_model ile yaptığı işin aynısı)
+- rows: service.project(şema) ile Core select → tuple → RowsJSONResponse (orjson)
+
+Her yol için toplam ve satır başına süre (µs) ile sorgu/hydration ve serileştirme payını JSON
+olarak raporlar. İki yolun ürettiği gövdeler byte byte aynı olmalıdır; değilse exit code 1.
+
+Örnek:
+    python -m benchmarks.serialization_benchmark --shape-points 5000 --repeat 20 --output serialization.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from benchmarks.synthetic_feed import FeedScale, generate_feed
+
+
+async def _timed(load: Callable[[], Awaitable[List[Any]]], render: Callable[[List[Any]], bytes]) -> Tuple[float, float, bytes]:
+    started = time.perf_counter()
+    rows = await load()
+    loaded = time.perf_counter()
+    body = render(rows)
+    return loaded - started, time.perf_counter() - loaded, body
+
+
+async def _measure_case(session_factory, service_class, schema, method: str, args: tuple, repeat: int) -> Dict[str, Any]:
+    """Aynı sorguyu iki yolla repeat kez çalıştır; medyan süreleri döndür"""
+    from fastapi.responses import ORJSONResponse
+    from pydantic import TypeAdapter
+
+    from app.api.responses import RowsJSONResponse
+
+    adapter = TypeAdapter(List[schema])
+
+    def render_models(rows: List[Any]) -> bytes:
+        validated = adapter.validate_python(rows, from_attributes=True)
+        return ORJSONResponse(adapter.dump_python(validated, mode='json')).body
+
+    samples: Dict[str, List[Tuple[float, float]]] = {'orm': [], 'rows': []}
+    bodies: Dict[str, bytes] = {}
+    async with session_factory() as db:
+        orm_service = service_class(db)
+        rows_service = service_class(db).project(schema)
+        paths = {
+            'orm': (lambda: getattr(orm_service, method)(*args), render_models),
+            'rows': (
+                lambda: getattr(rows_service, method)(*args),
+                lambda rows: RowsJSONResponse(rows, rows_service.projection).body,
+            ),
+        }
+        # İlk tur ısınma (bağlantı, statement cache); ölçüme katılmaz
+        for _ in range(repeat + 1):
+            for name, (load, render) in paths.items():
+                query_seconds, render_seconds, bodies[name] = await _timed(load, render)
+                samples[name].append((query_seconds, render_seconds))
+                # Identity map'i boşalt ki ORM yolu her turda nesneleri yeniden oluştursun
+                db.expunge_all()
+
+    row_count = len(json.loads(bodies['rows']))
+    result: Dict[str, Any] = {'row_count': row_count, 'identical_body': bodies['orm'] == bodies['rows']}
+    for name, measured in samples.items():
+        query = statistics.median(q for q, _ in measured[1:])
+        render = statistics.median(r for _, r in measured[1:])
+        result[name] = {
+            'query_ms': round(query * 1000, 3),
+            'serialize_ms': round(render * 1000, 3),
+            'total_ms': round((query + render) * 1000, 3),
+            'per_row_us': round((query + render) / max(row_count, 1) * 1e6, 3),
+        }
+    result['speedup'] = round(result['orm']['total_ms'] / result['rows']['total_ms'], 2) if result['rows']['total_ms'] else None
+    return result
+
+
+async def _measure(snapshot_id: str, repeat: int) -> Dict[str, Any]:
+    from app.db.database import AsyncSessionLocal, async_engine
+    from app.schemas.shapes import ShapesRead
+    from app.schemas.stop_times import StopTimesRead
+    from app.services.shapes_service import ShapesService
+    from app.services.stop_times_service import StopTimesService
+
+    cases = {
+        '/shapes/shape/{shape_id}': (ShapesService, ShapesRead, 'get_by_shape_id', ('SH0', snapshot_id)),
+        '/stop-times/trip/{trip_id}': (StopTimesService, StopTimesRead, 'get_by_trip', ('T0_0', snapshot_id)),
+        '/stop-times/?limit=1000': (StopTimesService, StopTimesRead, 'get_all', (snapshot_id, 0, 1000)),
+    }
+    try:
+        return {
+            path: await _measure_case(AsyncSessionLocal, service_class, schema, method, args, repeat)
+            for path, (service_class, schema, method, args) in cases.items()
+        }
+    finally:
+        await async_engine.dispose()
+
+
+def run_benchmark(scale: FeedScale, repeat: int) -> Dict[str, Any]:
+    """Feed'i yükle, iki yolu ölç, snapshot'ı kaldır"""
+    from app.db.database import SessionLocal, engine
+    from app.models.base import Base
+    from app.services.gtfs_upload import GTFSUploadService
+
+    Base.metadata.create_all(bind=engine)
+
+    with tempfile.TemporaryDirectory(prefix='gtfs_bench_') as tmp:
+        feed_path = Path(tmp) / 'feed.zip'
+        generate_feed(feed_path, scale)
+
+        db = SessionLocal()
+        try:
+            service = GTFSUploadService(db, ingest_mode='copy')
+            asyncio.run(service.process_gtfs_zip(feed_path))
+            try:
+                cases = asyncio.run(_measure(service.snapshot_id, repeat))
+            finally:
+                GTFSUploadService.purge_snapshot(db, service.snapshot_id)
+                db.commit()
+        finally:
+            db.close()
+
+    return {'scale': asdict(scale), 'repeat': repeat, 'cases': cases}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ORM + Pydantic vs row-to-JSON response benchmark")
+    parser.add_argument('--shape-points', type=int, default=5000)
+    parser.add_argument('--stop-times-per-trip', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', type=Path, help="Write the result JSON here")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    scale = FeedScale(
+        routes=2, stops=max(500, args.stop_times_per_trip), trips_per_route=10,
+        stop_times_per_trip=args.stop_times_per_trip, shape_points=args.shape_points,
+    )
+
+    result = run_benchmark(scale, args.repeat)
+    report = json.dumps(result, indent=2)
+    print(report)
+
+    if args.output:
+        args.output.write_text(report)
+
+    mismatched = [path for path, case in result['cases'].items() if not case['identical_body']]
+    if mismatched:
+        print(f"Response bodies differ between paths: {', '.join(mismatched)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
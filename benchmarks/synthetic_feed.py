@@ -0,0 +1,173 @@
+"""Yapılandırılabilir ölçekte, referans bütünlüğü olan sentetik GTFS ZIP üreteci
+
+Örnek:
+    python -m benchmarks.synthetic_feed feed.zip --routes 200 --stops 5000 --trips-per-route 100
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import math
+import random
+import zipfile
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Union
+
+
+@dataclass
+class FeedScale:
+    """Üretilecek feed'in boyutu"""
+    agencies: int = 2
+    routes: int = 20
+    stops: int = 500
+    trips_per_route: int = 20
+    stop_times_per_trip: int = 25
+    shape_points: int = 200  # route başına bir shape, shape başına nokta sayısı
+    seed: int = 42
+
+    def row_counts(self) -> Dict[str, int]:
+        """Dosya başına beklenen satır sayısı"""
+        trips = self.routes * self.trips_per_route
+        return {
+            'agency.txt': self.agencies,
+            'calendar.txt': 2,
+            'calendar_dates.txt': 2,
+            'feed_info.txt': 1,
+            'routes.txt': self.routes,
+            'stops.txt': self.stops,
+            'shapes.txt': self.routes * self.shape_points,
+            'fare_attributes.txt': self.agencies,
+            'fare_rules.txt': self.routes,
+            'trips.txt': trips,
+            'stop_times.txt': trips * self.stop_times_per_trip,
+        }
+
+
+# İstanbul civarı bir kutu - koordinatlar bu alanda üretilir
+_CENTER_LAT, _CENTER_LON, _SPAN = 41.0, 29.0, 0.5
+
+
+def _format_time(seconds: int) -> str:
+    """GTFS HH:MM:SS (24 saati aşabilir)"""
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _write_member(zip_file: zipfile.ZipFile, name: str, header: Sequence[str], rows: Iterable[Sequence]) -> None:
+    """Satırları ZIP üyesine akıtarak yaz - feed boyutundan bağımsız sabit bellek"""
+    with zip_file.open(name, 'w', force_zip64=True) as raw:
+        with io.TextIOWrapper(raw, encoding='utf-8', newline='') as member:
+            writer = csv.writer(member, lineterminator='\n')
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def generate_feed(target: Union[str, Path, BinaryIO], scale: FeedScale) -> Dict[str, int]:
+    """Sentetik GTFS ZIP'i target'a yaz, dosya başına satır sayılarını döndür"""
+    rng = random.Random(scale.seed)
+    agency_ids = [f"AG{a}" for a in range(scale.agencies)]
+    route_agency = [agency_ids[r % scale.agencies] for r in range(scale.routes)]
+    stop_coords: List[tuple] = [
+        (round(_CENTER_LAT + rng.uniform(-_SPAN, _SPAN), 6), round(_CENTER_LON + rng.uniform(-_SPAN, _SPAN), 6))
+        for _ in range(scale.stops)
+    ]
+
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        _write_member(zf, 'agency.txt', ['agency_id', 'agency_name', 'agency_url', 'agency_timezone', 'agency_lang'], (
+            (agency_id, f"Agency {agency_id}", f"https://example.com/{agency_id}", 'Europe/Istanbul', 'tr')
+            for agency_id in agency_ids
+        ))
+
+        _write_member(zf, 'calendar.txt', [
+            'service_id', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+            'start_date', 'end_date',
+        ], [
+            ('WEEKDAY', 1, 1, 1, 1, 1, 0, 0, '20240101', '20241231'),
+            ('WEEKEND', 0, 0, 0, 0, 0, 1, 1, '20240101', '20241231'),
+        ])
+
+        _write_member(zf, 'calendar_dates.txt', ['service_id', 'date', 'exception_type'], [
+            ('WEEKDAY', '20240501', 2),
+            ('WEEKEND', '20240501', 1),
+        ])
+
+        _write_member(zf, 'feed_info.txt', [
+            'feed_publisher_name', 'feed_publisher_url', 'feed_lang', 'feed_start_date', 'feed_end_date', 'feed_version',
+        ], [('Synthetic', 'https://example.com', 'tr', '20240101', '20241231', f"synthetic-{scale.seed}")])
+
+        _write_member(zf, 'routes.txt', [
+            'route_id', 'agency_id', 'route_short_name', 'route_long_name', 'route_type', 'route_color', 'route_text_color',
+        ], (
+            (f"R{r}", route_agency[r], str(r), f"Route {r}", rng.choice((0, 1, 3, 3, 3)), f"{rng.randrange(0xFFFFFF):06X}", 'FFFFFF')
+            for r in range(scale.routes)
+        ))
+
+        _write_member(zf, 'stops.txt', ['stop_id', 'stop_name', 'stop_lat', 'stop_lon', 'zone_id'], (
+            (f"S{s}", f"Stop {s}", lat, lon, f"Z{s % 10}")
+            for s, (lat, lon) in enumerate(stop_coords)
+        ))
+
+        def shape_rows():
+            for r in range(scale.routes):
+                lat, lon = stop_coords[r % scale.stops]
+                heading = rng.uniform(0, 2 * math.pi)
+                distance = 0.0
+                for p in range(scale.shape_points):
+                    yield (f"SH{r}", round(lat, 6), round(lon, 6), p + 1, round(distance, 1))
+                    lat += 0.0005 * math.cos(heading)
+                    lon += 0.0005 * math.sin(heading)
+                    distance += 55.0
+
+        _write_member(zf, 'shapes.txt', [
+            'shape_id', 'shape_pt_lat', 'shape_pt_lon', 'shape_pt_sequence', 'shape_dist_traveled',
+        ], shape_rows())
+
+        _write_member(zf, 'fare_attributes.txt', [
+            'fare_id', 'agency_id', 'price', 'currency_type', 'payment_method', 'transfers',
+        ], ((f"F{a}", agency_id, '17.70', 'TRY', 0, 0) for a, agency_id in enumerate(agency_ids)))
+
+        _write_member(zf, 'fare_rules.txt', ['fare_id', 'route_id'], (
+            (f"F{agency_ids.index(route_agency[r])}", f"R{r}") for r in range(scale.routes)
+        ))
+
+        _write_member(zf, 'trips.txt', [
+            'route_id', 'service_id', 'trip_id', 'trip_headsign', 'direction_id', 'shape_id',
+        ], (
+            (f"R{r}", 'WEEKDAY' if t % 3 else 'WEEKEND', f"T{r}_{t}", f"Route {r} headsign", t % 2, f"SH{r}")
+            for r in range(scale.routes)
+            for t in range(scale.trips_per_route)
+        ))
+
+        def stop_time_rows():
+            for r in range(scale.routes):
+                # Route'un durak dizisi sabit, trip'ler zamanda kaydırılır
+                pattern = [rng.randrange(scale.stops) for _ in range(scale.stop_times_per_trip)]
+                for t in range(scale.trips_per_route):
+                    clock = 5 * 3600 + t * 600
+                    for sequence, stop_index in enumerate(pattern, start=1):
+                        time_str = _format_time(clock)
+                        yield (f"T{r}_{t}", time_str, time_str, f"S{stop_index}", sequence, 0, 0)
+                        clock += 90
+
+        _write_member(zf, 'stop_times.txt', [
+            'trip_id', 'arrival_time', 'departure_time', 'stop_id', 'stop_sequence', 'pickup_type', 'drop_off_type',
+        ], stop_time_rows())
+
+    return scale.row_counts()
+
+
+def _parse_args() -> argparse.Namespace:
+    defaults = FeedScale()
+    parser = argparse.ArgumentParser(description="Generate a synthetic GTFS ZIP")
+    parser.add_argument('output', type=Path)
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = _parse_args()
+    output = args.__dict__.pop('output')
+    counts = generate_feed(output, FeedScale(**vars(args)))
+    print(f"Wrote {output} ({sum(counts.values())} rows)")
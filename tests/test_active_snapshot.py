@@ -0,0 +1,28 @@
+import asyncio
+import time
+import uuid
+
+from app.api.deps import resolve_snapshot_id
+from app.services import active_snapshot
+from app.services.active_snapshot import ActiveSnapshotRegistry, invalidate_active_snapshot_cache
+
+
+def test_explicit_snapshot_id_bypasses_active_pointer():
+    """snapshot_id verilmişse aktif işaretçiye (ve veritabanına) bakılmaz"""
+    snapshot_id = uuid.uuid4()
+    assert asyncio.run(resolve_snapshot_id(snapshot_id=snapshot_id, feed='default', db=None)) == str(snapshot_id)
+
+
+def test_active_snapshot_resolves_from_worker_cache_until_invalidated():
+    """Süresi dolmamış cache kaydı sorgusuz döner; invalidate yalnızca ilgili feed'i düşürür"""
+    now = time.monotonic()
+    active_snapshot._cache['feed-a'] = ('snap-a', now + 60)
+    active_snapshot._cache['feed-b'] = ('snap-b', now + 60)
+    try:
+        assert ActiveSnapshotRegistry(None).resolve('feed-a') == 'snap-a'
+
+        invalidate_active_snapshot_cache('feed-a')
+        assert 'feed-a' not in active_snapshot._cache
+        assert ActiveSnapshotRegistry(None).resolve('feed-b') == 'snap-b'
+    finally:
+        invalidate_active_snapshot_cache()
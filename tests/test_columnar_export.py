@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from starlette.requests import Request
+
+from app.api.responses import ArrowStreamResponse, accepts_arrow
+from app.models import CalendarDates, FareAttributes
+from app.schemas.fare_attributes import FareAttributesRead
+from app.services.columnar_export import ParquetCache
+from app.services.projection import row_projection
+from app.services.table_export import TableExporter
+
+
+def _request(accept):
+    return Request({'type': 'http', 'headers': [(b'accept', accept.encode())]})
+
+
+def test_arrow_response_has_the_json_fields_and_model_types():
+    """Sütunlar şemanın alanları (keyset sütunu hariç); NUMERIC float64, SMALLINT int16"""
+    projection = row_projection(FareAttributes, FareAttributesRead)
+    row = {
+        'agency_id': 'AG0', 'price': Decimal('2.50'), 'currency_type': 'TRY', 'payment_method': 0,
+        'transfers': None, 'transfer_duration': 5400, 'fare_id': 'F0',
+    }
+    rows = [tuple(row[key] for key in projection.keys) + ('snap-1',)] * 2
+
+    table = pa.ipc.open_stream(ArrowStreamResponse(rows, projection).body).read_all()
+
+    assert table.column_names == list(projection.keys)
+    assert table.schema.field('price').type == pa.float64()
+    assert table.schema.field('payment_method').type == pa.int16()
+    assert table.to_pylist()[0] == {**row, 'price': 2.5}
+
+
+def test_accept_header_negotiation():
+    assert accepts_arrow(_request('application/vnd.apache.arrow.stream'))
+    assert accepts_arrow(_request('application/json;q=0.5, application/vnd.apache.arrow.stream'))
+    assert not accepts_arrow(_request('application/vnd.apache.arrow.stream;q=0, application/json'))
+    assert not accepts_arrow(_request('application/vnd.apache.arrow.stream; q=0.0, application/json'))
+    assert not accepts_arrow(_request('application/vnd.apache.arrow.stream;q = 0.00'))
+    assert accepts_arrow(_request('application/vnd.apache.arrow.stream;q=0.01'))
+    assert not accepts_arrow(_request('*/*'))
+
+
+def test_parquet_cache_writes_once_in_row_groups_and_evicts(tmp_path, monkeypatch):
+    """Cursor batch'leri row group'larda birikir; dosya varsa (aynı generation) tablo yeniden okunmaz"""
+    reads = []
+
+    async def batches(self, db, snapshot_id):
+        reads.append(snapshot_id)
+        for day in (1, 2, 3):
+            yield [('WEEKDAY', date(2026, 12, day), 1), ('WEEKEND', date(2026, 12, day), 2)]
+
+    monkeypatch.setattr(TableExporter, 'batches', batches)
+    cache = ParquetCache(str(tmp_path), row_group_rows=4)
+    exporter = TableExporter(CalendarDates)
+    path = cache.path('snap-1', 'calendar_dates')
+
+    async def open_concurrently():
+        return await asyncio.gather(*(cache.open(None, 'snap-1', exporter) for _ in range(3)))
+
+    handles = asyncio.run(open_concurrently())
+    asyncio.run(cache.open(None, 'snap-1', exporter)).close()
+
+    assert path == tmp_path / 'snap-1' / 'calendar_dates.g0.parquet'
+    assert reads == ['snap-1']
+    # Yazım bitince dosyanın kilidi tutulmaz
+    assert path not in ParquetCache._locks
+    assert [p.name for p in path.parent.iterdir()] == ['calendar_dates.g0.parquet']
+    assert pq.ParquetFile(path).metadata.num_row_groups == 2
+    table = pq.read_table(path)
+    assert table.column_names == ['service_id', 'date', 'exception_type']
+    assert table.num_rows == 6 and table.schema.field('date').type == pa.date32()
+
+    # CRUD yazımından sonra (generation 1) dosya yeniden yazılır, eskisi silinir
+    asyncio.run(cache.open(None, 'snap-1', exporter, generation=1)).close()
+    assert reads == ['snap-1', 'snap-1']
+    assert [p.name for p in path.parent.iterdir()] == ['calendar_dates.g1.parquet']
+
+    # Eski generation'ı sunmakta olan yanıtlar dosya silindikten sonra da tam içeriği okur
+    async def read_all(handle):
+        return b''.join([chunk async for chunk in ParquetCache.chunks(handle, chunk_size=64)])
+
+    for handle in handles:
+        assert pq.read_table(pa.BufferReader(asyncio.run(read_all(handle)))).equals(table)
+        assert handle.closed
+
+    cache.evict('snap-1')
+    assert not (tmp_path / 'snap-1').exists()
@@ -0,0 +1,15 @@
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+from app.db import database
+
+
+def test_async_engine_uses_asyncpg_on_the_same_database():
+    """ASYNC_DATABASE_URL verilmemişse async engine DATABASE_URL'in asyncpg karşılığına bağlanır"""
+    if get_settings().ASYNC_DATABASE_URL:
+        return
+
+    sync_url = make_url(database.DATABASE_URL)
+    async_url = database.async_engine.url
+    assert async_url.drivername == 'postgresql+asyncpg'
+    assert (async_url.database, async_url.host, async_url.query) == (sync_url.database, sync_url.host, sync_url.query)
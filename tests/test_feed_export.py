@@ -0,0 +1,102 @@
+import asyncio
+import io
+import zipfile
+from contextlib import asynccontextmanager
+
+from app.api.routes import gtfs
+from app.services.feed_export import FeedExporter
+from app.services.table_export import TableExporter
+
+
+@asynccontextmanager
+async def _no_session():
+    yield None
+
+
+def _export(snapshot):
+    async def collect():
+        return [chunk async for chunk in FeedExporter(snapshot, _no_session).stream()]
+    return asyncio.run(collect())
+
+
+SNAPSHOT = {
+    'snapshot_id': 'snap-1',
+    'published_at': '2026-10-18T12:00:00',
+    'row_counts': {'agency': 1, 'stops': 2, 'feed_info': 1, 'shapes': 0},
+    'table_bytes': {'agency': 8192, 'stops': 16384, 'feed_info': 8192},
+    'source_columns': {
+        'agency': ['agency_id', 'agency_name', 'agency_url', 'agency_timezone'],
+        'stops': ['stop_id', 'stop_lat', 'stop_lon', 'stop_name'],
+    },
+}
+
+
+def test_zip_contains_the_source_files_with_their_column_order():
+    """Kaynakta olmayan dosya yazılmaz; sütunlar kaynak başlığın sırasıyla"""
+    members = FeedExporter(SNAPSHOT, _no_session).members()
+
+    assert [filename for filename, _ in members] == ['agency.txt', 'stops.txt']
+    assert members[1][1].keys == ['stop_id', 'stop_lat', 'stop_lon', 'stop_name']
+
+
+def test_snapshots_without_column_order_fall_back_to_gtfs_columns():
+    """0005 öncesi snapshot: satırı olan dosyalar, model sırasıyla ve feed_info.id olmadan"""
+    members = dict(FeedExporter({**SNAPSHOT, 'source_columns': None}, _no_session).members())
+
+    assert list(members) == ['agency.txt', 'feed_info.txt', 'stops.txt']
+    assert 'id' not in members['feed_info.txt'].keys
+
+
+def test_streamed_chunks_form_a_valid_zip(monkeypatch):
+    """Parçalar birleşince geçerli bir ZIP'tir (data descriptor'lı, seek edilmeden yazılmış)"""
+    async def fake_stream(self, db, snapshot_id, export_format):
+        yield (','.join(self.keys) + '\n').encode()
+        for i in range(3):
+            yield f"{self.model.__tablename__}-{i}\n".encode() * 1000
+
+    monkeypatch.setattr(TableExporter, 'stream', fake_stream)
+
+    chunks = _export(SNAPSHOT)
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ['agency.txt', 'stops.txt']
+        assert archive.getinfo('stops.txt').date_time == (2026, 10, 18, 12, 0, 0)
+        lines = archive.read('stops.txt').decode().splitlines()
+
+    assert lines[0] == 'stop_id,stop_lat,stop_lon,stop_name'
+    assert len(lines) == 3001
+    assert len(chunks) > 2
+
+
+class _FakeSession:
+    def __init__(self, name, status):
+        self.name, self.status = name, status
+
+    async def scalar(self, statement):
+        return self.status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_zip_is_streamed_from_primary_while_the_replica_lags(monkeypatch):
+    """Replica snapshot'ı henüz yayınlanmış görmüyorsa satırlar primary'den okunur"""
+    replica_status = {'value': 'queued'}
+
+    @asynccontextmanager
+    async def replica():
+        yield _FakeSession('replica', replica_status['value'])
+
+    monkeypatch.setattr(gtfs, 'read_session', replica)
+    monkeypatch.setattr(gtfs, 'AsyncSessionLocal', lambda: _FakeSession('primary', 'published'))
+
+    async def session_name():
+        async with gtfs._published_read_session('snap-1') as db:
+            return db.name
+
+    assert asyncio.run(session_name()) == 'primary'
+    replica_status['value'] = 'published'
+    assert asyncio.run(session_name()) == 'replica'
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import io
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateTable
+
+from app.db.database import DATABASE_URL
+from app.models import Agency, Calendar, FeedInfo, Shapes, Stops, StopTimes
+from app.services import gtfs_upload
+from app.services.gtfs_parser import frame_to_copy_csv, frame_to_records, iter_gtfs_frames
+from app.services.gtfs_staging import StagingArea, natural_key, partition_name, qualified_name
+from app.services.gtfs_upload import GTFSUploadService, _CopyStream
+from app.services.snapshot_catalog import source_sha256
+
+
+def _run_files(service, filenames, load):
+    service.upload_status['total_files'] = len(filenames)
+    asyncio.run(service._run_files(filenames, load))
+
+
+def test_files_load_concurrently_up_to_parallelism():
+    """Staging'de FK olmadığından dosyalar sıra beklemeden, en fazla parallelism kadar eşzamanlı yüklenir"""
+    service = GTFSUploadService(None, parallelism=4)
+    filenames = list(GTFSUploadService.GTFS_FILES_MAPPING.keys())
+    finished = []
+    running = 0
+    max_running = 0
+
+    async def load(filename):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        finished.append(filename)
+
+    _run_files(service, filenames, load)
+
+    assert sorted(finished) == sorted(filenames)
+    assert max_running == 4
+    assert service.upload_status['processed_files'] == len(filenames)
+    assert service.upload_status['errors'] == []
+
+
+def test_failed_file_aborts_the_whole_ingest():
+    """Tek bir dosya hatası yüklemeyi iptal eder: bekleyen dosyalar atlanır, hiçbir şey yayınlanmaz"""
+    service = GTFSUploadService(None, parallelism=1)
+    loaded = []
+
+    async def load(filename):
+        if filename == 'routes.txt':
+            raise ValueError("broken routes")
+        loaded.append(filename)
+
+    with pytest.raises(RuntimeError, match="nothing was published"):
+        _run_files(service, ['agency.txt', 'routes.txt', 'stops.txt', 'trips.txt'], load)
+
+    assert loaded == ['agency.txt']
+    assert service.upload_status['errors'] == ['routes.txt: broken routes']
+    file_stats = service.upload_status['file_stats']
+    assert file_stats['stops.txt']['status'] == 'skipped'
+    assert file_stats['trips.txt']['status'] == 'skipped'
+
+
+def test_frames_are_coerced_to_model_types():
+    """Chunk'lar model tiplerine çevrilmeli: YYYYMMDD -> date, boş -> NULL, bilinmeyen sütun -> atılır"""
+    member = io.StringIO(
+        "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date,extra\n"
+        "S1,1,0,1,,1,1,0,20240101,20241231,x\n"
+        "\n"
+        "\"S,2\",0,0,0,0,0,1,1,20240201,20240301,\n"
+    )
+
+    frames = list(iter_gtfs_frames(member, Calendar, chunk_rows=1))
+    records = [r for frame in frames for r in frame_to_records(frame)]
+
+    assert len(frames) == 2
+    assert 'extra' not in frames[0].columns
+    assert records[0]['start_date'] == date(2024, 1, 1)
+    assert records[0]['thursday'] is None
+    assert records[1]['service_id'] == 'S,2'
+    assert isinstance(records[1]['saturday'], int)
+    assert frame_to_copy_csv(frames[1]).startswith('"S,2",0,0,0,0,0,1,1,2024-02-01,2024-03-01')
+
+
+def test_frames_remember_the_source_column_order():
+    """Export için dosyadaki sütun sırası tutulur; bilinmeyen sütunlar ve eklenen default'lar hariç"""
+    member = io.StringIO(
+        "feed_version,extra,feed_publisher_name,feed_lang,feed_publisher_url\n"
+        "v1,x,Publisher,tr,https://example.com\n"
+    )
+
+    frame = next(iter_gtfs_frames(member, FeedInfo, chunk_rows=10))
+
+    assert frame.attrs['source_columns'] == ['feed_version', 'feed_publisher_name', 'feed_lang', 'feed_publisher_url']
+    assert 'id' in frame.columns
+
+
+def test_writers_target_snapshot_staging_tables():
+    """Writer'lar snapshot'a özel staging tablolarına yazar; sabit Python default'ları frame'e eklenir"""
+    service = GTFSUploadService(None, snapshot_id='a-b')
+    service._staging = StagingArea(service.snapshot_id, [StopTimes, FeedInfo])
+
+    assert qualified_name(service._target_table(StopTimes)) == '"gtfs_staging"."stop_times_ab"'
+    assert natural_key(StopTimes) == ['trip_id', 'stop_sequence']
+
+    frame = next(iter_gtfs_frames(io.StringIO("feed_publisher_name\np\n"), FeedInfo, chunk_rows=10))
+    assert frame_to_records(frame)[0]['id'] == 'default'
+
+
+def test_gtfs_tables_are_partitioned_by_snapshot():
+    """PK ve FK'ler partition anahtarını (snapshot_id) içerir; staging tablosu partition adını alır"""
+    ddl = str(CreateTable(StopTimes.__table__).compile(dialect=postgresql.dialect()))
+
+    assert 'PARTITION BY LIST (snapshot_id)' in ddl
+    assert 'PRIMARY KEY (trip_id, stop_sequence, snapshot_id)' in ddl
+    assert 'FOREIGN KEY(trip_id, snapshot_id) REFERENCES trips (trip_id, snapshot_id)' in ddl
+    assert natural_key(Shapes) == ['shape_id', 'shape_pt_sequence']
+    assert partition_name('stop_times', 'a-b') == 'stop_times_ab'
+
+
+def test_publish_fails_early_when_default_partition_holds_the_snapshot():
+    """CRUD ile DEFAULT'a düşmüş satırlar ATTACH'ı bozar: kilit alınmadan anlaşılır bir hatayla durulur"""
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        connection = engine.connect()
+    except (OperationalError, DBAPIError, OSError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode='create_savepoint')
+    try:
+        clean, stray = StagingArea('staging-clean', [Agency]), StagingArea('staging-stray', [Agency])
+        for staging in (clean, stray):
+            staging.create(db)
+            staging.build_indexes(db, Agency)
+        # Partition'ı olmayan snapshot'a yazılan kayıt agency_default'a düşer
+        db.execute(text(
+            "INSERT INTO agency (agency_id, agency_name, agency_url, agency_timezone, snapshot_id) "
+            "VALUES ('A', 'a', 'u', 'tz', 'staging-stray')"
+        ))
+
+        with pytest.raises(RuntimeError, match=r'DEFAULT partitions \(agency\)'):
+            stray.publish(db)
+        clean.publish(db)
+        assert db.execute(text("SELECT to_regclass('agency_stagingclean')")).scalar() is not None
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def test_source_hash_is_the_same_for_bytes_and_spooled_file(tmp_path):
+    """Katalogdaki kaynak hash'i ZIP'in bellekten ya da diskten gelmesine bağlı değildir"""
+    payload = b'PK' + bytes(range(256)) * 8000
+    path = tmp_path / 'feed.zip'
+    path.write_bytes(payload)
+
+    assert source_sha256(payload) == source_sha256(path) == hashlib.sha256(payload).hexdigest()
+
+
+def test_copy_stream_feeds_exact_copy_csv_across_chunks():
+    """Chunk sınırları okuma boyutundan bağımsızdır; NULL tırnaksız boş alan, satır sonu/tırnak CSV kaçışıyla yazılır"""
+    member = io.StringIO(
+        "stop_id,stop_name,stop_lat,stop_lon,stop_desc\n"
+        "S1,\"Tab\there\",41.0,29.0,\n"
+        "S2,\"Line\nbreak\",41.5,29.5,\"say \"\"hi\"\"\"\n"
+        "S3,Plain,40.25,28.75,\n"
+    )
+    chunks = [frame_to_copy_csv(frame) for frame in iter_gtfs_frames(member, Stops, chunk_rows=2)]
+    stream = _CopyStream(iter(chunks))
+
+    # 10 karakterlik okumalar iki chunk'ın sınırını (63. karakter) keser; son okuma kısmi tampondur
+    parts = [stream.read(10) for _ in range(8)]
+    rest = stream.read()
+
+    assert len(chunks) == 2
+    assert ''.join(parts) + rest == (
+        'S1,Tab\there,41.0,29.0,\n'
+        'S2,"Line\nbreak",41.5,29.5,"say ""hi"""\n'
+        'S3,Plain,40.25,28.75,\n'
+    )
+    assert all(len(part) == 10 for part in parts) and rest == '75,\n'
+    assert stream.read(10) == '' and stream.read() == ''
+
+
+def test_progress_rates_and_eta_use_elapsed_time(monkeypatch):
+    """Dosya ve toplam rows/sec geçen süreden, ETA okunan byte hızından; atlanan dosyanın byte'ları ETA'ya girmez"""
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(gtfs_upload, 'time', SimpleNamespace(perf_counter=lambda: clock.now))
+    service = GTFSUploadService(None)
+    file_stats = service.upload_status['file_stats']
+    for filename, size in (('stops.txt', 1000), ('trips.txt', 3000), ('shapes.txt', 5000)):
+        service._file_stats(filename)['bytes_total'] = size
+    file_stats['shapes.txt']['status'] = 'skipped'
+
+    service._file_started['stops.txt'] = 100.0
+    clock.now = 105.0
+    service._file_started['trips.txt'] = clock.now
+    clock.now = 110.0
+    file_stats['stops.txt'].update(rows=500, bytes_read=1000)
+    file_stats['trips.txt'].update(rows=200, bytes_read=1000)
+    service._refresh_progress()
+
+    status = service.upload_status
+    assert (file_stats['stops.txt']['rows_per_sec'], file_stats['trips.txt']['rows_per_sec']) == (50.0, 40.0)
+    assert (status['rows_loaded'], status['rows_per_sec'], status['elapsed_seconds']) == (700, 70.0, 10.0)
+    assert (status['bytes_read'], status['bytes_total']) == (2000, 9000)
+    # 2000 byte 10 sn'de okundu (200 B/s), kalan 4000 - 2000 byte: 10 sn
+    assert status['eta_seconds'] == 10.0
+
+    # Biten dosyanın süresi donar; tamamlanan yüklemenin ETA'sı 0'dır
+    service._set_file_status('stops.txt', 'completed')
+    clock.now = 120.0
+    status['completed_at'] = datetime.utcnow()
+    service._refresh_progress()
+    assert file_stats['stops.txt']['elapsed_seconds'] == 10.0
+    assert file_stats['trips.txt']['elapsed_seconds'] == 15.0
+    assert status['eta_seconds'] == 0
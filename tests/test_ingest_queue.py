@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.db.database import DATABASE_URL
+from app.models.ingest_job import IngestJob
+from app.models.snapshot import Snapshot
+from app.services.ingest_queue import IngestJobQueue
+
+
+@pytest.fixture
+def db():
+    """Dış transaction içinde çalışan session: kuyruğun commit'leri savepoint'tir, test sonunda her şey geri alınır"""
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        connection = engine.connect()
+    except (OperationalError, DBAPIError, OSError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode='create_savepoint')
+    # Kuyruk tablo genelinde çalışır: testi mevcut işlerden ayır
+    session.execute(delete(IngestJob))
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def _enqueue(queue, priority=0, queued_at=None):
+    snapshot_id = str(uuid.uuid4())
+    job = queue.enqueue(snapshot_id, f'/nonexistent/{snapshot_id}.zip', priority=priority)
+    if queued_at is not None:
+        job.created_at = queued_at
+        queue.db.commit()
+    return snapshot_id
+
+
+def test_claim_order_is_priority_then_fifo(db):
+    queue = IngestJobQueue(db)
+    now = datetime.utcnow()
+    late_low = _enqueue(queue, priority=0, queued_at=now)
+    early_low = _enqueue(queue, priority=0, queued_at=now - timedelta(minutes=5))
+    high = _enqueue(queue, priority=5, queued_at=now + timedelta(minutes=5))
+
+    claimed = [queue.claim_next('worker-a', max_concurrent=10).snapshot_id for _ in range(3)]
+
+    assert claimed == [high, early_low, late_low]
+    assert queue.claim_next('worker-a', max_concurrent=10) is None
+    job = queue.get(high)
+    assert (job.status, job.worker_id, job.attempts) == ('processing', 'worker-a', 1)
+
+
+def test_claim_respects_cluster_wide_concurrency_cap(db):
+    """'processing' iş sayısı max_concurrent'e ulaşınca hangi worker sorarsa sorsun iş verilmez"""
+    queue = IngestJobQueue(db)
+    first, second = _enqueue(queue), _enqueue(queue)
+
+    assert queue.claim_next('worker-a', max_concurrent=1).snapshot_id in (first, second)
+    assert queue.claim_next('worker-b', max_concurrent=1) is None
+    assert queue.claim_next('worker-b', max_concurrent=2) is not None
+    assert db.query(IngestJob).filter(IngestJob.status == 'processing').count() == 2
+
+
+def test_stale_jobs_are_requeued_until_max_attempts(db):
+    queue = IngestJobQueue(db)
+    retried, exhausted, alive = _enqueue(queue), _enqueue(queue), _enqueue(queue)
+    for _ in range(3):
+        queue.claim_next('worker-a', max_concurrent=10)
+
+    stale_at = datetime.utcnow() - timedelta(minutes=10)
+    db.get(IngestJob, retried).heartbeat_at = stale_at
+    db.get(IngestJob, exhausted).heartbeat_at = stale_at
+    db.get(IngestJob, exhausted).attempts = 3
+    db.commit()
+
+    assert queue.recover_stale(timedelta(minutes=2), max_attempts=3) == 2
+
+    statuses = {snapshot_id: (queue.get(snapshot_id).status, db.get(Snapshot, snapshot_id).status)
+                for snapshot_id in (retried, exhausted, alive)}
+    assert statuses == {
+        retried: ('queued', 'queued'),
+        exhausted: ('failed', 'failed'),
+        alive: ('processing', 'queued'),
+    }
+    assert queue.get(retried).worker_id is None
+    assert queue.get(exhausted).progress['errors'] == ['Worker lost, retry limit reached']
+
+
+def test_release_after_crash_applies_max_attempts(db):
+    """Process'i çöken iş deneme hakkı bitince 'failed' olur; kapanışta bırakılan iş her zaman kuyruğa döner"""
+    queue = IngestJobQueue(db)
+    snapshot_id = _enqueue(queue)
+    for attempt in (1, 2):
+        queue.claim_next('worker-a', max_concurrent=10)
+        assert queue.release(snapshot_id, 2, 'Ingest process crashed') is (attempt < 2)
+
+    job = queue.get(snapshot_id)
+    assert (job.status, db.get(Snapshot, snapshot_id).status) == ('failed', 'failed')
+    assert job.progress['errors'] == ['Ingest process crashed']
+
+    shutdown = _enqueue(queue)
+    db.get(IngestJob, shutdown).attempts = 5
+    db.commit()
+    assert queue.release(shutdown) is True and queue.get(shutdown).status == 'queued'
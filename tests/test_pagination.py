@@ -0,0 +1,47 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.api.deps import Pagination
+from app.models import CalendarDates, Stops
+from app.services.pagination import InvalidCursor, Page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_the_primary_key_in_index_order():
+    """Cursor, PK sütunlarını (snapshot_id son) tipleriyle geri verir"""
+    row = SimpleNamespace(service_id='weekday', date=date(2026, 10, 18), snapshot_id='snap-1')
+    cursor = encode_cursor(CalendarDates, row)
+
+    assert decode_cursor(CalendarDates, cursor) == ['weekday', date(2026, 10, 18), 'snap-1']
+    assert '=' not in cursor
+
+
+def test_cursor_of_another_table_or_garbage_is_rejected():
+    """Başka bir listenin cursor'ı ya da bozuk değer 400'e dönüşen InvalidCursor fırlatır"""
+    cursor = encode_cursor(Stops, SimpleNamespace(stop_id='s1', snapshot_id='snap-1'))
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor(CalendarDates, cursor)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(Stops, 'not-a-cursor')
+
+
+def test_next_link_is_relative_to_the_request_host():
+    """Link başlığı host/şema taşımaz: yanıt cache'inden başka bir host'a dönse de geçerlidir"""
+    request = Request({
+        'type': 'http', 'method': 'GET', 'scheme': 'https', 'server': ('api.example.com', 443),
+        'path': '/api/routes/', 'query_string': b'snapshot_id=s1&skip=5&limit=2', 'headers': [],
+    })
+    response = Response()
+
+    async def load(cursor, skip, limit):
+        return Page([{'route_id': 'R0'}], 'next-page')
+
+    asyncio.run(Pagination(request, response, None, 5, 2).fetch(load))
+
+    assert response.headers['link'] == '</api/routes/?snapshot_id=s1&limit=2&cursor=next-page>; rel="next"'
+    assert response.headers['x-next-cursor'] == 'next-page'
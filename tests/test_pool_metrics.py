@@ -0,0 +1,28 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.db.pool_metrics import PoolMetrics, metered_pool_class
+
+
+def test_metered_pool_records_saturation_and_checkout_timeouts():
+    """Dolu pool'da bekleyen checkout timeout olarak sayılır; metrics pool.recreate() sonrası da kalır"""
+    metrics = PoolMetrics('test', capacity=1)
+    pool_class = metered_pool_class(QueuePool, metrics)
+    pool = pool_class(lambda: sqlite3.connect(':memory:'), pool_size=1, max_overflow=0, timeout=0.05)
+
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    stats = metrics.snapshot(pool)
+    assert (stats['checkouts'], stats['timeouts'], stats['waiting']) == (1, 1, 0)
+    assert stats['saturation'] == 1.0 and stats['peak_waiting'] == 1
+    assert stats['wait_seconds']['max'] >= 0.05
+    assert stats['wait_seconds']['buckets']['+Inf'] == 2
+
+    held.close()
+    assert metrics.snapshot(pool)['saturation'] == 0.0
+    assert pool.recreate().metrics is metrics
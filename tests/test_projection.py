@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.models import Calendar, FareAttributes, StopTimes
+from app.schemas.calendar import CalendarRead
+from app.schemas.fare_attributes import FareAttributesRead
+from app.schemas.stop_times import StopTimesRead
+from app.services.projection import RowProjection
+
+
+def _response_model_body(schema, rows):
+    """FastAPI'nin response_model ile ürettiği gövde"""
+    adapter = TypeAdapter(List[schema])
+    return ORJSONResponse(adapter.dump_python(adapter.validate_python(rows), mode='json')).body
+
+
+def test_projection_writes_the_same_json_as_the_response_model():
+    """Alan sırası, Decimal (string) ve tarih biçimi response_model çıktısıyla aynıdır"""
+    fares = RowProjection(FareAttributes, FareAttributesRead)
+    fare = dict(agency_id='AG0', price=Decimal('2.50'), currency_type='TRY', payment_method=0,
+                transfers=None, transfer_duration=5400, fare_id='F0')
+    assert fares.dumps([tuple(fare.values()) + ('snap-1',)]) == _response_model_body(FareAttributesRead, [fare])
+
+    calendars = RowProjection(Calendar, CalendarRead)
+    calendar = dict(monday=1, tuesday=1, wednesday=1, thursday=1, friday=1, saturday=0, sunday=0,
+                    start_date=date(2026, 1, 1), end_date=date(2026, 12, 31), service_id='WEEKDAY')
+    assert calendars.dumps([tuple(calendar.values()) + ('snap-1',)]) == _response_model_body(CalendarRead, [calendar])
+
+
+def test_projection_keeps_filters_and_order_and_selects_keyset_columns_last():
+    """Sorgu şema sütunlarına daralır; cursor için şemada olmayan PK sütunu (snapshot_id) sona eklenir"""
+    projection = RowProjection(StopTimes, StopTimesRead)
+    query = projection.apply(
+        select(StopTimes).where(StopTimes.trip_id == 'T0').order_by(StopTimes.stop_sequence)
+    )
+
+    assert [column.key for column in query.selected_columns] == [*StopTimesRead.model_fields, 'snapshot_id']
+    assert 'WHERE stop_times.trip_id' in str(query)
+    assert 'ORDER BY stop_times.stop_sequence' in str(query)
@@ -0,0 +1,89 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.database import ASYNC_DATABASE_URL
+from app.models import StopTimes
+from app.services.calendar_dates_service import CalendarDatesService
+from app.services.fare_attributes_service import FareAttributesService
+from app.services.fare_rules_service import FareRulesService
+from app.services.pagination import encode_cursor
+from app.services.routes_service import RoutesService
+from app.services.shapes_service import ShapesService
+from app.services.stop_times_service import StopTimesService
+from app.services.stops_service import StopsService
+from app.services.trips_service import TripsService
+
+
+class _ExplainingSession:
+    """Servisin çalıştırdığı her sorgunun planını toplayan AsyncSession sarmalayıcısı"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.plans = []
+
+    async def execute(self, statement, *args, **kwargs):
+        sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+        plan = (await self.db.execute(text(f"EXPLAIN {sql}"))).scalars().all()
+        self.plans.append('\n'.join(plan))
+        return await self.db.execute(statement, *args, **kwargs)
+
+
+SNAPSHOT_ID = str(uuid.uuid4())
+STOP_TIMES_CURSOR = encode_cursor(StopTimes, SimpleNamespace(trip_id='trip-1', stop_sequence=5, snapshot_id=SNAPSHOT_ID))
+
+SERVICE_LOOKUPS = [
+    (StopTimesService, 'get_by_trip', ('trip-1', SNAPSHOT_ID), 'trip_id'),
+    (StopTimesService, 'get_by_stop', ('stop-1', SNAPSHOT_ID), 'stop_id'),
+    (StopTimesService, 'get_schedule_for_stop', ('stop-1', '08:00:00', '09:00:00', SNAPSHOT_ID), 'stop_id'),
+    (TripsService, 'get_by_route', ('route-1', SNAPSHOT_ID), 'route_id'),
+    (TripsService, 'get_by_service', ('service-1', SNAPSHOT_ID), 'service_id'),
+    (RoutesService, 'get_by_agency', ('agency-1', SNAPSHOT_ID), 'agency_id'),
+    (StopsService, 'get_stops_by_zone', ('zone-1', SNAPSHOT_ID), 'zone_id'),
+    (CalendarDatesService, 'get_by_service', ('service-1', SNAPSHOT_ID), 'service_id'),
+    (FareRulesService, 'get_by_route', ('route-1', SNAPSHOT_ID), 'route_id'),
+    (FareRulesService, 'get_by_fare', ('fare-1', SNAPSHOT_ID), 'fare_id'),
+    (FareAttributesService, 'get_by_agency', ('agency-1', SNAPSHOT_ID), 'agency_id'),
+    (ShapesService, 'get_by_shape_id', ('shape-1', SNAPSHOT_ID), 'shape_id'),
+    (StopsService, 'get_by_id', ('stop-1', SNAPSHOT_ID), 'stop_id'),
+    # Keyset sayfa: cursor'dan sonrası PK indeksinden okunur
+    (StopTimesService, 'get_page', (SNAPSHOT_ID, STOP_TIMES_CURSOR), 'trip_id'),
+]
+
+
+async def _plans(service_class, method, args):
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with AsyncSession(engine) as db:
+            # Boş/küçük tablolarda da planlayıcı, uygun bir indeks varsa onu seçsin
+            await db.execute(text("SET enable_seqscan = off"))
+            session = _ExplainingSession(db)
+            await getattr(service_class(session), method)(*args)
+            return session.plans
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    'service_class, method, args, column', SERVICE_LOOKUPS,
+    ids=[f"{service_class.__name__}.{method}" for service_class, method, _, _ in SERVICE_LOOKUPS],
+)
+def test_service_lookups_use_an_index(service_class, method, args, column):
+    """Anahtar/FK aramaları indeks koşuluyla yapılır - snapshot_id ile taranıp sütun filtrelenmez"""
+    try:
+        plans = asyncio.run(_plans(service_class, method, args))
+    except (OperationalError, DBAPIError, OSError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    assert plans
+    for plan in plans:
+        index_conditions = [line for line in plan.splitlines() if 'Index Cond' in line]
+        assert 'Seq Scan' not in plan, plan
+        assert any(f"({column})" in line for line in index_conditions), plan
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from app.db.replicas import ReplicaRouter
+
+
+def _engine(name):
+    return SimpleNamespace(url=SimpleNamespace(render_as_string=lambda hide_password: name))
+
+
+def test_replicas_rotate_and_unavailable_ones_are_skipped_until_retry():
+    """Round-robin sıra; erişilemeyen replica retry süresince atlanır, hepsi düşerse liste boştur (primary)"""
+    a, b = _engine('a'), _engine('b')
+    router = ReplicaRouter([a, b], retry_after=60)
+
+    assert router.candidates() == [a, b]
+    assert router.candidates() == [b, a]
+
+    router.mark_down(a, OSError('refused'))
+    assert router.candidates() == [b]
+    assert router.candidates() == [b]
+
+    router.mark_down(b, OSError('refused'))
+    assert router.candidates() == []
+    assert [s['available'] for s in router.status()] == [False, False]
+
+
+def test_replica_is_retried_after_retry_period():
+    a, b = _engine('a'), _engine('b')
+    router = ReplicaRouter([a, b], retry_after=0)
+
+    router.mark_down(a, OSError('refused'))
+    assert set(map(id, router.candidates())) == {id(a), id(b)}
+
+
+def test_no_replicas_reads_from_primary():
+    assert ReplicaRouter([], retry_after=30).candidates() == []
@@ -0,0 +1,185 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from app.api import deps
+from app.api.deps import ResponseCaching
+from app.db.database import ASYNC_DATABASE_URL, DATABASE_URL, get_db
+from app.main import app
+from app.models.snapshot import Snapshot
+from app.services import snapshot_generation
+from app.services.response_cache import CachedResponse, ResponseCache, strong_etag
+from app.services.snapshot_generation import invalidate_generation_cache
+
+
+def _entry(snapshot_id, body):
+    return CachedResponse(snapshot_id, 200, [], body, strong_etag(body))
+
+
+def _request(query='', headers=()):
+    return Request({
+        'type': 'http', 'method': 'GET', 'path': '/api/trips/stats/by-route', 'query_string': query.encode(),
+        'headers': [(name.encode(), value.encode()) for name, value in headers],
+    })
+
+
+def test_lru_is_bounded_by_bytes():
+    """En az yakın zamanda kullanılan kayıt düşer; sınırdan büyük yanıt cache'lenmez"""
+    cache = ResponseCache(max_bytes=10)
+    cache.put('a', _entry('s1', b'aaaa'))
+    cache.put('b', _entry('s1', b'bbbb'))
+    assert cache.get('a') is not None          # 'a' yeniden kullanıldı, sıradaki kurban 'b'
+
+    cache.put('c', _entry('s2', b'cccc'))
+    cache.put('big', _entry('s2', b'x' * 11))
+
+    assert cache.get('b') is None and cache.get('big') is None
+    assert cache.stats()['bytes'] == 8 and cache.stats()['evictions'] == 1
+
+    cache.evict_snapshot('s1')
+    assert cache.get('a') is None and cache.get('c') is not None
+
+
+def test_cached_response_has_strong_etag_and_answers_304(monkeypatch):
+    """İkinci istek sorgusuz döner; If-None-Match eşleşirse 304, generation artınca yeniden üretilir"""
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(deps, 'get_response_cache', lambda: cache)
+    snapshot_generation._cache['snap-1'] = (0, time.monotonic() + 60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [{'route_id': 'R0', 'trip_count': len(loads)}]
+
+    def fetch(request):
+        return asyncio.run(ResponseCaching(request, 'snap-1', None).fetch(load))
+
+    try:
+        first = fetch(_request())
+        second = fetch(_request())
+        assert len(loads) == 1
+        assert first.body == second.body == b'[{"route_id":"R0","trip_count":1}]'
+        assert first.headers['etag'] == strong_etag(first.body)
+        assert first.headers['cache-control'] == 'no-cache'
+
+        not_modified = fetch(_request(headers=[('if-none-match', f'W/{first.headers["etag"]}')]))
+        assert not_modified.status_code == 304 and not_modified.body == b''
+
+        # Snapshot'a sabitlenmiş yanıt da CRUD yazımıyla değişebilir: istemci her seferinde doğrular
+        pinned = fetch(_request('snapshot_id=snap-1'))
+        assert pinned.headers['cache-control'] == 'no-cache'
+
+        snapshot_generation._cache['snap-1'] = (1, time.monotonic() + 60)
+        assert fetch(_request()).body == b'[{"route_id":"R0","trip_count":3}]'
+    finally:
+        invalidate_generation_cache()
+
+
+def test_snapshot_outside_catalog_is_not_cached(monkeypatch):
+    cache = ResponseCache(max_bytes=1024)
+    monkeypatch.setattr(deps, 'get_response_cache', lambda: cache)
+    snapshot_generation._cache['crud-only'] = (None, time.monotonic() + 60)
+
+    async def load():
+        return {'min_lat': 1.0}
+
+    try:
+        result = asyncio.run(ResponseCaching(_request(), 'crud-only', None).fetch(load))
+        assert result == {'min_lat': 1.0} and cache.stats()['entries'] == 0
+    finally:
+        invalidate_generation_cache()
+
+
+def test_deleted_snapshot_is_evicted_after_commit(monkeypatch):
+    """DELETE /snapshots/{id} sonrası snapshot_id ile sabitlenmiş cache'li yanıtlar bir daha dönmez"""
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        connection = engine.connect()
+    except (OperationalError, DBAPIError, OSError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    cache = ResponseCache(max_bytes=1024)
+    monkeypatch.setattr(snapshot_generation, 'get_response_cache', lambda: cache)
+    snapshot_id, other = str(uuid.uuid4()), str(uuid.uuid4())
+    cache.put(('/api/routes/', snapshot_id), _entry(snapshot_id, b'[]'))
+    cache.put(('/api/routes/', other), _entry(other, b'[]'))
+    snapshot_generation._cache[snapshot_id] = (0, time.monotonic() + 60)
+
+    # Route'un commit'i dış transaction içinde savepoint'tir, test sonunda geri alınır
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode='create_savepoint')
+    db.add(Snapshot(snapshot_id=snapshot_id, status='published', created_at=datetime.utcnow()))
+    db.flush()
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        response = TestClient(app).delete(f'/api/gtfs/snapshots/{snapshot_id}')
+        assert response.status_code == 200
+        assert cache.get(('/api/routes/', snapshot_id)) is None
+        assert cache.get(('/api/routes/', other)) is not None
+        assert snapshot_id not in snapshot_generation._cache
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        db.close()
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+        invalidate_generation_cache()
+
+
+def test_snapshot_is_cached_only_once_published(monkeypatch):
+    """Yükleme sırasında (queued) alınan boş yanıt cache'lenmez; yayından sonra yeni veri döner"""
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+    try:
+        connection = engine.connect()
+    except (OperationalError, DBAPIError, OSError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    connection.close()
+
+    cache = ResponseCache(max_bytes=1024 * 1024)
+    monkeypatch.setattr(deps, 'get_response_cache', lambda: cache)
+    snapshot_id = str(uuid.uuid4())
+    routes = []
+
+    async def load():
+        return list(routes)
+
+    async def fetch():
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+        try:
+            async with AsyncSession(async_engine) as db:
+                return await ResponseCaching(_request(f'snapshot_id={snapshot_id}'), snapshot_id, db).fetch(load)
+        finally:
+            await async_engine.dispose()
+
+    def set_status(status):
+        with Session(engine) as db:
+            db.execute(update(Snapshot).where(Snapshot.snapshot_id == snapshot_id).values(status=status))
+            db.commit()
+
+    with Session(engine) as db:
+        db.add(Snapshot(snapshot_id=snapshot_id, status='queued', created_at=datetime.utcnow()))
+        db.commit()
+    try:
+        assert asyncio.run(fetch()) == [] and cache.stats()['entries'] == 0
+
+        routes.append({'route_id': 'R0'})
+        set_status('published')
+        invalidate_generation_cache(snapshot_id)     # diğer worker'larda RESPONSE_CACHE_GENERATION_TTL sonunda
+        assert asyncio.run(fetch()).body == b'[{"route_id":"R0"}]'
+        assert cache.stats()['entries'] == 1
+    finally:
+        with Session(engine) as db:
+            db.execute(delete(Snapshot).where(Snapshot.snapshot_id == snapshot_id))
+            db.commit()
+        engine.dispose()
+        invalidate_generation_cache()
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from app.services.response_cache import CachedResponse, strong_etag
+from app.services.shared_cache import SharedResponseCache
+
+
+def _entry(snapshot_id, body):
+    return CachedResponse(snapshot_id, 200, [('content-type', 'application/json'), ('vary', 'Accept')], body, strong_etag(body))
+
+
+def test_workers_share_entries_through_the_mapped_file(tmp_path):
+    """Bir worker'ın yazdığı yanıtı aynı dosyayı açan diğeri okur; snapshot tahliyesi herkese yansır"""
+    path = str(tmp_path / 'cache')
+    worker_a = SharedResponseCache(path, max_bytes=4096, slots=16)
+    worker_b = SharedResponseCache(path, max_bytes=4096, slots=16)
+    key = ('/api/routes/', (('snapshot_id', 'snap-1'),), 'snap-1', 0, False)
+
+    worker_a.put(key, _entry('snap-1', b'[{"route_id":"R0"}]'))
+    worker_a.put(('other',), _entry('snap-2', b'{}'))
+
+    assert worker_b.get(key) == _entry('snap-1', b'[{"route_id":"R0"}]')
+    assert worker_b.get(('missing',)) is None
+
+    worker_b.evict_snapshot('snap-1')
+    assert worker_a.get(key) is None
+    assert worker_a.get(('other',)) is not None
+    assert worker_a.stats()['entries'] == 1
+
+
+def test_ring_overwrites_oldest_responses(tmp_path):
+    """Halka dolunca en eski yanıtların üzerine yazılır; üzerine yazılmış kayıt miss'tir"""
+    cache = SharedResponseCache(str(tmp_path / 'cache'), max_bytes=1024, slots=64)
+    for i in range(8):
+        cache.put(('k', i), _entry('snap-1', bytes([65 + i]) * 200))
+
+    live = [i for i in range(8) if cache.get(('k', i)) is not None]
+
+    assert live and live == list(range(8 - len(live), 8))
+    assert cache.get(('k', 7)).body == b'H' * 200
+    assert cache.put(('big',), _entry('snap-1', b'x' * 2048)) is None and cache.get(('big',)) is None
+
+
+def test_another_layout_gets_its_own_file(tmp_path):
+    """Farklı ayarlarla açan worker ayrı dosya kullanır; eski düzeni map etmiş worker'ın dosyası kesilmez"""
+    path = str(tmp_path / 'cache')
+    old_layout = SharedResponseCache(path, max_bytes=4096, slots=16)
+    old_layout.put(('k',), _entry('snap-1', b'[]'))
+
+    resized = SharedResponseCache(path, max_bytes=8192, slots=16)
+
+    assert resized.path != old_layout.path
+    assert resized.get(('k',)) is None and resized.stats()['entries'] == 0
+    assert old_layout.get(('k',)).body == b'[]'
+    assert SharedResponseCache(path, max_bytes=4096, slots=16).get(('k',)).body == b'[]'
+
+
+def test_corrupt_file_is_replaced_without_truncating_it(tmp_path):
+    cache = SharedResponseCache(str(tmp_path / 'cache'), max_bytes=4096, slots=16)
+    cache.put(('k',), _entry('snap-1', b'[]'))
+    with open(cache.path, 'r+b') as corrupt:
+        corrupt.write(b'garbage!')
+
+    reopened = SharedResponseCache(str(tmp_path / 'cache'), max_bytes=4096, slots=16)
+
+    assert reopened.get(('k',)) is None
+    # Eski inode'u map etmiş worker okumaya devam eder (SIGBUS yok)
+    assert cache.get(('k',)).body == b'[]'
+    assert [p.name for p in tmp_path.iterdir()] == [Path(cache.path).name]
@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+
+from app.services.stop_index import StopIndex, StopIndexCache, haversine_km, radius_bounds
+
+KEYS = ('stop_id', 'stop_lat', 'stop_lon')
+
+
+def _stops(count, seed=7):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(40.8, 41.2, count)
+    lons = rng.uniform(28.8, 29.2, count)
+    return [(f'S{i:04d}', float(lat), float(lon)) for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+
+def test_radius_and_nearest_match_brute_force():
+    """Yarıçap ve k-en-yakın sonuçları tüm duraklar üzerindeki haversine ile aynıdır"""
+    rows = _stops(3000)
+    index = StopIndex(rows, KEYS)
+    lats, lons = np.array([r[1] for r in rows]), np.array([r[2] for r in rows])
+    distances = haversine_km(41.0, 29.0, lats, lons)
+    by_distance = np.argsort(distances, kind='stable')
+
+    found = index.within_radius(41.0, 29.0, 3.0, limit=40)
+    expected = [rows[i] for i in by_distance if distances[i] <= 3.0][:40]
+    assert [row for row, _ in found] == expected
+    assert all(d <= 3.0 for _, d in found)
+
+    # Noktaya en yakın durak ~33 km uzakta: arama yarıçapı büyütülerek bulunur
+    nearest = index.nearest(41.5, 29.0, 5)
+    far = haversine_km(41.5, 29.0, lats, lons)
+    assert [row for row, _ in nearest] == [rows[i] for i in np.argsort(far, kind='stable')[:5]]
+
+
+def test_bounding_box_keeps_primary_key_order():
+    rows = _stops(1000)
+    index = StopIndex(rows, KEYS)
+
+    inside = index.in_bounding_box(40.9, 41.0, 28.9, 29.05)
+
+    assert inside == [r for r in rows if 40.9 <= r[1] <= 41.0 and 28.9 <= r[2] <= 29.05]
+    assert index.in_bounding_box(41.0, 40.9, 28.9, 29.05) == []
+
+
+def test_radius_crossing_the_antimeridian():
+    rows = [('A', 0.0, 179.99), ('B', 0.0, -179.99), ('C', 0.0, 179.0)]
+    index = StopIndex(rows, KEYS)
+
+    _, _, lon_ranges = radius_bounds(0.0, 179.995, 5.0)
+    found = index.within_radius(0.0, 179.995, 5.0)
+
+    assert len(lon_ranges) == 2
+    assert sorted(row[0] for row, _ in found) == ['A', 'B']
+
+
+def test_concurrent_requests_share_one_build_per_generation():
+    cache = StopIndexCache(max_snapshots=1)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0)
+        return StopIndex(_stops(10), KEYS)
+
+    async def scenario():
+        first = await asyncio.gather(*(cache.get('snap-1', 0, build) for _ in range(3)))
+        rebuilt = await cache.get('snap-1', 1, build)
+        await cache.get('snap-2', 0, build)
+        return first, rebuilt
+
+    first, rebuilt = asyncio.run(scenario())
+
+    assert first[0] is first[1] is first[2] and rebuilt is not first[0]
+    assert len(builds) == 3
+    # Kurulum kilitleri tutulmaz; LRU yalnızca son snapshot'ı saklar
+    assert len(cache._build_locks) == 0 and list(cache._indexes) == ['snap-2']
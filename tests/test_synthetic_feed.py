@@ -0,0 +1,47 @@
+import csv
+import io
+import zipfile
+
+from benchmarks.synthetic_feed import FeedScale, generate_feed
+from app.services.gtfs_parser import iter_gtfs_frames
+from app.services.gtfs_upload import GTFSUploadService
+
+
+SCALE = FeedScale(agencies=2, routes=4, stops=30, trips_per_route=3, stop_times_per_trip=5, shape_points=10)
+
+
+def _read(zip_file, name):
+    with zip_file.open(name) as member:
+        return list(csv.DictReader(io.TextIOWrapper(member, encoding='utf-8')))
+
+
+def test_generated_feed_has_all_files_and_expected_row_counts():
+    """Üretilen feed 11 GTFS dosyasını beklenen satır sayılarıyla içermeli"""
+    buffer = io.BytesIO()
+    expected = generate_feed(buffer, SCALE)
+
+    with zipfile.ZipFile(buffer) as zip_file:
+        assert set(zip_file.namelist()) == set(GTFSUploadService.GTFS_FILES_MAPPING)
+        for name, count in expected.items():
+            assert len(_read(zip_file, name)) == count, name
+
+
+def test_generated_feed_is_referentially_consistent_and_parses():
+    """Tüm FK referansları çözülmeli ve her dosya ingest parser'ından geçmeli"""
+    buffer = io.BytesIO()
+    generate_feed(buffer, SCALE)
+
+    with zipfile.ZipFile(buffer) as zip_file:
+        stops = {r['stop_id'] for r in _read(zip_file, 'stops.txt')}
+        routes = {r['route_id'] for r in _read(zip_file, 'routes.txt')}
+        services = {r['service_id'] for r in _read(zip_file, 'calendar.txt')}
+        shapes = {r['shape_id'] for r in _read(zip_file, 'shapes.txt')}
+        trips = _read(zip_file, 'trips.txt')
+
+        assert all(t['route_id'] in routes and t['service_id'] in services and t['shape_id'] in shapes for t in trips)
+        trip_ids = {t['trip_id'] for t in trips}
+        assert all(st['trip_id'] in trip_ids and st['stop_id'] in stops for st in _read(zip_file, 'stop_times.txt'))
+
+        for name, model_class in GTFSUploadService.GTFS_FILES_MAPPING.items():
+            with GTFSUploadService._open_member(zip_file, name) as member:
+                assert sum(len(frame) for frame in iter_gtfs_frames(member, model_class, chunk_rows=7)) > 0
@@ -0,0 +1,39 @@
+from datetime import date
+from decimal import Decimal
+
+import orjson
+
+from app.main import app
+from app.models import CalendarDates, FareAttributes
+from app.services.gtfs_upload import GTFSUploadService
+from app.services.table_export import TableExporter
+
+
+def test_csv_export_is_a_gtfs_file():
+    """CSV sütunları GTFS dosyasınınkilerdir; tarihler YYYYMMDD, NULL boş alan"""
+    exporter = TableExporter(CalendarDates)
+    encode = exporter._csv_encoder()
+
+    assert exporter.keys == ['service_id', 'date', 'exception_type']
+    assert encode([exporter.keys]) == b'service_id,date,exception_type\n'
+    assert encode([('WEEKDAY', date(2026, 12, 25), 2), ('WEEKEND', None, 1)]) == b'WEEKDAY,20261225,2\nWEEKEND,,1\n'
+
+
+def test_ndjson_export_writes_one_object_per_line():
+    exporter = TableExporter(FareAttributes)
+    row = ('F0', 'AG0', Decimal('2.50'), 'TRY', 0, None, 5400)
+
+    lines = exporter._encode_ndjson([row, row]).splitlines()
+
+    assert len(lines) == 2
+    assert orjson.loads(lines[0]) == dict(zip(exporter.keys, ('F0', 'AG0', '2.50', 'TRY', 0, None, 5400)))
+
+
+def test_every_gtfs_table_has_an_export_route_ahead_of_its_id_route():
+    """/{prefix}/export, /{prefix}/{id} tarafından yakalanmamalı"""
+    paths = [route.path for route in app.routes]
+    for model_class in GTFSUploadService.GTFS_FILES_MAPPING.values():
+        prefix = f"/api/{model_class.__tablename__.replace('_', '-')}"
+        id_routes = [i for i, path in enumerate(paths) if path.startswith(f"{prefix}/{{")]
+        assert f"{prefix}/export" in paths
+        assert all(paths.index(f"{prefix}/export") < i for i in id_routes)
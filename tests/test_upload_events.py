@@ -0,0 +1,61 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import gtfs
+from app.core.config import get_settings
+from app.main import app
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def job_statuses(monkeypatch):
+    """_read_job_status'u sırayla verilen durumlarla değiştir; akış beklemeden her yoklamada bir durum okur"""
+    monkeypatch.setattr(get_settings(), 'UPLOAD_EVENTS_POLL_INTERVAL', 0)
+    monkeypatch.setattr(get_settings(), 'UPLOAD_EVENTS_KEEPALIVE', 0)
+
+    def install(*statuses):
+        remaining = list(statuses)
+        monkeypatch.setattr(gtfs, '_read_job_status', lambda snapshot_id: remaining.pop(0) if remaining else None)
+
+    return install
+
+
+def _events(body: bytes):
+    return [frame for frame in body.decode().split('\n\n') if frame]
+
+
+def test_progress_events_end_on_terminal_status(job_statuses):
+    """Durum değiştikçe 'progress', değişmeyince keep-alive yorumu, 'completed' ile 'end' gelir ve akış kapanır"""
+    loading = {'snapshot_id': 's1', 'status': 'processing', 'rows_loaded': 10}
+    loaded_more = {**loading, 'rows_loaded': 20}
+    completed = {**loaded_more, 'status': 'completed'}
+    # İlk okuma 404 kontrolü içindir
+    job_statuses(loading, loading, loading, loaded_more, completed, loading)
+
+    response = client.get('/api/gtfs/upload/s1/events')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert _events(response.content) == [
+        f"event: progress\ndata: {orjson.dumps(loading).decode()}",
+        ": keep-alive",
+        f"event: progress\ndata: {orjson.dumps(loaded_more).decode()}",
+        f"event: end\ndata: {orjson.dumps(completed).decode()}",
+    ]
+
+
+def test_stream_ends_with_deleted_when_job_disappears(job_statuses):
+    job_statuses({'snapshot_id': 's1', 'status': 'queued'}, {'snapshot_id': 's1', 'status': 'queued'})
+
+    response = client.get('/api/gtfs/upload/s1/events')
+
+    assert _events(response.content)[-1] == 'event: end\ndata: {"status": "deleted"}'
+
+
+def test_unknown_upload_is_404(job_statuses):
+    job_statuses()
+
+    assert client.get('/api/gtfs/upload/missing/events').status_code == 404